@@ -2,16 +2,73 @@
 
 from os import getenv
 import json
-from subprocess import check_output
+from threading import Lock
 
 import geodefi
 
+from src.classes import ProcessPool, Signer
 from src.exceptions import EthdoError
-from src.globals import get_sdk, get_config, get_logger
+from src.globals import (
+    get_sdk,
+    get_config,
+    get_logger,
+    get_operator_id,
+    get_ethdo_pool,
+    get_signer,
+)
+from src.database.accounts import fetch_accounts, save_accounts, replace_accounts
+
+# used when the pool is not initialized, such as on the commands that do not run the daemons
+__FALLBACK_POOL: ProcessPool = ProcessPool()
+
+# accounts are created one at a time, since they are written into the same wallet
+__account_mutex: Lock = Lock()
+
+# accounts that are known to exist, as wallet/account, see load_accounts
+__accounts: set[str] = set()
+
+
+def ethdo_pool() -> ProcessPool:
+    """Returns the pool of the subprocesses that ethdo is called on.
+
+    Returns:
+        ProcessPool: pool that is initialized on setup, or a default one.
+    """
+    return get_ethdo_pool() or __FALLBACK_POOL
+
+
+def __ethdo(*args: str) -> bytes:
+    """Calls ethdo with the given arguments, when there is a free slot on the pool.
+
+    Returns:
+        bytes: output of ethdo
+
+    Raises:
+        CalledProcessError: Raised if ethdo exits with a non-zero code.
+        TimeoutExpired: Raised if ethdo does not exit before the timeout.
+    """
+    return ethdo_pool().run(["ethdo", *args])
+
+
+def get_account_prefix() -> str:
+    """Returns the prefix of the ethdo accounts for the current operator.
+    Accounts of the default operator use the configured prefix, so existing accounts are kept.
+    Other operators on multi-operator mode append their ID to it, to avoid the name clashes.
+
+    Returns:
+        str: prefix of the ethdo accounts
+    """
+    prefix: str = get_config().ethdo.account_prefix
+    operator_id: int = get_operator_id()
+    if operator_id == get_config().operator_id:
+        return prefix
+    return f"{prefix}{operator_id}-"
 
 
 def generate_deposit_data(withdrawal_address: str, deposit_value: str, index: int) -> dict:
     """Generates the deposit data for a new validator proposal.
+    Accounts are created by ethdo, deposit data is signed by the configured signer (ethdo.signer),
+    or by ethdo if there is none.
 
     Args:
         withdrawal_address (str): WithdrawalPackage contract address of\
@@ -28,10 +85,10 @@ def generate_deposit_data(withdrawal_address: str, deposit_value: str, index: in
     """
     get_logger().info(f"Generating deposit data{f'index: {index}'if index else '' }")
 
-    account: str = get_config().ethdo.account_prefix
+    account: str = get_account_prefix()
     wallet: str = get_config().ethdo.wallet
 
-    if index is not None or index < 0:
+    if index is not None and index >= 0:
         account += str(index)
     else:
         raise EthdoError("Provided invalid index for the validator")
@@ -39,21 +96,23 @@ def generate_deposit_data(withdrawal_address: str, deposit_value: str, index: in
     fork_version = geodefi.globals.GENESIS_FORK_VERSION[get_sdk().network].hex()
 
     try:
-        if not ping_account(wallet=wallet, account=account):
-            create_account(account_name=account)
-
-        res: str = check_output(
-            [
-                "ethdo",
-                "validator",
-                "depositdata",
-                f"--validatoraccount='{wallet}/{account}'",
-                f"--passphrase={getenv('ETHDO_ACCOUNT_PASSPHRASE')}",
-                f"--withdrawaladdress={withdrawal_address}",
-                f"--depositvalue={deposit_value}",
-                f"--forkversion={fork_version}",
-                "--launchpad",
-            ]
+        ensure_account(wallet=wallet, account=account)
+
+        signer: Signer = get_signer()
+        if signer is not None:
+            return signer.deposit_data(
+                wallet, account, withdrawal_address, int(deposit_value), bytes.fromhex(fork_version)
+            )
+
+        res: bytes = __ethdo(
+            "validator",
+            "depositdata",
+            f"--validatoraccount={wallet}/{account}",
+            f"--passphrase={getenv('ETHDO_ACCOUNT_PASSPHRASE')}",
+            f"--withdrawaladdress={withdrawal_address}",
+            f"--depositvalue={deposit_value}",
+            f"--forkversion={fork_version}",
+            "--launchpad",
         )
 
     except Exception as e:
@@ -79,7 +138,7 @@ def ping_wallet(wallet: str) -> bool:
         bool: True if exists, False if not.
     """
     try:
-        check_output(["ethdo", "wallet", "info", f"--wallet={wallet}"])
+        __ethdo("wallet", "info", f"--wallet={wallet}")
         return True
     except Exception:
         return False
@@ -96,12 +155,81 @@ def ping_account(wallet: str, account: str) -> bool:
         bool: True if exists, False if not.
     """
     try:
-        check_output(["ethdo", "account", "info", f"--validatoraccount={wallet}/{account}"])
+        __ethdo("account", "info", f"--validatoraccount={wallet}/{account}")
         return True
     except Exception:
         return False
 
 
+def list_accounts(wallet: str) -> list[str]:
+    """Lists the accounts on an ethdo wallet.
+
+    Args:
+        wallet (str): Provided ethdo wallet
+
+    Returns:
+        list[str]: account names
+
+    Raises:
+        EthdoError: Raised if the accounts can not be listed.
+    """
+    try:
+        res: bytes = __ethdo("wallet", "accounts", f"--wallet={wallet}")
+    except Exception as e:
+        raise EthdoError(f"Failed to list the accounts of wallet {wallet}") from e
+
+    return [line.strip() for line in res.decode().splitlines() if line.strip()]
+
+
+def load_accounts() -> int:
+    """Loads the accounts of the configured wallet, listed by ethdo once, into the index of
+    the accounts, so they are not pinged before every deposit. Listed accounts are kept on
+    the Accounts table, which is used instead if ethdo can not list them.
+
+    Returns:
+        int: number of the accounts that are known to exist
+    """
+    wallet: str = get_config().ethdo.wallet
+    try:
+        names: list[str] = list_accounts(wallet)
+        replace_accounts(wallet, names)
+    except EthdoError as e:
+        get_logger().warning(f"{e}, using the accounts that are saved before.")
+        names: list[str] = list(fetch_accounts(wallet))
+
+    with __account_mutex:
+        __accounts.clear()
+        __accounts.update(f"{wallet}/{name}" for name in names)
+
+    get_logger().debug("Loaded %s accounts of wallet %s", len(names), wallet)
+    return len(names)
+
+
+def ensure_account(wallet: str, account: str) -> None:
+    """Creates the account on ethdo if it does not exist.
+    Accounts that are known to exist are not pinged, see load_accounts.
+    Others are pinged once, and created one at a time.
+
+    Args:
+        wallet (str): Provided ethdo wallet
+        account (str): Provided ethdo account
+
+    Raises:
+        EthdoError: Raised if the account creation fails.
+    """
+    if f"{wallet}/{account}" in __accounts:
+        return
+    with __account_mutex:
+        # might be created while waiting for the others
+        if f"{wallet}/{account}" in __accounts:
+            return
+        if ping_account(wallet=wallet, account=account):
+            __accounts.add(f"{wallet}/{account}")
+            save_accounts(wallet, [account])
+        else:
+            create_account(account_name=account)
+
+
 def create_wallet(wallet_name: str, passphrase: str) -> dict:
     """Creates a new wallet on ethdo
 
@@ -118,14 +246,11 @@ def create_wallet(wallet_name: str, passphrase: str) -> dict:
         TypeError: Raised if the response is not type of str, bytes or bytearray.
     """
     try:
-        res: str = check_output(
-            [
-                "ethdo",
-                "wallet",
-                "create",
-                f"--wallet={wallet_name}",
-                f"--passphrase={passphrase}",
-            ]
+        res: str = __ethdo(
+            "wallet",
+            "create",
+            f"--wallet={wallet_name}",
+            f"--passphrase={passphrase}",
         )
 
     except Exception as e:
@@ -152,20 +277,20 @@ def create_account(account_name: str = None) -> dict:
     get_logger().info(f"Creating a new account: {account_name} on wallet: {wallet}")
 
     try:
-        res: str = check_output(
-            [
-                "ethdo",
-                "account",
-                "create",
-                f"--account={wallet}/{account_name}",
-                f"--passphrase={getenv('ETHDO_ACCOUNT_PASSPHRASE')}",
-                f"--wallet-passphrase={getenv('ETHDO_WALLET_PASSPHRASE')}",
-            ]
+        res: str = __ethdo(
+            "account",
+            "create",
+            f"--account={wallet}/{account_name}",
+            f"--passphrase={getenv('ETHDO_ACCOUNT_PASSPHRASE')}",
+            f"--wallet-passphrase={getenv('ETHDO_WALLET_PASSPHRASE')}",
         )
 
     except Exception as e:
         raise EthdoError(f"Failed to create account {account_name}") from e
 
+    __accounts.add(f"{wallet}/{account_name}")
+    save_accounts(wallet, [account_name])
+
     return res
 
 
@@ -186,15 +311,12 @@ def exit_validator(pubkey: str) -> dict:
     get_logger().info(f"Exiting from a validator: {pubkey}")
 
     try:
-        res: str = check_output(
-            [
-                "ethdo",
-                "validator",
-                "exit",
-                f"----validator={pubkey}",
-                f"--passphrase={getenv('ETHDO_ACCOUNT_PASSPHRASE')}",
-                f"--wallet-passphrase={getenv('ETHDO_WALLET_PASSPHRASE')}",
-            ]
+        res: str = __ethdo(
+            "validator",
+            "exit",
+            f"--validator={pubkey}",
+            f"--passphrase={getenv('ETHDO_ACCOUNT_PASSPHRASE')}",
+            f"--wallet-passphrase={getenv('ETHDO_WALLET_PASSPHRASE')}",
         )
 
     except Exception as e:
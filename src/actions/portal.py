@@ -1,28 +1,115 @@
 # -*- coding: utf-8 -*-
 
+from time import time
+from typing import Any
+from web3 import Web3
 from web3.types import TxReceipt
 from web3.exceptions import TimeExhausted
+from web3.contract.contract import ContractFunction
 
-from src.exceptions import CallFailedError
-from src.globals import get_sdk, get_config, get_logger
+from src.classes import Lease, NonceManager
+from src.exceptions import CallFailedError, StandbyError
+from src.globals import (
+    get_sdk,
+    get_logger,
+    get_operator_id,
+    get_lease,
+    get_block_cache,
+    get_nonce_manager,
+)
 from src.utils.notify import send_email
-from src.utils.gas import get_gas
+from src.utils.gas import tx_params, get_sender
+from src.database.transactions import save_transaction, save_replacement
+from src.database.lease import is_lease_held
+from src.helpers.simulation import simulate
 
 
-def tx_params() -> dict:
+# pylint: disable-next=invalid-name
+def __clear_cache() -> None:
+    """Evicts the cached reads of the current block, after a transaction is submitted."""
+    if get_block_cache():
+        get_block_cache().clear()
 
-    priority_fee, base_fee = get_gas()
 
-    if priority_fee and base_fee:
-        return {
-            "maxPriorityFeePerGas": priority_fee,
-            "maxFeePerGas": base_fee,
-        }
+# pylint: disable-next=invalid-name
+def __check_fence(token: int) -> None:
+    """Checks the fencing token against the shared lease, right before a transaction is sent.
+    A leader that paused for longer than its lease would be taken over by a standby.
 
-    return {}
+    Args:
+        token (int): fencing token that is taken before the transaction is prepared
+
+    Raises:
+        StandbyError: Raised if the lease is not held with the same token anymore.
+    """
+    lease: Lease = get_lease()
+    if not lease.enabled:
+        return
+    if token is None or not is_lease_held(lease.holder, token, time()):
+        lease.revoke()
+        raise StandbyError(f"Lease is taken over, fencing token {token} is stale.")
 
 
 # pylint: disable-next=invalid-name
+def __transact(name: str, func: ContractFunction, pubkeys: list[str], token: int) -> str:
+    """Simulates and submits a transaction for the given contract function, with a nonce that is
+    allocated locally. So, transactions can be submitted back-to-back, without waiting
+    for the node to reflect the previous ones.
+    Transaction is saved as pending, until the receipt is watched by the ReceiptTrigger.
+
+    Args:
+        name (str): name of the function, for the logs
+        func (ContractFunction): contract function that is called with its arguments
+        pubkeys (list[str]): public keys of the validators that the transaction is for
+        token (int): fencing token of the leadership, checked right before sending
+
+    Returns:
+        str: Transaction hash
+
+    Raises:
+        StandbyError: Raised if the lease is not held with the same token anymore.
+    """
+    # reverts are caught before they cost gas
+    reason: str = simulate(func)
+    if reason is not None:
+        get_logger().error(f"{name} would revert: {reason}")
+        raise CallFailedError(f"{name} would revert: {reason}")
+
+    params: dict = tx_params()
+    sender: str = get_sender()
+
+    __check_fence(token)
+
+    nonce: int = None
+    nonces: NonceManager = get_nonce_manager()
+    if nonces is None:
+        tx_hash: str = func.transact(params)
+    else:
+        with nonces.reserve(sender) as nonce:
+            params["nonce"] = nonce
+            tx_hash: str = func.transact(params)
+        nonces.track(sender, nonce, tx_hash)
+
+    get_logger().etherscan(name, tx_hash)
+    # cached reads might not reflect the transaction, even before it is mined
+    __clear_cache()
+
+    try:
+        payload: str = get_sdk().portal.contract.encodeABI(fn_name=func.fn_name, args=func.args)
+        save_transaction(
+            Web3.to_hex(tx_hash),
+            name,
+            sender,
+            nonce,
+            Web3.to_hex(Web3.keccak(hexstr=payload)),
+            pubkeys,
+        )
+    except Exception as e:
+        # transaction is submitted anyway, it is just not watched
+        get_logger().error(f"Could not save the {name} transaction: {e}")
+    return tx_hash
+
+
 def call_proposeStake(
     pool_id: int,
     pubkeys: list,
@@ -44,23 +131,28 @@ def call_proposeStake(
             the validator with 31 ETH.
 
     Raises:
+        StandbyError: Raised if this instance is not holding the lease.
         TimeExhausted: Raised if the transaction takes too long to be mined.
         CallFailedError: Raised if the proposeStake call fails.
     """
 
+    token: int = get_lease().fence()
+
     try:
         get_logger().info(f"Proposing stake for pool {pool_id} with {len(pubkeys)} pubkeys")
 
-        tx_hash = (
-            get_sdk()
-            .portal.functions.proposeStake(
-                pool_id, get_config().operator_id, pubkeys, sig1s, sig31s
-            )
-            .transact(tx_params())
+        __transact(
+            "proposeStake",
+            get_sdk().portal.functions.proposeStake(
+                pool_id, get_operator_id(), pubkeys, sig1s, sig31s
+            ),
+            pubkeys,
+            token,
         )
+        get_logger().debug(f"proposeStake is submitted with fencing token: {token}")
 
-        get_logger().etherscan("proposeStake", tx_hash)
-
+    except StandbyError as e:
+        raise e
     except TimeExhausted as e:
         get_logger().error(f"proposeStake tx could not conclude in time.")
         raise e
@@ -71,15 +163,17 @@ def call_proposeStake(
 def call_stake(pubkeys: list[str]) -> str:
     """Transact on stake function with given pubkeys, activating the approved validators.
 
-    This function initiates a transaction to stake the approved validators. It takes a list of
-    public keys of the approved validators as input parameters. It confirms all the validators
-    can stake before calling the stake function. If any of the validators cannot stake, it raises
-    an exception. If all validators can stake, it initiates the transaction and returns the receipt.
+    This function initiates a transaction to stake the approved validators of the current operator.
+    It takes a list of public keys of the approved validators as input parameters. It confirms all
+    the validators can stake before calling the stake function. If any of the validators cannot
+    stake, it raises an exception. If all validators can stake, it initiates the transaction
+    and returns the receipt.
 
     Args:
         pubkeys (list[str]): list of public keys of the approved validators.
 
     Raises:
+        StandbyError: Raised if this instance is not holding the lease.
         TimeExhausted: Raised if the transaction takes too long to be mined.
         CallFailedError: Raised if the stake call fails.
 
@@ -87,15 +181,24 @@ def call_stake(pubkeys: list[str]) -> str:
         str: Transaction hash
     """
 
+    token: int = get_lease().fence()
+
     try:
         if len(pubkeys) > 0:
-            tx_hash: str = get_sdk().portal.functions.stake(pubkeys).transact(tx_params())
-            get_logger().etherscan("stake", tx_hash)
+            tx_hash: str = __transact(
+                "stake",
+                get_sdk().portal.functions.stake(get_operator_id(), pubkeys),
+                pubkeys,
+                token,
+            )
+            get_logger().debug(f"stake is submitted with fencing token: {token}")
             return tx_hash
 
         else:
             return ""
 
+    except StandbyError as e:
+        raise e
     except TimeExhausted as e:
         get_logger().error(f"Stake tx could not conclude in time.")
         raise e
@@ -103,3 +206,110 @@ def call_stake(pubkeys: list[str]) -> str:
         raise CallFailedError(
             "Failed to call stake on portal contract for some unknown reason."
         ) from e
+
+
+# pylint: disable-next=invalid-name
+def call_finalizeExit(pool_id: int, pubkey: str) -> str:
+    """Transact on finalizeExit function for given validator, after it is exited on beaconchain.
+
+    Args:
+        pool_id (int): The pool id of the validator.
+        pubkey (str): public key of the exited validator.
+
+    Raises:
+        StandbyError: Raised if this instance is not holding the lease.
+        TimeExhausted: Raised if the transaction takes too long to be mined.
+        CallFailedError: Raised if the finalizeExit call fails.
+
+    Returns:
+        str: Transaction hash
+    """
+
+    token: int = get_lease().fence()
+
+    try:
+        get_logger().info(f"Finalizing the exit of validator: {pubkey}")
+
+        tx_hash: str = __transact(
+            "finalizeExit",
+            get_sdk().portal.functions.finalizeExit(pool_id, pubkey),
+            [pubkey],
+            token,
+        )
+        get_logger().debug(f"finalizeExit is submitted with fencing token: {token}")
+        return tx_hash
+
+    except StandbyError as e:
+        raise e
+    except TimeExhausted as e:
+        get_logger().error(f"finalizeExit tx could not conclude in time.")
+        raise e
+    except Exception as e:
+        raise CallFailedError("Failed to call finalizeExit on portal contract") from e
+
+
+def call_replacement(
+    tx_hash: str, tx: Any, sender: str, nonce: int, priority_fee: int, max_fee: int
+) -> str:
+    """Replaces a pending transaction with the same one and higher fees, on the same nonce.
+    Replacement is sent on the same path with the other transactions: it is simulated, and the
+    fencing token is checked right before sending. Then, it is tracked instead of the replaced one.
+
+    Args:
+        tx_hash (str): hash of the replaced transaction
+        tx (Any): replaced transaction, as it is returned by the node
+        sender (str): address that signed the replaced transaction
+        nonce (int): nonce of the replaced transaction
+        priority_fee (int): priority fee of the replacement in wei
+        max_fee (int): max fee of the replacement in wei
+
+    Raises:
+        StandbyError: Raised if this instance is not holding the lease.
+        CallFailedError: Raised if the replacement would revert, or could not be sent.
+
+    Returns:
+        str: Transaction hash of the replacement
+    """
+
+    token: int = get_lease().fence()
+
+    try:
+        func, args = get_sdk().portal.contract.decode_function_input(tx["input"])
+        func: ContractFunction = func(**args)
+
+        # pending block might include the replaced transaction
+        reason: str = simulate(func, "latest")
+        if reason is not None:
+            raise CallFailedError(f"{func.fn_name} replacement would revert: {reason}")
+
+        __check_fence(token)
+
+        sent: Any = func.transact(
+            {
+                "from": sender,
+                "value": tx["value"],
+                "gas": tx["gas"],
+                "nonce": nonce,
+                "maxPriorityFeePerGas": priority_fee,
+                "maxFeePerGas": max_fee,
+            }
+        )
+
+    except StandbyError as e:
+        raise e
+    except Exception as e:
+        raise CallFailedError(f"Failed to replace the transaction {tx_hash}") from e
+
+    new_hash: str = Web3.to_hex(sent)
+    nonces: NonceManager = get_nonce_manager()
+    if nonces:
+        nonces.track(sender, nonce, new_hash)
+    get_logger().etherscan(func.fn_name, sent)
+    get_logger().debug(f"Replacement is submitted with fencing token: {token}")
+
+    try:
+        save_replacement(tx_hash, new_hash)
+    except Exception as e:
+        # replacement is submitted anyway, it is just not watched
+        get_logger().error(f"Could not save the replacement {new_hash}: {e}")
+    return new_hash
@@ -1,5 +1,18 @@
 # -*- coding: utf-8 -*-
 
+from .gate import PRIORITY, PriorityGate
+from .lease import Lease
+from .block_cache import BlockCache
+from .beacon_clock import BeaconClock
+from .head_tracker import HeadTracker
+from .event_stream import BeaconEventStream
+from .endpoint_pool import Endpoint, EndpointPool
+from .hedge import HedgePolicy
+from .nonce_manager import NonceManager
+from .process_pool import ProcessPool
+from .signer import Signer, KeystoreSigner
+from .capacity_model import CapacityModel
+from .providers import PooledHTTPProvider, PooledBeacon
 from .daemon import Daemon
 from .database import Database
 from .trigger import Trigger
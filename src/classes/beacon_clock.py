@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+
+from time import time
+from threading import Lock
+
+
+class BeaconClock:
+    """Slots and epochs of the beacon chain, calculated locally from the genesis time and the spec.
+    The genesis and the spec are read from the beacon node once, see helpers/beacon.py.
+    The head that the beacon node reports is tracked separately, to know how far behind it is.
+
+    Example:
+        clock = BeaconClock(genesis_time=1695902400, seconds_per_slot=12, slots_per_epoch=32)
+        clock.epoch()
+
+    Attributes:
+        genesis_time (int): timestamp of the genesis.
+        seconds_per_slot (int): SECONDS_PER_SLOT of the spec.
+        slots_per_epoch (int): SLOTS_PER_EPOCH of the spec.
+        head_slot (int): latest head slot reported by the beacon node, None if unknown.
+        __lock (Lock): keeps the head slot consistent.
+    """
+
+    def __init__(self, genesis_time: int, seconds_per_slot: int, slots_per_epoch: int) -> None:
+        """Initializes a BeaconClock object.
+
+        Args:
+            genesis_time (int): timestamp of the genesis.
+            seconds_per_slot (int): SECONDS_PER_SLOT of the spec.
+            slots_per_epoch (int): SLOTS_PER_EPOCH of the spec.
+        """
+        self.genesis_time: int = genesis_time
+        self.seconds_per_slot: int = seconds_per_slot
+        self.slots_per_epoch: int = slots_per_epoch
+        self.head_slot: int = None
+        self.__lock: Lock = Lock()
+
+    @property
+    def seconds_per_epoch(self) -> int:
+        """Returns the duration of an epoch in seconds, as a property
+
+        Returns:
+            int: seconds per epoch
+        """
+        return self.seconds_per_slot * self.slots_per_epoch
+
+    def slot(self, now: float = None) -> int:
+        """Returns the slot at the given time.
+
+        Args:
+            now (float, optional): timestamp. Defaults to the current time.
+
+        Returns:
+            int: slot number
+        """
+        now = time() if now is None else now
+        return max(0, int(now - self.genesis_time) // self.seconds_per_slot)
+
+    def epoch(self, now: float = None) -> int:
+        """Returns the epoch at the given time.
+
+        Args:
+            now (float, optional): timestamp. Defaults to the current time.
+
+        Returns:
+            int: epoch number
+        """
+        return self.slot(now) // self.slots_per_epoch
+
+    def epoch_start(self, epoch: int) -> int:
+        """Returns the timestamp that the given epoch starts.
+
+        Args:
+            epoch (int): epoch number
+
+        Returns:
+            int: timestamp
+        """
+        return self.genesis_time + epoch * self.seconds_per_epoch
+
+    def observe_head(self, slot: int) -> None:
+        """Records the head slot reported by the beacon node. Older slots are ignored.
+
+        Args:
+            slot (int): head slot
+        """
+        with self.__lock:
+            if self.head_slot is None or slot > self.head_slot:
+                self.head_slot = slot
+
+    def head_lag(self, now: float = None) -> int:
+        """Returns the number of slots that the head of the beacon node is behind the clock.
+
+        Args:
+            now (float, optional): timestamp. Defaults to the current time.
+
+        Returns:
+            int: slots behind, None if the head is unknown.
+        """
+        with self.__lock:
+            if self.head_slot is None:
+                return None
+            return max(0, self.slot(now) - self.head_slot)
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+
+from typing import Any, Callable, Hashable, Union
+from threading import Lock, local
+
+from src.globals import get_logger
+
+
+class BlockCache:
+    """A read-through cache for the contract calls, that is only valid for a single block.
+    Daemons advance the cache with the head block they observe. When the head changes,
+    all entries are evicted, so a value is never read from a previous block.
+    Cache is bypassed until the head is known, such as when the commands are used.
+
+    Example:
+        cache = BlockCache()
+        cache.advance(100)
+        name = cache.get(("portal", "get_name", (pool_id,)), lambda: get_name(pool_id))
+
+    Attributes:
+        head (int): block number that the entries are valid for.
+        __entries (dict): cached values, keyed by (contract, function, args).
+        __hits (int): number of the calls served from the cache.
+        __misses (int): number of the calls made to the chain, while the head is known.
+        __evictions (int): number of the entries evicted on head changes.
+        __lock (Lock): keeps the entries and the statistics consistent.
+        __reading (local): thread local block, set while the thread is making a cached call.
+    """
+
+    def __init__(self) -> None:
+        """Initializes a BlockCache object."""
+        self.head: int = None
+        self.__entries: dict[Hashable, Any] = {}
+        self.__hits: int = 0
+        self.__misses: int = 0
+        self.__evictions: int = 0
+        self.__lock: Lock = Lock()
+        self.__reading: local = local()
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Returns the statistics of the cache, as a property
+
+        Returns:
+            dict[str, int]: head, size, hits, misses and evictions.
+        """
+        with self.__lock:
+            return {
+                "head": self.head,
+                "size": len(self.__entries),
+                "hits": self.__hits,
+                "misses": self.__misses,
+                "evictions": self.__evictions,
+            }
+
+    @property
+    def block(self) -> Union[int, str]:
+        """Returns the block that the cached call of the current thread is made on, as a property
+        So, the cached value is read on the head it is kept for.
+
+        Returns:
+            Union[int, str]: head of the call, latest if the thread is not making a cached call.
+        """
+        return getattr(self.__reading, "block", "latest")
+
+    def advance(self, block_number: int) -> None:
+        """Sets the head to the given block, evicting all the entries if it is a new one.
+        Older blocks are ignored, since daemons can observe the head at different times.
+
+        Args:
+            block_number (int): current block number
+        """
+        with self.__lock:
+            if self.head is not None and block_number <= self.head:
+                return
+            evicted: int = len(self.__entries)
+            self.head = block_number
+            self.__entries.clear()
+            self.__evictions += evicted
+        if evicted:
+            get_logger().debug(f"Block cache is advanced to {block_number}: {self.stats}")
+
+    def clear(self) -> None:
+        """Evicts all entries without changing the head, such as after a transaction."""
+        with self.__lock:
+            self.__evictions += len(self.__entries)
+            self.__entries.clear()
+
+    def get(self, key: Hashable, call: Callable[[], Any]) -> Any:
+        """Returns the cached value for the given key on the current head.
+        Calls and caches the value if it is not cached yet.
+
+        Args:
+            key (Hashable): (contract, function, args) of the call.
+            call (Callable[[], Any]): function that makes the call, on the block property.
+
+        Returns:
+            Any: result of the call
+        """
+        with self.__lock:
+            head: int = self.head
+            if head is None:
+                return call()
+            if (head, key) in self.__entries:
+                self.__hits += 1
+                return self.__entries[(head, key)]
+            self.__misses += 1
+
+        previous: Union[int, str] = self.block
+        self.__reading.block = head
+        try:
+            value: Any = call()
+        finally:
+            self.__reading.block = previous
+
+        with self.__lock:
+            # head might be changed while calling, then the value is not cached.
+            if self.head == head:
+                self.__entries[(head, key)] = value
+        return value
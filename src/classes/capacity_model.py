@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+
+from typing import Any, Optional
+from threading import Lock
+from geodefi.globals import DEPOSIT_SIZE, BEACON_DENOMINATOR
+
+# the pool secures the whole deposit on proposal, operator pays the first 1 ether of it.
+SURPLUS_PER_VALIDATOR: int = (DEPOSIT_SIZE.STAKE + DEPOSIT_SIZE.PROPOSAL) * BEACON_DENOMINATOR
+WALLET_PER_VALIDATOR: int = DEPOSIT_SIZE.PROPOSAL * BEACON_DENOMINATOR
+
+
+class CapacityModel:
+    """Keeps the capacity of the pools in memory: allowances of the operators, surplus of the pools
+    and the internal wallets of the operators. So, proposal decisions do not call the Portal.
+
+    Values are read from the chain in bulk on a block (reconcile), and then updated with the
+    events of the later blocks. Events of the earlier blocks are already included, so ignored.
+    Events that are applied after a reconciliation was started are kept in a journal, and
+    applied again on top of the values that are read.
+
+    Proposals are applied once submitted, before they are mined. They are kept until
+    their StakeProposal event is ingested, or their transaction is no longer pending.
+
+    Unknown values are None, and should be fetched from the chain and remembered.
+
+    Example:
+        model = CapacityModel()
+        model.reconcile(block, allowances, surpluses, wallets, pending=set())
+        model.deposit(event.blockNumber, pool_id, amount)
+        model.allowance(operator_id, pool_id)
+
+    Attributes:
+        __block (int): block of the last reconciliation, -1 if never reconciled.
+        __values (dict[str, dict[Any, int]]): allowance (by operator and pool ID), surplus \
+            (by pool ID) and wallet (by operator ID) values.
+        __journal (list[tuple[int, list[tuple[str, Any, int]]]]): changes applied after \
+            the last reconciliation, with their block.
+        __submitted (dict[str, list[tuple[str, Any, int]]]): changes of the proposals \
+            that are not mined, by pubkey.
+        __lock (Lock): keeps the values consistent across threads.
+    """
+
+    def __init__(self) -> None:
+        """Initializes a CapacityModel object, without any known values."""
+        self.__block: int = -1
+        self.__values: dict[str, dict[Any, int]] = {"allowance": {}, "surplus": {}, "wallet": {}}
+        self.__journal: list[tuple[int, list[tuple[str, Any, int]]]] = []
+        self.__submitted: dict[str, list[tuple[str, Any, int]]] = {}
+        self.__lock: Lock = Lock()
+
+    @property
+    def block(self) -> int:
+        """Block of the last reconciliation, -1 if never reconciled."""
+        return self.__block
+
+    def __get(self, kind: str, key: Any) -> Optional[int]:
+        with self.__lock:
+            return self.__values[kind].get(key)
+
+    def allowance(self, operator_id: int, pool_id: int) -> Optional[int]:
+        """Returns the number of validators the operator can propose for the pool, if known."""
+        return self.__get("allowance", (operator_id, pool_id))
+
+    def surplus(self, pool_id: int) -> Optional[int]:
+        """Returns the surplus of the pool as wei, if known."""
+        return self.__get("surplus", pool_id)
+
+    def wallet(self, operator_id: int) -> Optional[int]:
+        """Returns the internal wallet balance of the operator as wei, if known."""
+        return self.__get("wallet", operator_id)
+
+    def remember(self, kind: str, key: Any, value: int) -> None:
+        """Keeps the value that is fetched from the chain, if it is not known already.
+
+        Args:
+            kind (str): allowance, surplus or wallet
+            key (Any): (operator ID, pool ID) for allowance, pool ID or operator ID
+            value (int): value that is read from the chain
+        """
+        with self.__lock:
+            self.__values[kind].setdefault(key, int(value))
+
+    def forget(self, kind: str, key: Any) -> None:
+        """Removes a value that can not be derived from the events, so it is fetched again.
+
+        Args:
+            kind (str): allowance, surplus or wallet
+            key (Any): (operator ID, pool ID) for allowance, pool ID or operator ID
+        """
+        with self.__lock:
+            self.__values[kind].pop(key, None)
+
+    def __apply(self, changes: list[tuple[str, Any, int]], sign: int = 1) -> None:
+        """Applies the changes on the known values, never below zero. Should hold the lock."""
+        for kind, key, amount in changes:
+            values: dict[Any, int] = self.__values[kind]
+            if key in values:
+                values[key] = max(0, values[key] + sign * amount)
+
+    def __record(self, block: int, changes: list[tuple[str, Any, int]]) -> None:
+        """Applies the changes of an event, if it is not included on the last reconciliation."""
+        with self.__lock:
+            if block <= self.__block:
+                return
+            self.__apply(changes)
+            self.__journal.append((block, changes))
+
+    def deposit(self, block: int, pool_id: int, amount: int) -> None:
+        """Increases the surplus of the pool with a deposit.
+
+        Args:
+            block (int): block of the Deposit event
+            pool_id (int): ID of the pool
+            amount (int): ether that is added to the surplus, as wei
+        """
+        self.__record(block, [("surplus", pool_id, amount)])
+
+    def propose(
+        self, block: Optional[int], operator_id: int, pool_id: int, pubkeys: list[str]
+    ) -> None:
+        """Consumes the allowance, the surplus and the wallet with the proposed validators.
+
+        Args:
+            block (Optional[int]): block of the StakeProposal event, None if just submitted
+            operator_id (int): ID of the operator
+            pool_id (int): ID of the pool
+            pubkeys (list[str]): public keys of the validators
+        """
+
+        def changes(count: int) -> list[tuple[str, Any, int]]:
+            return [
+                ("allowance", (operator_id, pool_id), -count),
+                ("surplus", pool_id, -count * SURPLUS_PER_VALIDATOR),
+                ("wallet", operator_id, -count * WALLET_PER_VALIDATOR),
+            ]
+
+        with self.__lock:
+            if block is None:
+                for pubkey in pubkeys:
+                    if pubkey not in self.__submitted:
+                        self.__submitted[pubkey] = changes(1)
+                        self.__apply(self.__submitted[pubkey])
+                return
+
+            # already applied when submitted
+            submitted: int = sum(self.__submitted.pop(pk, None) is not None for pk in pubkeys)
+            if block <= self.__block:
+                # included on the last reconciliation, not to be applied twice
+                self.__apply(changes(submitted), sign=-1)
+                return
+            self.__apply(changes(len(pubkeys) - submitted))
+            self.__journal.append((block, changes(len(pubkeys))))
+
+    def stake(self, block: int, operator_id: int, count: int) -> None:
+        """Returns the 1 ether of the operator for every validator that is staked.
+
+        Args:
+            block (int): block of the Stake event
+            operator_id (int): ID of the operator
+            count (int): number of the validators
+        """
+        self.__record(block, [("wallet", operator_id, count * WALLET_PER_VALIDATOR)])
+
+    def reconcile(
+        self,
+        block: int,
+        allowances: dict[tuple[int, int], int],
+        surpluses: dict[int, int],
+        wallets: dict[int, int],
+        pending: set[str],
+    ) -> None:
+        """Replaces the values with the ones that are read from the chain on the given block.
+        Events of the later blocks are applied again, so are the proposals that are still pending.
+
+        Args:
+            block (int): block that the values are read on
+            allowances (dict[tuple[int, int], int]): allowances, by operator and pool ID
+            surpluses (dict[int, int]): surplus of the pools, by pool ID
+            wallets (dict[int, int]): wallet balances, by operator ID
+            pending (set[str]): public keys of the proposals that are not mined yet,\
+                read before the block.
+        """
+        with self.__lock:
+            self.__block = block
+            self.__values = {
+                "allowance": {key: int(value) for key, value in allowances.items()},
+                "surplus": {key: int(value) for key, value in surpluses.items()},
+                "wallet": {key: int(value) for key, value in wallets.items()},
+            }
+            self.__journal = [(b, changes) for b, changes in self.__journal if b > block]
+            for _, changes in self.__journal:
+                self.__apply(changes)
+
+            # mined ones are included, or will be applied with their event
+            self.__submitted = {
+                pubkey: changes for pubkey, changes in self.__submitted.items() if pubkey in pending
+            }
+            for changes in self.__submitted.values():
+                self.__apply(changes)
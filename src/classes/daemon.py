@@ -6,6 +6,8 @@ from typing import Callable
 from threading import Thread, Event
 from web3.exceptions import TimeExhausted
 
+from src.classes.gate import prioritized
+from src.classes.head_tracker import HeadTracker
 from src.classes.trigger import Trigger
 from src.exceptions import (
     DaemonError,
@@ -14,6 +16,7 @@ from src.exceptions import (
     EmailError,
     HighGasError,
     EventFetchingError,
+    StandbyError,
 )
 from src.globals import get_logger
 from src.utils.notify import send_email
@@ -41,6 +44,9 @@ class Daemon:
         __initial_delay (int): Initial delay before starting the loop.
         __task (Callable): Work to be done after every iteration.
         __worker (Thread): Thread object to run the loop.
+        __wake_flag (Event): Event flag to run the next iteration without waiting the interval.
+        __next_wait (float): Seconds to wait for the next iteration instead of the interval, if set.
+        __tracker (HeadTracker): Head tracker that the daemon follows, if any.
         trigger (Trigger): an initialized Trigger instance.
         start_flag (Event): Event flag to start the daemon.
         stop_flag (Event): Event flag to stop the daemon.
@@ -76,6 +82,9 @@ class Daemon:
         self.__worker: Thread = Thread(name=trigger.name, target=self.__loop)
         self.start_flag: Event = Event()
         self.stop_flag: Event = Event()
+        self.__wake_flag: Event = Event()
+        self.__next_wait: float = None
+        self.__tracker: HeadTracker = None
         get_logger().debug(f"Initialized a Daemon for: {trigger.name:^20}.")
 
     @property
@@ -137,6 +146,48 @@ class Daemon:
         else:
             raise TypeError("Given trigger is not an instince of Trigger")
 
+    def follow(self, tracker: HeadTracker) -> None:
+        """Wakes the daemon on every new head of the given tracker.
+        While the tracker is live, the daemon polls only as a safety net.
+
+        Args:
+            tracker (HeadTracker): an initialized HeadTracker instance
+        """
+        self.__tracker = tracker
+        tracker.subscribe(self.wake)
+
+    def wake(self) -> None:
+        """Runs the next iteration without waiting for the interval."""
+        self.__wake_flag.set()
+
+    def schedule(self, seconds: float) -> None:
+        """Waits for the given seconds before the next iteration, instead of the interval.
+        Only for the next iteration, such as when the trigger knows when it will have work.
+
+        Args:
+            seconds (float): seconds to wait
+        """
+        self.__next_wait = max(0.0, seconds)
+
+    def __sleep(self) -> bool:
+        """Waits for the interval, or until the daemon is woken up or stopped.
+
+        Returns:
+            bool: True if the daemon is stopped
+        """
+        if self.stop_flag.is_set():
+            return True
+
+        timeout: int = self.interval
+        if self.__tracker and self.__tracker.live:
+            timeout *= self.__tracker.idle_factor
+        if self.__next_wait is not None:
+            timeout, self.__next_wait = self.__next_wait, None
+
+        self.__wake_flag.wait(timeout)
+        self.__wake_flag.clear()
+        return self.stop_flag.is_set()
+
     def __loop(self) -> None:
         """Runs the loop, checks for the task and trigger on every iteration.
         Stops when stop_flag is set.
@@ -145,21 +196,23 @@ class Daemon:
         The exception is raised to the caller to handle the error.
         The daemon can be restarted after the error is handled.
         The stop_flag is set to prevent the daemon from running again.
+        Both the task and the trigger are run with the priority class of the trigger.
 
         Raises:
             DaemonError: Raised if the daemon stops due to an exception.
         """
         sleep(self.__initial_delay)
 
-        while not self.stop_flag.wait(self.interval):
+        while not self.__sleep():
             try:
-                result: bool = self.__task()
+                with prioritized(self.trigger.priority):
+                    result: bool = self.__task()
 
-                if result:
-                    self.trigger.process(result)
+                    if result:
+                        self.trigger.process(result)
 
-                else:
-                    pass
+                    else:
+                        pass
 
             except (TimeExhausted, CallFailedError):
                 get_logger().warning(
@@ -178,6 +231,9 @@ class Daemon:
                         "Not able to communicate with the owners."
                         " Continuing without an assistance."
                     )
+            except StandbyError as e:
+                # leadership is lost in the middle of the work, new leader will catch up.
+                get_logger().warning(f"{self.trigger.name:^20}: {e}")
             except HighGasError as e:
                 get_logger().error(str(e))
                 get_logger().warning(
@@ -277,4 +333,5 @@ class Daemon:
             raise DaemonError("Daemon is already stopped.")
 
         self.stop_flag.set()
+        self.__wake_flag.set()
         get_logger().info(f"Daemon for {self.trigger.name:^20} is stopped.")
@@ -6,6 +6,7 @@ from typing import Any
 
 from src.exceptions import DatabaseError
 from src.globals import get_config, get_logger
+from src.utils.operator import operator_namespace
 
 
 class Database:
@@ -20,6 +21,7 @@ class Database:
             ''')
 
     Attributes:
+        shared (str): Name of the database file that keeps the events, shared by all operators.
         db_name (str): Name of the database file.
         db_ext (str): Extension of the database file.
         path (str): Path of the database file.
@@ -30,21 +32,24 @@ class Database:
         DatabaseError: Error while connecting to the database.
     """
 
-    db_name: str = "operator"
+    shared: str = "operator"
     db_ext: str = ".db"
 
-    def __init__(self, db_name: str = db_name) -> None:
+    def __init__(self, db_name: str = None, path: str = None) -> None:
         """Initializes a Database object.
 
         Args:
-            db_name (str, optional): Name of the database file. Defaults to `operator`.
+            db_name (str, optional): Name of the database file. Defaults to `operator`.\
+                On multi-operator mode, defaults to the namespace of the current operator.
+            path (str, optional): Directory of the database file. Defaults to the database dir\
+                within the main directory.
 
         Raises:
             DatabaseError: Error while connecting to the database.
         """
 
-        self.db_name: str = db_name
-        self.path: str = os.path.join(get_config().dir, get_config().database.dir)
+        self.db_name: str = db_name if db_name else operator_namespace()
+        self.path: str = path if path else os.path.join(get_config().dir, get_config().database.dir)
         if not os.path.exists(self.path):
             os.makedirs(self.path)
 
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+
+from time import monotonic
+from threading import Lock
+
+
+class Endpoint:
+    """Health of an api endpoint, as exponentially weighted moving averages (EWMA).
+
+    Attributes:
+        url (str): url of the endpoint.
+        latency (float): EWMA of the response times in seconds, None until the first response.
+        error_rate (float): EWMA of the failures, between 0 and 1.
+        failures (int): number of the consecutive failures.
+        ejected_until (float): monotonic time that the endpoint is ejected until.
+    """
+
+    def __init__(self, url: str) -> None:
+        """Initializes an Endpoint object.
+
+        Args:
+            url (str): url of the endpoint.
+        """
+        self.url: str = url
+        self.latency: float = None
+        self.error_rate: float = 0.0
+        self.failures: int = 0
+        self.ejected_until: float = 0.0
+
+    @property
+    def score(self) -> float:
+        """Returns the health score of the endpoint, lower is better, as a property
+        Failing endpoints are penalized as if they were slower.
+
+        Returns:
+            float: health score
+        """
+        return (self.latency or 0.0) * (1 + 10 * self.error_rate)
+
+    def __repr__(self) -> str:
+        return f"Endpoint({self.url}, latency={self.latency}, error_rate={self.error_rate:.2f})"
+
+
+class EndpointPool:
+    """A pool of api endpoints that are serving the same chain, ranked by their health.
+    Requests are sent to the healthiest endpoint first, and fail over to the next one.
+    An endpoint that fails consecutively is ejected for a while, unless all of them are ejected.
+    Endpoints that are not measured yet are tried first, so they are measured.
+
+    Example:
+        pool = EndpointPool(["https://a", "https://b"])
+        for endpoint in pool.ranked():
+            ...
+            pool.record(endpoint, latency=0.1, ok=True)
+
+    Attributes:
+        endpoints (list[Endpoint]): endpoints in the pool.
+        alpha (float): weight of the latest sample on the moving averages.
+        max_failures (int): consecutive failures before an endpoint is ejected.
+        ejection (float): seconds that an endpoint is ejected for.
+        __lock (Lock): keeps the health of the endpoints consistent.
+    """
+
+    def __init__(
+        self, urls: list[str], alpha: float = 0.2, max_failures: int = 3, ejection: float = 30
+    ) -> None:
+        """Initializes an EndpointPool object.
+
+        Args:
+            urls (list[str]): urls of the endpoints, in the order of preference.
+            alpha (float, optional): weight of the latest sample. Defaults to 0.2.
+            max_failures (int, optional): failures before an ejection. Defaults to 3.
+            ejection (float, optional): seconds that an endpoint is ejected for. Defaults to 30.
+        """
+        self.endpoints: list[Endpoint] = [Endpoint(url) for url in urls]
+        self.alpha: float = alpha
+        self.max_failures: int = max_failures
+        self.ejection: float = ejection
+        self.__lock: Lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self.endpoints)
+
+    def ranked(self) -> list[Endpoint]:
+        """Returns the endpoints, healthiest first. Ejected endpoints are the last resort.
+
+        Returns:
+            list[Endpoint]: endpoints in the order they should be tried
+        """
+        now: float = monotonic()
+        with self.__lock:
+            # sorted is stable, so the configured order breaks the ties
+            return sorted(
+                self.endpoints,
+                key=lambda endpoint: (endpoint.ejected_until > now, endpoint.score),
+            )
+
+    def record(self, endpoint: Endpoint, latency: float, ok: bool) -> None:
+        """Records the result of a request sent to the given endpoint.
+
+        Args:
+            endpoint (Endpoint): endpoint that the request is sent to.
+            latency (float): seconds until the response or the failure.
+            ok (bool): True if the endpoint responded properly.
+        """
+        with self.__lock:
+            if endpoint.latency is None:
+                endpoint.latency = latency
+            else:
+                endpoint.latency += self.alpha * (latency - endpoint.latency)
+            endpoint.error_rate += self.alpha * ((0.0 if ok else 1.0) - endpoint.error_rate)
+
+            if ok:
+                endpoint.failures = 0
+                endpoint.ejected_until = 0.0
+            else:
+                endpoint.failures += 1
+                if endpoint.failures >= self.max_failures:
+                    endpoint.ejected_until = monotonic() + self.ejection
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+
+import json
+from typing import Any, Callable
+from threading import Thread, Event
+import requests
+
+from src.globals import get_logger
+from .beacon_clock import BeaconClock
+from .head_tracker import HeadTracker
+
+
+class BeaconEventStream:
+    """A client for the server-sent events (SSE) of the beacon node: head and finalized_checkpoint.
+    Feeds the HeadTracker, which wakes the daemons as soon as there is a new head.
+
+    Reconnects with an exponential backoff when the stream is lost, trying the endpoints in turn.
+    While disconnected, the tracker is not live, so the daemons fall back to polling.
+    A stream that is silent for read_timeout seconds is considered lost, since
+    there should be a head on every slot.
+
+    Example:
+        stream = BeaconEventStream(lambda: ["http://localhost:5052"], tracker)
+        stream.start()
+
+    Attributes:
+        topics (tuple[str]): topics that are subscribed.
+        __urls (Callable[[], list[str]]): returns the beacon endpoints, preferred first.
+        __tracker (HeadTracker): tracker that is fed by the stream.
+        __clock (BeaconClock): clock that records the head, if any.
+        __read_timeout (float): seconds without any data, before reconnecting.
+        __max_backoff (float): maximum seconds between two connection attempts.
+        __stop_flag (Event): Event flag to stop the stream.
+        __response (requests.Response): current connection.
+    """
+
+    topics: tuple[str] = ("head", "finalized_checkpoint")
+
+    def __init__(
+        self,
+        urls: Callable[[], list[str]],
+        tracker: HeadTracker,
+        clock: BeaconClock = None,
+        read_timeout: float = 36,
+        max_backoff: float = 60,
+    ) -> None:
+        """Initializes a BeaconEventStream object.
+
+        Args:
+            urls (Callable[[], list[str]]): returns the beacon endpoints, preferred first.
+            tracker (HeadTracker): tracker that is fed by the stream.
+            clock (BeaconClock, optional): clock that records the head. Defaults to None.
+            read_timeout (float, optional): seconds without data before reconnecting.\
+                Defaults to 36, 3 slots.
+            max_backoff (float, optional): maximum seconds between 2 attempts. Defaults to 60.
+        """
+        self.__urls: Callable[[], list[str]] = urls
+        self.__tracker: HeadTracker = tracker
+        self.__clock: BeaconClock = clock
+        self.__read_timeout: float = read_timeout
+        self.__max_backoff: float = max_backoff
+        self.__stop_flag: Event = Event()
+        self.__response: requests.Response = None
+
+    def start(self) -> None:
+        """Starts listening the events on the background."""
+        Thread(name="BEACON_EVENTS", target=self.__run, daemon=True).start()
+
+    def stop(self) -> None:
+        """Stops listening the events."""
+        self.__stop_flag.set()
+        if self.__response is not None:
+            self.__response.close()
+
+    def __run(self) -> None:
+        """Connects to the endpoints in turn, and reconnects with a backoff when the stream is lost."""
+        backoff: float = 1
+        while not self.__stop_flag.is_set():
+            for url in self.__urls():
+                try:
+                    self.__listen(url)
+                    # stream ended properly, reconnect immediately
+                    backoff = 1
+                except Exception as e:
+                    get_logger().debug("Beacon event stream is lost: %s", type(e).__name__)
+                finally:
+                    self.__tracker.set_live(False)
+
+                if self.__stop_flag.is_set():
+                    return
+
+            get_logger().debug("Reconnecting to the beacon event stream in %s (s).", backoff)
+            self.__stop_flag.wait(backoff)
+            backoff = min(backoff * 2, self.__max_backoff)
+
+    def __listen(self, url: str) -> None:
+        """Listens the event stream of the given endpoint, until it is lost.
+
+        Args:
+            url (str): api base of the beacon node
+        """
+        self.__response = requests.get(
+            f"{url}/eth/v1/events",
+            params={"topics": ",".join(self.topics)},
+            headers={"Accept": "text/event-stream"},
+            stream=True,
+            timeout=(10, self.__read_timeout),
+        )
+        with self.__response as res:
+            res.raise_for_status()
+            self.__tracker.set_live(True)
+            get_logger().info("Listening the head of the beacon chain.")
+
+            event: str = "message"
+            data: list[str] = []
+            # chunks of 1 byte, events should not wait for a buffer to be filled
+            for line in res.iter_lines(chunk_size=1, decode_unicode=True):
+                if self.__stop_flag.is_set():
+                    return
+                if not line:
+                    if data:
+                        self.dispatch(event, "\n".join(data))
+                    event, data = "message", []
+                elif line.startswith(":"):
+                    # comments are used as keep-alives
+                    continue
+                else:
+                    field, _, value = line.partition(":")
+                    value = value[1:] if value.startswith(" ") else value
+                    if field == "event":
+                        event = value
+                    elif field == "data":
+                        data.append(value)
+
+    def dispatch(self, event: str, data: str) -> None:
+        """Feeds the tracker with the given event.
+
+        Args:
+            event (str): topic of the event
+            data (str): json data of the event
+        """
+        try:
+            payload: dict[str, Any] = json.loads(data)
+            if event == "head":
+                slot: int = int(payload["slot"])
+                if self.__clock:
+                    self.__clock.observe_head(slot)
+                if self.__tracker.on_head(slot):
+                    get_logger().debug("New head on the beacon chain: %s", slot)
+            elif event == "finalized_checkpoint":
+                epoch: int = int(payload["epoch"])
+                if self.__tracker.on_finalized(epoch):
+                    get_logger().debug("New finalized checkpoint: %s", epoch)
+        except (ValueError, KeyError, TypeError):
+            get_logger().debug("Could not parse the beacon event: %s", event)
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+
+from enum import IntEnum
+from heapq import heappush, heappop, heapify
+from itertools import count
+from functools import wraps
+from contextlib import contextmanager
+from threading import Condition, local
+from typing import Callable
+
+
+class PRIORITY(IntEnum):
+    """Priority classes for the work that is done by the triggers. Lower is more urgent.
+
+    CRITICAL: delays directly cost money, such as stake finalization.
+    NORMAL: default class, such as validator proposals.
+    BACKGROUND: bookkeeping that can wait, such as filling the pools table.
+    """
+
+    CRITICAL = 0
+    NORMAL = 1
+    BACKGROUND = 2
+
+
+__context = local()
+
+
+def current_priority() -> PRIORITY:
+    """Returns the priority class of the work that is done by the current thread.
+
+    Returns:
+        PRIORITY: priority of the current thread, NORMAL if not set.
+    """
+    return getattr(__context, "priority", PRIORITY.NORMAL)
+
+
+@contextmanager
+def prioritized(priority: PRIORITY):
+    """Sets the priority class of the current thread within the context.
+
+    Args:
+        priority (PRIORITY): priority class of the work that will be done.
+    """
+    previous: PRIORITY = current_priority()
+    __context.priority = priority
+    try:
+        yield
+    finally:
+        __context.priority = previous
+
+
+class PriorityGate:
+    """Shared budget of the concurrent works, such as RPC calls, for all of the daemons.
+    When the budget is exhausted, waiting works are admitted by their priority class,
+    and on the order of arrival within the same class. So, critical work does not need to
+    wait for the background work that is queued before it.
+
+    Example:
+        gate = PriorityGate(capacity=8)
+        with gate.slot(PRIORITY.CRITICAL):
+            call_rpc()
+
+    Attributes:
+        capacity (int): maximum number of works that can run at the same time.
+        __active (int): number of works that are running.
+        __waiting (list): heap of the (priority, order) tickets that are waiting.
+        __order (count): counter that keeps the order of arrival.
+        __condition (Condition): notifies the waiting works when a slot is released.
+        __holder (local): thread local flag, set while the thread is holding a slot.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        """Initializes a PriorityGate object.
+
+        Args:
+            capacity (int): maximum number of works that can run at the same time.
+
+        Raises:
+            ValueError: capacity should be positive.
+        """
+        if capacity < 1:
+            raise ValueError("Capacity of the gate should be positive.")
+
+        self.capacity: int = capacity
+        self.__active: int = 0
+        self.__waiting: list[tuple[int, int]] = []
+        self.__order: count = count()
+        self.__condition: Condition = Condition()
+        self.__holder: local = local()
+
+    @property
+    def waiting(self) -> int:
+        """Returns the number of works waiting for a slot, as a property
+
+        Returns:
+            int: number of waiting works
+        """
+        return len(self.__waiting)
+
+    def holding(self) -> bool:
+        """Returns True if the current thread is already holding a slot.
+
+        Returns:
+            bool: True if holding a slot
+        """
+        return getattr(self.__holder, "holding", False)
+
+    def acquire(self, priority: PRIORITY) -> None:
+        """Blocks until a slot is given to the work with the given priority.
+
+        Args:
+            priority (PRIORITY): priority class of the work.
+        """
+        with self.__condition:
+            ticket: tuple[int, int] = (int(priority), next(self.__order))
+            heappush(self.__waiting, ticket)
+            try:
+                while self.__active >= self.capacity or self.__waiting[0] != ticket:
+                    self.__condition.wait()
+            except BaseException:
+                self.__waiting.remove(ticket)
+                heapify(self.__waiting)
+                self.__condition.notify_all()
+                raise
+            heappop(self.__waiting)
+            self.__active += 1
+            # the next ticket might be admitted too, if there is an empty slot.
+            self.__condition.notify_all()
+        self.__holder.holding = True
+
+    def release(self) -> None:
+        """Releases the slot of the current thread."""
+        self.__holder.holding = False
+        with self.__condition:
+            self.__active -= 1
+            self.__condition.notify_all()
+
+    @contextmanager
+    def slot(self, priority: PRIORITY):
+        """Holds a slot within the context.
+
+        Args:
+            priority (PRIORITY): priority class of the work.
+        """
+        self.acquire(priority)
+        try:
+            with prioritized(priority):
+                yield
+        finally:
+            self.release()
+
+    def wrap(self, func: Callable, priority: PRIORITY) -> Callable:
+        """Returns a function that runs the given function within a slot.
+
+        Args:
+            func (Callable): function to be called within a slot.
+            priority (PRIORITY): priority class of the work.
+
+        Returns:
+            Callable: wrapped function
+        """
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with self.slot(priority):
+                return func(*args, **kwargs)
+
+        return wrapper
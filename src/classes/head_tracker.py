@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+
+from typing import Callable
+from threading import Lock
+
+
+class HeadTracker:
+    """Tracks the head and the finalized checkpoint of the beacon chain, as they are streamed
+    by the beacon node, see event_stream.py. Wakes the subscribed daemons on every new head,
+    so they do not wait for their interval.
+
+    While the stream is live, daemons that follow the tracker only poll every idle_factor
+    intervals, as a safety net. When the stream is lost, they poll on their interval again.
+
+    Example:
+        tracker = HeadTracker()
+        tracker.subscribe(daemon.wake)
+        tracker.on_head(slot=100)
+
+    Attributes:
+        idle_factor (int): daemons poll this many times less frequently while live.
+        live (bool): True while the event stream is connected.
+        slot (int): latest head slot, None if unknown.
+        finalized_epoch (int): latest finalized epoch, None if unknown.
+        __callbacks (list[Callable]): called on every new head.
+        __lock (Lock): keeps the head and the finality consistent.
+    """
+
+    def __init__(self, idle_factor: int = 10) -> None:
+        """Initializes a HeadTracker object.
+
+        Args:
+            idle_factor (int, optional): polling is this many times less frequent while live.\
+                Defaults to 10.
+        """
+        self.idle_factor: int = idle_factor
+        self.live: bool = False
+        self.slot: int = None
+        self.finalized_epoch: int = None
+        self.__callbacks: list[Callable[[], None]] = []
+        self.__lock: Lock = Lock()
+
+    def subscribe(self, callback: Callable[[], None]) -> None:
+        """Calls the given function on every new head.
+
+        Args:
+            callback (Callable[[], None]): function to be called, such as Daemon.wake
+        """
+        with self.__lock:
+            self.__callbacks.append(callback)
+
+    def set_live(self, live: bool) -> None:
+        """Records if the event stream is connected. Wakes the subscribers when it is lost,
+        so they continue polling without waiting for the idle interval.
+
+        Args:
+            live (bool): True if connected
+        """
+        self.live = live
+        if not live:
+            self.__notify()
+
+    def on_head(self, slot: int) -> bool:
+        """Records a new head, and wakes the subscribers. Older heads are ignored.
+
+        Args:
+            slot (int): head slot
+
+        Returns:
+            bool: True if the head is new
+        """
+        with self.__lock:
+            if self.slot is not None and slot <= self.slot:
+                return False
+            self.slot = slot
+        self.__notify()
+        return True
+
+    def on_finalized(self, epoch: int) -> bool:
+        """Records a new finalized checkpoint. Older checkpoints are ignored.
+
+        Args:
+            epoch (int): finalized epoch
+
+        Returns:
+            bool: True if the checkpoint is new
+        """
+        with self.__lock:
+            if self.finalized_epoch is not None and epoch <= self.finalized_epoch:
+                return False
+            self.finalized_epoch = epoch
+            return True
+
+    def __notify(self) -> None:
+        """Calls the subscribers."""
+        with self.__lock:
+            callbacks: list[Callable[[], None]] = list(self.__callbacks)
+        for callback in callbacks:
+            callback()
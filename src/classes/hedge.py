@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+
+from collections import deque
+from threading import Lock
+
+
+class HedgePolicy:
+    """Decides when a read-only request should be hedged, by sending it to a second endpoint.
+    A request is hedged when it has not returned by the p95 latency of its method.
+    Every method earns a fraction of a hedge on each request, and spends one on each hedge,
+    so hedges can not be more than the given ratio of the requests, preventing load amplification.
+
+    Example:
+        policy = HedgePolicy(ratio=0.1)
+        delay = policy.delay("eth_call")
+        ...
+        if policy.allow("eth_call"):
+            ...
+        policy.observe("eth_call", latency)
+
+    Attributes:
+        ratio (float): maximum ratio of the hedged requests, per method.
+        burst (float): maximum number of hedges that can be saved, per method.
+        window (int): number of the latest latencies that the p95 is calculated with.
+        min_samples (int): latencies required before hedging a method.
+        __latencies (dict[str, deque]): latest latencies of every method.
+        __budgets (dict[str, float]): hedges that can be made for every method.
+        __lock (Lock): keeps the latencies and the budgets consistent.
+    """
+
+    def __init__(
+        self, ratio: float = 0.1, burst: float = 5, window: int = 200, min_samples: int = 20
+    ) -> None:
+        """Initializes a HedgePolicy object.
+
+        Args:
+            ratio (float, optional): maximum ratio of the hedged requests. Defaults to 0.1.
+            burst (float, optional): maximum hedges that can be saved. Defaults to 5.
+            window (int, optional): latencies that the p95 is calculated with. Defaults to 200.
+            min_samples (int, optional): latencies required before hedging. Defaults to 20.
+        """
+        self.ratio: float = ratio
+        self.burst: float = burst
+        self.window: int = window
+        self.min_samples: int = min_samples
+        self.__latencies: dict[str, deque] = {}
+        self.__budgets: dict[str, float] = {}
+        self.__lock: Lock = Lock()
+
+    def observe(self, method: str, latency: float) -> None:
+        """Records the latency of a request.
+
+        Args:
+            method (str): method of the request
+            latency (float): seconds until the response
+        """
+        with self.__lock:
+            self.__latencies.setdefault(method, deque(maxlen=self.window)).append(latency)
+
+    def delay(self, method: str) -> float:
+        """Returns the seconds to wait for a response, before hedging the request.
+        Earns a fraction of a hedge for the method.
+
+        Args:
+            method (str): method of the request
+
+        Returns:
+            float: p95 latency of the method, None if there are not enough samples yet.
+        """
+        with self.__lock:
+            self.__budgets[method] = min(self.burst, self.__budgets.get(method, 0.0) + self.ratio)
+            latencies: deque = self.__latencies.get(method, ())
+            if len(latencies) < self.min_samples:
+                return None
+            ordered: list[float] = sorted(latencies)
+            return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    def allow(self, method: str) -> bool:
+        """Spends a hedge for the method, if there is any left.
+
+        Args:
+            method (str): method of the request
+
+        Returns:
+            bool: True if the request can be hedged
+        """
+        with self.__lock:
+            if self.__budgets.get(method, 0.0) < 1:
+                return False
+            self.__budgets[method] -= 1
+            return True
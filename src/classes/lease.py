@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+import os
+import socket
+from uuid import uuid4
+from time import monotonic
+from threading import Lock
+
+from src.exceptions import StandbyError
+
+
+class Lease:
+    """Leadership of this geonius instance, when multiple instances are run for redundancy.
+    Only the instance holding the lease submits transactions, others stay on standby.
+    Lease is claimed and renewed on a shared database by the LeaseTrigger, see database/lease.py.
+    Without a duration, high availability is disabled and the instance is always the leader.
+
+    Every takeover increases the fencing token. A leader that misses its own renewals stops
+    submitting transactions when its local deadline passes, which is always earlier than
+    the deadline on the shared database. So, 2 instances can not submit at the same time.
+
+    Example:
+        lease = Lease(duration=12)
+        lease.update(token=1, claimed_at=monotonic())
+        token = lease.fence()
+
+    Attributes:
+        holder (str): unique name of this instance.
+        duration (float): seconds that a claim is valid for, None if disabled.
+        token (int): fencing token of the current leadership, None on standby.
+        __deadline (float): monotonic time that the current claim expires.
+        __lock (Lock): keeps the token and the deadline consistent.
+    """
+
+    def __init__(self, duration: float = None) -> None:
+        """Initializes a Lease object.
+
+        Args:
+            duration (float, optional): seconds that a claim is valid for.\
+                Defaults to None, disabling high availability.
+        """
+        self.holder: str = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        self.duration: float = duration
+        self.token: int = None
+        self.__deadline: float = 0.0
+        self.__lock: Lock = Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Returns True if high availability is enabled, as a property
+
+        Returns:
+            bool: True if enabled
+        """
+        return self.duration is not None
+
+    def is_leader(self) -> bool:
+        """Returns True if this instance can submit transactions.
+
+        Returns:
+            bool: True if leader
+        """
+        if not self.enabled:
+            return True
+        with self.__lock:
+            return self.token is not None and monotonic() < self.__deadline
+
+    def update(self, token: int, claimed_at: float) -> None:
+        """Records a successful claim of the lease.
+
+        Args:
+            token (int): fencing token of the leadership
+            claimed_at (float): monotonic time, taken before the claim was made
+        """
+        with self.__lock:
+            self.token = token
+            self.__deadline = claimed_at + self.duration
+
+    def revoke(self) -> None:
+        """Records that the lease is lost, switches to standby."""
+        with self.__lock:
+            self.token = None
+            self.__deadline = 0.0
+
+    def fence(self) -> int:
+        """Returns the fencing token, to be called right before submitting a transaction.
+
+        Returns:
+            int: fencing token, None if high availability is disabled
+
+        Raises:
+            StandbyError: this instance is not holding the lease
+        """
+        if not self.is_leader():
+            raise StandbyError("Not holding the lease, transaction is not submitted.")
+        return self.token
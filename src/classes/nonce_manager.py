@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+
+from typing import Callable, Iterator
+from threading import Lock
+from contextlib import contextmanager
+
+
+class NonceManager:
+    """Allocates the nonces of the transactions locally, so they can be submitted back-to-back
+    without asking the node for the nonce of every transaction, which might lag behind.
+    The next nonce of an address is fetched once, and again after an error (resync).
+
+    Transactions that are submitted are tracked as pending, until they are settled.
+    Pending and allocated nonces are never reused, even if the node reports a lower nonce.
+    Nonces of the failed transactions are given again first, so there is no gap.
+
+    Example:
+        nonces = NonceManager(lambda address: w3.eth.get_transaction_count(address, "pending"))
+        with nonces.reserve(address) as nonce:
+            tx_hash = func.transact({"nonce": nonce})
+        nonces.track(address, nonce, tx_hash)
+
+    Attributes:
+        __fetch (Callable[[str], int]): returns the next nonce of an address from the node.
+        __next (dict[str, int]): next nonce of every address, missing if it should be fetched.
+        __pending (dict[str, dict[int, str]]): hashes of the pending transactions, by their nonce.
+        __allocated (dict[str, set[int]]): nonces that are allocated, but not tracked yet.
+        __lock (Lock): keeps the nonces consistent across threads.
+    """
+
+    def __init__(self, fetch: Callable[[str], int]) -> None:
+        """Initializes a NonceManager object.
+
+        Args:
+            fetch (Callable[[str], int]): returns the next nonce of an address from the node,\
+                including the pending transactions.
+        """
+        self.__fetch: Callable[[str], int] = fetch
+        self.__next: dict[str, int] = {}
+        self.__pending: dict[str, dict[int, str]] = {}
+        self.__allocated: dict[str, set[int]] = {}
+        self.__lock: Lock = Lock()
+
+    def allocate(self, address: str) -> int:
+        """Returns the next nonce of the given address, which is not given again.
+        After a resync, it is the lowest nonce from the node that is not pending or allocated.
+
+        Args:
+            address (str): sender of the transaction
+
+        Returns:
+            int: nonce
+        """
+        with self.__lock:
+            if address not in self.__next:
+                self.__next[address] = self.__fetch(address)
+            pending: dict[int, str] = self.__pending.get(address, {})
+            allocated: set[int] = self.__allocated.setdefault(address, set())
+
+            nonce: int = self.__next[address]
+            while nonce in pending or nonce in allocated:
+                nonce += 1
+            allocated.add(nonce)
+            self.__next[address] = nonce + 1
+            return nonce
+
+    @contextmanager
+    def reserve(self, address: str) -> Iterator[int]:
+        """Allocates the next nonce of the given address for a transaction.
+        If the transaction fails, its nonce is released and given again first, so there is no gap.
+
+        Args:
+            address (str): sender of the transaction
+
+        Yields:
+            int: nonce
+        """
+        nonce: int = self.allocate(address)
+        try:
+            yield nonce
+        except Exception:
+            self.release(address, nonce)
+            raise
+
+    def resync(self, address: str) -> None:
+        """Fetches the next nonce of the given address from the node, on the next allocation.
+
+        Args:
+            address (str): sender of the transactions
+        """
+        with self.__lock:
+            self.__next.pop(address, None)
+
+    def track(self, address: str, nonce: int, tx_hash: str) -> None:
+        """Records a submitted transaction as pending.
+
+        Args:
+            address (str): sender of the transaction
+            nonce (int): nonce of the transaction
+            tx_hash (str): hash of the transaction
+        """
+        with self.__lock:
+            self.__allocated.get(address, set()).discard(nonce)
+            self.__pending.setdefault(address, {})[nonce] = tx_hash
+
+    def settle(self, address: str, nonce: int) -> None:
+        """Stops tracking the transactions of the given address until the given nonce,
+        as they are mined or dropped.
+
+        Args:
+            address (str): sender of the transactions
+            nonce (int): nonce of the last settled transaction
+        """
+        with self.__lock:
+            pending: dict[int, str] = self.__pending.get(address, {})
+            for n in [n for n in pending if n <= nonce]:
+                del pending[n]
+
+    def release(self, address: str, nonce: int) -> None:
+        """Stops tracking a transaction that failed, or is not known by the node anymore,
+        so its nonce is unused. Nonces are fetched again on the next allocation.
+
+        Args:
+            address (str): sender of the transaction
+            nonce (int): nonce of the transaction
+        """
+        with self.__lock:
+            self.__pending.get(address, {}).pop(nonce, None)
+            self.__allocated.get(address, set()).discard(nonce)
+            self.__next.pop(address, None)
+
+    def pending(self, address: str) -> dict[int, str]:
+        """Returns the pending transactions of the given address.
+
+        Args:
+            address (str): sender of the transactions
+
+        Returns:
+            dict[int, str]: hashes of the pending transactions, by their nonce
+        """
+        with self.__lock:
+            return dict(self.__pending.get(address, {}))
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+
+import os
+import subprocess
+from threading import BoundedSemaphore
+
+
+class ProcessPool:
+    """Runs the subprocesses concurrently, but no more than the size of the pool at a time,
+    such as ethdo that is called several times for every validator.
+    Callers wait for a free slot, and subprocesses that exceed the timeout are killed.
+
+    Example:
+        pool = ProcessPool(size=4, timeout=60)
+        res = pool.run(["ethdo", "wallet", "info", "--wallet=geonius"])
+
+    Attributes:
+        size (int): number of the subprocesses that can run at the same time
+        timeout (float): seconds that a subprocess can run for
+        __slots (BoundedSemaphore): free slots of the pool
+    """
+
+    def __init__(self, size: int = None, timeout: float = 60) -> None:
+        """Initializes a ProcessPool object.
+
+        Args:
+            size (int, optional): number of the subprocesses that can run at the same time.\
+                Defaults to the number of the cores.
+            timeout (float, optional): seconds that a subprocess can run for. Defaults to 60.
+        """
+        self.size: int = size or os.cpu_count() or 1
+        self.timeout: float = timeout
+        self.__slots: BoundedSemaphore = BoundedSemaphore(self.size)
+
+    def run(self, args: list[str], timeout: float = None) -> bytes:
+        """Runs the given command when there is a free slot, and returns its output.
+
+        Args:
+            args (list[str]): command and its arguments
+            timeout (float, optional): seconds that the subprocess can run for.\
+                Defaults to the timeout of the pool.
+
+        Returns:
+            bytes: standard output of the subprocess
+
+        Raises:
+            CalledProcessError: Raised if the subprocess exits with a non-zero code.
+            TimeoutExpired: Raised if the subprocess is killed after the timeout.
+        """
+        with self.__slots:
+            res: subprocess.CompletedProcess = subprocess.run(
+                args,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                timeout=timeout or self.timeout,
+                check=True,
+            )
+        return res.stdout
@@ -0,0 +1,355 @@
+# -*- coding: utf-8 -*-
+
+from time import monotonic
+from typing import Any, Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+from requests.exceptions import HTTPError
+from web3.providers.base import JSONBaseProvider
+from web3.providers.rpc import HTTPProvider
+from web3.types import RPCEndpoint, RPCResponse
+from geodefi.classes import Beacon
+from geodefi.exceptions import HTTPRequestError
+from geodefi.globals import Network
+
+from src.globals import get_logger, get_gate
+from .endpoint_pool import Endpoint, EndpointPool
+from .gate import PriorityGate, current_priority
+from .hedge import HedgePolicy
+
+# json-rpc error codes that are caused by the endpoint, rather than the request
+OVERLOADED_CODES: tuple[int, ...] = (-32005, -32097, 429)
+
+# read-only methods that can be sent to multiple endpoints at the same time
+HEDGED_METHODS: tuple[str, ...] = (
+    "eth_blockNumber",
+    "eth_call",
+    "eth_chainId",
+    "eth_estimateGas",
+    "eth_feeHistory",
+    "eth_gasPrice",
+    "eth_getBalance",
+    "eth_getBlockByHash",
+    "eth_getBlockByNumber",
+    "eth_getCode",
+    "eth_getLogs",
+    "eth_getStorageAt",
+    "eth_getTransactionByHash",
+    "eth_getTransactionCount",
+    "eth_getTransactionReceipt",
+    "eth_maxPriorityFeePerGas",
+)
+
+
+def is_overloaded(response: RPCResponse) -> bool:
+    """Returns True if the json-rpc response is an error caused by the endpoint, like rate limits.
+
+    Args:
+        response (RPCResponse): response of the endpoint
+
+    Returns:
+        bool: True if another endpoint should be tried
+    """
+    error: Any = response.get("error") if isinstance(response, dict) else None
+    if not isinstance(error, dict):
+        return False
+    return error.get("code") in OVERLOADED_CODES or "rate limit" in str(error.get("message"))
+
+
+def is_client_error(error: Exception) -> bool:
+    """Returns True if the beacon endpoint responded to the request with a client error,
+    like 404 for a validator that is not visible yet. Then, other endpoints would respond the same.
+
+    Args:
+        error (Exception): error raised by the geodefi Beacon, or by requests
+
+    Returns:
+        bool: True if the endpoint is healthy, but the request is not.
+    """
+    if isinstance(error, HTTPError) and error.response is not None:
+        status: int = error.response.status_code
+    elif isinstance(error.__cause__, HTTPRequestError) and error.__cause__.args:
+        status: int = int(error.__cause__.args[0])
+    else:
+        return False
+    return 400 <= status < 500 and status != 429
+
+
+class PooledHTTPProvider(JSONBaseProvider):
+    """An execution provider that sends the requests to the healthiest endpoint of the pool,
+    failing over to the next one on connection errors, timeouts and rate limits.
+    Other json-rpc errors, like reverts, are returned as they are.
+
+    Read-only requests are hedged: if the healthiest endpoint has not responded by the p95
+    latency of the method, the request is also sent to the next endpoint and the first
+    response wins. Hedges are limited per method by the HedgePolicy.
+
+    Example:
+        w3 = Web3(PooledHTTPProvider(EndpointPool(["https://a", "https://b"])))
+
+    Attributes:
+        pool (EndpointPool): endpoints of the execution layer.
+        hedge (HedgePolicy): decides when the read-only requests are hedged.
+        __providers (dict[str, HTTPProvider]): provider for every endpoint.
+        __executor (ThreadPoolExecutor): sends the hedged requests.
+    """
+
+    def __init__(self, pool: EndpointPool, hedge: HedgePolicy = None) -> None:
+        """Initializes a PooledHTTPProvider object.
+
+        Args:
+            pool (EndpointPool): endpoints of the execution layer.
+            hedge (HedgePolicy, optional): hedging policy. Defaults to HedgePolicy().
+        """
+        super().__init__()
+        self.pool: EndpointPool = pool
+        self.hedge: HedgePolicy = hedge if hedge else HedgePolicy()
+        self.__providers: dict[str, HTTPProvider] = {
+            endpoint.url: HTTPProvider(endpoint.url) for endpoint in pool.endpoints
+        }
+        self.__executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=4 * len(pool), thread_name_prefix="HEDGE"
+        )
+
+    def request(self, endpoint: Endpoint, method: RPCEndpoint, params: Any) -> RPCResponse:
+        """Sends the request to the given endpoint, recording its health.
+
+        Args:
+            endpoint (Endpoint): endpoint to send the request to.
+            method (RPCEndpoint): json-rpc method
+            params (Any): json-rpc parameters
+
+        Returns:
+            RPCResponse: response of the endpoint
+
+        Raises:
+            Exception: connection errors, timeouts and http errors of the endpoint.
+        """
+        start: float = monotonic()
+        try:
+            response: RPCResponse = self.__providers[endpoint.url].make_request(method, params)
+        except Exception:
+            self.pool.record(endpoint, monotonic() - start, ok=False)
+            raise
+        self.pool.record(endpoint, monotonic() - start, ok=not is_overloaded(response))
+        return response
+
+    def __hedged_request(
+        self, endpoints: list[Endpoint], method: RPCEndpoint, params: Any
+    ) -> RPCResponse:
+        """Sends the request to the first endpoint, and to the second one if the first one
+        does not respond by the p95 latency of the method. Returns the first healthy response,
+        the other request is ignored.
+
+        Args:
+            endpoints (list[Endpoint]): 2 endpoints, healthiest first.
+            method (RPCEndpoint): json-rpc method
+            params (Any): json-rpc parameters
+
+        Returns:
+            RPCResponse: first healthy response, None if both endpoints failed.
+        """
+        start: float = monotonic()
+        pending: set[Future] = {self.__executor.submit(self.request, endpoints[0], method, params)}
+        hedged: bool = False
+
+        while pending:
+            timeout: float = None
+            if not hedged:
+                delay: float = self.hedge.delay(method)
+                timeout = None if delay is None else max(0.0, delay - (monotonic() - start))
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                if future.exception() is None and not is_overloaded(future.result()):
+                    self.hedge.observe(method, monotonic() - start)
+                    for other in pending:
+                        # still records the health of its endpoint, if it is already sent
+                        other.cancel()
+                    return future.result()
+
+            if not hedged:
+                hedged = True
+                # a failed first request is retried on the second endpoint, without a budget
+                if done or self.hedge.allow(method):
+                    get_logger().debug(
+                        "Hedging %s on execution endpoint %s.",
+                        method,
+                        self.pool.endpoints.index(endpoints[1]),
+                    )
+                    pending.add(self.__executor.submit(self.request, endpoints[1], method, params))
+
+        return None
+
+    def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        """Sends the request within a slot of the shared gate, with the priority of the caller.
+        Requests made while already holding a slot, like the multithreaded ones, are not gated
+        again. See PriorityGate.
+
+        Args:
+            method (RPCEndpoint): json-rpc method
+            params (Any): json-rpc parameters
+
+        Returns:
+            RPCResponse: response of the first healthy endpoint, or the last response.
+
+        Raises:
+            Exception: the last error, if none of the endpoints responded.
+        """
+        gate: PriorityGate = get_gate()
+        if gate is None or gate.holding():
+            return self.__send(method, params)
+        with gate.slot(current_priority()):
+            return self.__send(method, params)
+
+    def __send(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        """Sends the request to the endpoints, healthiest first, until one of them responds.
+        Read-only requests are hedged between the 2 healthiest endpoints first.
+
+        Args:
+            method (RPCEndpoint): json-rpc method
+            params (Any): json-rpc parameters
+
+        Returns:
+            RPCResponse: response of the first healthy endpoint, or the last response.
+
+        Raises:
+            Exception: the last error, if none of the endpoints responded.
+        """
+        endpoints: list[Endpoint] = self.pool.ranked()
+        if method in HEDGED_METHODS and len(endpoints) > 1:
+            response: RPCResponse = self.__hedged_request(endpoints[:2], method, params)
+            if response is not None:
+                return response
+            endpoints = endpoints[2:]
+
+        response: RPCResponse = None
+        error: Exception = None
+        for endpoint in endpoints:
+            try:
+                response = self.request(endpoint, method, params)
+            except Exception as e:
+                error = e
+            else:
+                if not is_overloaded(response):
+                    return response
+            get_logger().debug(
+                "Execution endpoint %s failed on %s, failing over.",
+                self.pool.endpoints.index(endpoint),
+                method,
+            )
+
+        if response is not None:
+            return response
+        if error is None:
+            # hedged endpoints failed, and there are no others
+            return self.request(self.pool.ranked()[0], method, params)
+        raise error
+
+
+class PooledBeacon:
+    """A geodefi Beacon that sends the requests to the healthiest endpoint of the pool,
+    failing over to the next one. Client errors, like 404, are raised without failing over.
+    Provides the same functions with the geodefi Beacon.
+
+    Example:
+        beacon = PooledBeacon(EndpointPool(["https://a", "https://b"]), Network.holesky)
+        beacon.beacon_headers_id("head")
+
+    Attributes:
+        pool (EndpointPool): endpoints of the consensus layer.
+        network (Network): network of the endpoints.
+        api_base (str): url of the preferred endpoint.
+        __beacons (dict[str, Beacon]): geodefi Beacon for every endpoint.
+    """
+
+    def __init__(self, pool: EndpointPool, network: Network) -> None:
+        """Initializes a PooledBeacon object.
+
+        Args:
+            pool (EndpointPool): endpoints of the consensus layer.
+            network (Network): network of the endpoints.
+        """
+        self.pool: EndpointPool = pool
+        self.network: Network = network
+        self.api_base: str = pool.endpoints[0].url
+        self.__beacons: dict[str, Beacon] = {
+            endpoint.url: Beacon(network=network, cons_api=endpoint.url)
+            for endpoint in pool.endpoints
+        }
+
+    def request(self, endpoint: Endpoint, attr: str, *args, **kwargs) -> Any:
+        """Calls the given function of the Beacon of the given endpoint, recording its health.
+
+        Args:
+            endpoint (Endpoint): endpoint to send the request to.
+            attr (str): name of the Beacon function.
+
+        Returns:
+            Any: response of the endpoint
+
+        Raises:
+            Exception: errors of the endpoint, and client errors.
+        """
+        start: float = monotonic()
+        try:
+            res: Any = getattr(self.__beacons[endpoint.url], attr)(*args, **kwargs)
+        except Exception as e:
+            self.pool.record(endpoint, monotonic() - start, ok=is_client_error(e))
+            raise
+        self.pool.record(endpoint, monotonic() - start, ok=True)
+        return res
+
+    def failover(self, func: Callable[[str], Any]) -> Any:
+        """Calls the given function with the url of the endpoints, healthiest first,
+        until one of them succeeds. For the requests that geodefi Beacon does not provide.
+
+        Args:
+            func (Callable[[str], Any]): function that sends a request to the given api base.
+
+        Returns:
+            Any: result of the function
+
+        Raises:
+            Exception: client errors, or the last error if none of the endpoints succeeded.
+        """
+        error: Exception = None
+        for endpoint in self.pool.ranked():
+            start: float = monotonic()
+            try:
+                res: Any = func(endpoint.url)
+            except Exception as e:
+                self.pool.record(endpoint, monotonic() - start, ok=is_client_error(e))
+                if is_client_error(e):
+                    raise
+                error = e
+                get_logger().debug(
+                    "Consensus endpoint %s failed, failing over.",
+                    self.pool.endpoints.index(endpoint),
+                )
+                continue
+            self.pool.record(endpoint, monotonic() - start, ok=True)
+            return res
+        raise error
+
+    def __getattr__(self, attr: str) -> Callable:
+        if attr.startswith("_") or not callable(getattr(Beacon, attr, None)):
+            raise AttributeError(attr)
+
+        def call(*args, **kwargs) -> Any:
+            error: Exception = None
+            for endpoint in self.pool.ranked():
+                try:
+                    return self.request(endpoint, attr, *args, **kwargs)
+                except Exception as e:
+                    if is_client_error(e):
+                        raise
+                    error = e
+                get_logger().debug(
+                    "Consensus endpoint %s failed on %s, failing over.",
+                    self.pool.endpoints.index(endpoint),
+                    attr,
+                )
+            raise error
+
+        return call
@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import json
+from abc import ABC, abstractmethod
+from threading import Lock
+from multiprocessing import get_context
+from concurrent.futures import ProcessPoolExecutor
+from py_ecc.bls import G2ProofOfPossession as bls
+
+from src.utils.keystore import decrypt_keystore
+from src.utils.deposit import (
+    withdrawal_credentials,
+    deposit_message_root,
+    signing_root,
+    build_deposit_data,
+    sign,
+)
+
+
+def default_base_dir() -> str:
+    """Returns the directory that ethdo keeps the wallets in, if --base-dir is not provided.
+
+    Returns:
+        str: directory of the wallets
+    """
+    if sys.platform == "darwin":
+        config_dir: str = os.path.expanduser("~/Library/Application Support")
+    elif sys.platform == "win32":
+        config_dir: str = os.getenv("APPDATA", "")
+    else:
+        config_dir: str = os.getenv("XDG_CONFIG_HOME") or os.path.expanduser("~/.config")
+    return os.path.join(config_dir, "ethereum2", "wallets")
+
+
+class Signer(ABC):
+    """Signs the deposit data of the validators, instead of calling ethdo for every deposit.
+    Accounts are still created by ethdo. See generate_deposit_data.
+
+    Attributes:
+        name (str): name of the signer, as configured with ethdo.signer
+    """
+
+    name: str = None
+
+    @abstractmethod
+    def deposit_data(
+        self,
+        wallet: str,
+        account: str,
+        withdrawal_address: str,
+        deposit_value: int,
+        fork_version: bytes,
+    ) -> list[dict]:
+        """Returns the deposit data of the account, in the same format with ethdo --launchpad.
+
+        Args:
+            wallet (str): ethdo wallet
+            account (str): ethdo account
+            withdrawal_address (str): withdrawal address of the pool
+            deposit_value (int): deposit amount, as wei
+            fork_version (bytes): genesis fork version of the network
+
+        Returns:
+            list[dict]: deposit data
+        """
+
+
+class KeystoreSigner(Signer):
+    """Signs the deposit data in process, with the keystores that ethdo keeps on the filesystem.
+    Every account is decrypted once, and its secret key is kept in memory.
+    Only the non-deterministic wallets are supported, which is the default of ethdo.
+    Signatures can be calculated on a pool of subprocesses, since it is cpu-bound.
+
+    Example:
+        signer = KeystoreSigner(passphrase=os.getenv("ETHDO_ACCOUNT_PASSPHRASE"), processes=4)
+        data = signer.deposit_data("geonius", "Validator0", address, 31 * 10**18, fork_version)
+
+    Attributes:
+        name (str): name of the signer (value: native)
+        base_dir (str): directory of the ethdo wallets
+        __passphrase (str): passphrase of the ethdo accounts
+        __paths (dict[tuple[str, str], str]): keystore files of the accounts, by wallet and name
+        __keys (dict[tuple[str, str], tuple[bytes, int]]): public and secret keys of the accounts
+        __executor (ProcessPoolExecutor): subprocesses that sign, None if signed in process
+        __lock (Lock): keeps the keys consistent across threads
+    """
+
+    name: str = "native"
+
+    def __init__(self, passphrase: str, base_dir: str = None, processes: int = 0) -> None:
+        """Initializes a KeystoreSigner object.
+
+        Args:
+            passphrase (str): passphrase of the ethdo accounts
+            base_dir (str, optional): directory of the ethdo wallets. Defaults to the one of ethdo.
+            processes (int, optional): number of the subprocesses that sign.\
+                Defaults to 0, which signs in process.
+        """
+        self.base_dir: str = base_dir or default_base_dir()
+        self.__passphrase: str = passphrase
+        self.__paths: dict[tuple[str, str], str] = {}
+        self.__keys: dict[tuple[str, str], tuple[bytes, int]] = {}
+        self.__executor: ProcessPoolExecutor = (
+            ProcessPoolExecutor(max_workers=processes, mp_context=get_context("spawn"))
+            if processes > 1
+            else None
+        )
+        self.__lock: Lock = Lock()
+
+    def __scan(self, wallet: str) -> None:
+        """Finds the keystore files of all accounts in the given wallet.
+
+        Args:
+            wallet (str): ethdo wallet
+
+        Raises:
+            ValueError: Raised if the wallet does not exist, or it is not supported.
+        """
+        for wallet_id in os.listdir(self.base_dir):
+            wallet_dir: str = os.path.join(self.base_dir, wallet_id)
+            wallet_file: str = os.path.join(wallet_dir, wallet_id)
+            if not os.path.isfile(wallet_file):
+                continue
+
+            with open(wallet_file, encoding="utf-8") as f:
+                info: dict = json.load(f)
+            if info.get("name") != wallet:
+                continue
+            if info.get("type") != "non-deterministic":
+                raise ValueError(f"Wallet {wallet} is {info.get('type')}, not non-deterministic")
+
+            for account_id in os.listdir(wallet_dir):
+                path: str = os.path.join(wallet_dir, account_id)
+                if account_id in (wallet_id, "index") or not os.path.isfile(path):
+                    continue
+                with open(path, encoding="utf-8") as f:
+                    self.__paths[(wallet, json.load(f).get("name"))] = path
+            return
+
+        raise ValueError(f"Wallet {wallet} does not exist in {self.base_dir}")
+
+    def __key(self, wallet: str, account: str) -> tuple[bytes, int]:
+        """Returns the keys of the account, decrypting its keystore on the first time.
+
+        Args:
+            wallet (str): ethdo wallet
+            account (str): ethdo account
+
+        Returns:
+            tuple[bytes, int]: public and secret keys
+
+        Raises:
+            ValueError: Raised if the account does not exist, or can not be decrypted.
+        """
+        with self.__lock:
+            if (wallet, account) in self.__keys:
+                return self.__keys[(wallet, account)]
+
+            if (wallet, account) not in self.__paths:
+                # accounts might be created after the last scan
+                self.__scan(wallet)
+            if (wallet, account) not in self.__paths:
+                raise ValueError(f"Account {wallet}/{account} does not exist")
+            path: str = self.__paths[(wallet, account)]
+
+        # decrypted concurrently, the kdf is slow on purpose
+        with open(path, encoding="utf-8") as f:
+            keystore: dict = json.load(f)
+
+        secret: int = decrypt_keystore(keystore["crypto"], self.__passphrase)
+        pubkey: bytes = bls.SkToPk(secret)
+        if pubkey.hex() != keystore.get("pubkey", pubkey.hex()).replace("0x", ""):
+            raise ValueError(f"Keystore of {wallet}/{account} does not match its pubkey")
+
+        with self.__lock:
+            self.__keys[(wallet, account)] = (pubkey, secret)
+        return pubkey, secret
+
+    def deposit_data(
+        self,
+        wallet: str,
+        account: str,
+        withdrawal_address: str,
+        deposit_value: int,
+        fork_version: bytes,
+    ) -> list[dict]:
+        """Returns the deposit data of the account, in the same format with ethdo --launchpad.
+
+        Args:
+            wallet (str): ethdo wallet
+            account (str): ethdo account
+            withdrawal_address (str): withdrawal address of the pool
+            deposit_value (int): deposit amount, as wei
+            fork_version (bytes): genesis fork version of the network
+
+        Returns:
+            list[dict]: deposit data
+
+        Raises:
+            ValueError: Raised if the account does not exist, or can not be decrypted.
+        """
+        pubkey, secret = self.__key(wallet, account)
+
+        amount: int = int(deposit_value) // 1_000_000_000
+        credentials: bytes = withdrawal_credentials(withdrawal_address)
+        root: bytes = signing_root(deposit_message_root(pubkey, credentials, amount), fork_version)
+
+        if self.__executor is None:
+            signature: bytes = sign(secret, root)
+        else:
+            signature: bytes = self.__executor.submit(sign, secret, root).result()
+
+        return [build_deposit_data(pubkey, credentials, amount, fork_version, signature)]
@@ -2,6 +2,7 @@
 
 from typing import Callable
 
+from src.classes.gate import PRIORITY
 from src.globals import get_logger
 
 
@@ -17,9 +18,13 @@ class Trigger:
         t = Trigger(action)
 
     Attributes:
+        priority (PRIORITY): Priority class of the work done by the trigger and its daemon.\
+            Subclasses can override it. Defaults to NORMAL.
         __action (Callable): Function to be called when Triggered.
     """
 
+    priority: PRIORITY = PRIORITY.NORMAL
+
     def __init__(self, name: str, action: Callable) -> None:
         """Initializes a Trigger object.
         The trigger will process the changes of the daemon after a loop.
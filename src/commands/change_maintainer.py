@@ -4,7 +4,7 @@ import click
 
 from src.globals import get_sdk, get_config, get_logger
 from src.helpers.portal import get_name
-from src.utils.gas import get_gas
+from src.utils.gas import tx_params
 from src.utils.env import (
     load_env,
     set_geonius_private_key,
@@ -15,16 +15,6 @@ from src.utils.env import (
 from src.setup import setup
 
 
-def tx_params() -> dict:
-    priority_fee, base_fee = get_gas()
-    if priority_fee and base_fee:
-        return {
-            "maxPriorityFeePerGas": priority_fee,
-            "maxFeePerGas": base_fee,
-        }
-    return {}
-
-
 def change_maintainer(address: str):
     try:
         operator_id: int = get_config().operator_id
@@ -73,7 +73,12 @@ def config(main_dir: str, main_dir_path: str):
                 "Api key is detected. Please provide the api key"
             )
 
-        _config["network"] = {"refresh_rate": 60, "max_attempt": 20, "attempt_rate": 0.1}
+        _config["network"] = {
+            "refresh_rate": 60,
+            "max_attempt": 20,
+            "attempt_rate": 0.1,
+            "rpc_budget": 8,
+        }
         _config["strategy"] = {"min_proposal_queue": 0, "max_proposal_delay": 0}
         _config["logger"] = {
             "no_stream": False,
@@ -14,21 +14,10 @@ from src.utils.env import (
     set_api_key_consensus,
     set_api_key_gas,
 )
-from src.utils.gas import get_gas
+from src.utils.gas import tx_params
 from src.setup import setup
 
 
-def tx_params() -> dict:
-    priority_fee, base_fee = get_gas()
-    if priority_fee and base_fee:
-        return {
-            "maxPriorityFeePerGas": priority_fee,
-            "maxFeePerGas": base_fee,
-        }
-
-    return {}
-
-
 def decrease_wallet(value: int):
     try:
         _id = int(get_config().operator_id)
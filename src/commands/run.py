@@ -14,6 +14,7 @@ from src.utils.env import (
 )
 from src.globals import get_logger
 from src.setup import setup, init_dbs, run_daemons
+from src.actions.ethdo import load_accounts
 
 
 def config_reset(ctx, _option, value):
@@ -64,13 +65,13 @@ def config_reset(ctx, _option, value):
     "--chain-execution-api",
     required=False,
     type=click.STRING,
-    help="Api endpoint for the execution layer. Could be the rest api of the execution client.",
+    help="Api endpoint(s) for the execution layer, comma seperated. Could be the execution client.",
 )
 @click.option(
     "--chain-consensus-api",
     required=False,
     type=click.STRING,
-    help="Api endpoint for the consensus layer. Could be the rest api of the consensus client.",
+    help="Api endpoint(s) for the consensus layer, comma seperated. Could be the consensus client.",
 )
 @click.option(
     "--network-refresh-rate",
@@ -84,6 +85,12 @@ def config_reset(ctx, _option, value):
     type=click.IntRange(0, 10),
     help="Interval between api requests (s).",
 )
+@click.option(
+    "--network-rpc-budget",
+    required=False,
+    type=click.IntRange(1, 64),
+    help="Maximum concurrent api requests shared by all daemons, critical work is served first.",
+)
 @click.option(
     "--network-max-attempt",
     required=False,
@@ -102,6 +109,24 @@ def config_reset(ctx, _option, value):
     type=click.IntRange(0, 604800),
     help="Maximum seconds for any proposals to wait.",
 )
+@click.option(
+    "--gas-ceiling",
+    required=False,
+    type=click.IntRange(1_000_000, 30_000_000),
+    help="Maximum gas for a single proposal or stake tx, batches are sized accordingly.",
+)
+@click.option(
+    "--reservoir-depth",
+    required=False,
+    type=click.IntRange(0, 100),
+    help="Number of upcoming validators to generate the deposit data for, in advance.",
+)
+@click.option(
+    "--capacity-interval",
+    required=False,
+    type=click.IntRange(0, 1440),
+    help="Minutes between reconciling the capacity of the pools with the chain, 0 to disable.",
+)
 @click.option(
     "--no-log-file",
     is_flag=True,
@@ -162,6 +187,30 @@ def config_reset(ctx, _option, value):
     type=click.STRING,
     help="Default ethdo account name to create/utilize.",
 )
+@click.option(
+    "--ethdo-processes",
+    required=False,
+    type=click.IntRange(1, 64),
+    help="Maximum ethdo subprocesses to run at the same time. Defaults to the number of cores.",
+)
+@click.option(
+    "--ethdo-timeout",
+    required=False,
+    type=click.IntRange(1, 600),
+    help="Seconds before an ethdo subprocess is killed.",
+)
+@click.option(
+    "--ethdo-signer",
+    required=False,
+    type=click.Choice(["ethdo", "native"]),
+    help="Signer of the deposit data, native signs with the ethdo keystores in process.",
+)
+@click.option(
+    "--ethdo-base-dir",
+    required=False,
+    type=click.STRING,
+    help="Directory of the ethdo wallets, for the native signer.",
+)
 @click.option(
     "--dont-notify-devs",
     required=False,
@@ -270,11 +319,12 @@ def config_reset(ctx, _option, value):
 def main(**kwargs):
     """Main function of the program.
     This function is called with `geonius run`.
-    Initializes the databases and starts the daemons.
+    Initializes the databases, loads the ethdo accounts and starts the daemons.
     """
     try:
         setup(**kwargs, test_email=True, test_ethdo=False, test_operator=True)
         init_dbs(reset=kwargs["reset"])
+        load_accounts()
         run_daemons()
 
     except Exception as e:
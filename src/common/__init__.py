@@ -1,4 +1,4 @@
 # -*- coding: utf-8 -*-
 
 from .attribute_dict import AttributeDict
-from .loggable import Loggable
+from .loggable import Lazy, Loggable
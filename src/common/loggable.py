@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 import os
+from typing import Any, Callable
 from logging import StreamHandler, Formatter, Logger, basicConfig, getLogger
 from logging.handlers import TimedRotatingFileHandler
 
@@ -9,10 +10,49 @@ from geodefi.globals import Network
 from src.globals import get_config, get_sdk
 
 
+class Lazy:
+    """
+    A deferred argument for the log records, evaluated only when the record is emitted.
+    Can be used with the %-style messages, which are formatted by the logging module,
+    so the arguments that require calls, like the names of the pools, cost nothing
+    when the level is not enabled. Value is evaluated once, even with multiple handlers.
+
+    Example:
+        logger.debug("Surplus for pool %s: %s", Lazy(get_name, pool_id), surplus)
+
+    Attributes:
+        __func (Callable): function that returns the value.
+        __args (tuple): arguments of the function.
+    """
+
+    __unset: object = object()
+
+    def __init__(self, func: Callable[..., Any], *args) -> None:
+        """Initializes a Lazy object.
+
+        Args:
+            func (Callable[..., Any]): function that returns the value.
+            *args: arguments to be passed to the function
+        """
+        self.__func: Callable[..., Any] = func
+        self.__args: tuple = args
+        self.__value: Any = self.__unset
+
+    def __str__(self) -> str:
+        if self.__value is self.__unset:
+            try:
+                self.__value = self.__func(*self.__args)
+            except Exception as e:
+                # logging should never break the caller
+                self.__value = f"<unavailable: {e}>"
+        return str(self.__value)
+
+
 class Loggable:
     """
     A class to create a logger object with given streams and files. Supposed to be used as a
     global var. Logger functions can also be directly reached.
+    Message arguments can be deferred with Lazy, see above.
 
     Example:
         logger = Loggable()
@@ -24,6 +64,7 @@ class Loggable:
         from src.global.logger import log
         log.info("info message")
         log.error("error message")
+        log.debug("lazy message: %s", Lazy(func, arg))
 
 
     Attributes:
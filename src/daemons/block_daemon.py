@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 
 from src.classes import Daemon, Trigger
-from src.globals import get_sdk, get_logger, get_constants
+from src.globals import get_sdk, get_logger, get_constants, get_block_cache
 
 
 class BlockDaemon(Daemon):
@@ -62,6 +62,9 @@ class BlockDaemon(Daemon):
         # but this allows block_identifier.
         curr_block = get_sdk().w3.eth.get_block(self.block_identifier)
         get_logger().debug(f"New block detected: {curr_block.number}")
+        # calls are made on the latest block, other identifiers can not keep the cache valid
+        if get_block_cache() and self.block_identifier == "latest":
+            get_block_cache().advance(curr_block.number)
 
         # check if required number of blocks have past:
         if curr_block.number >= self.__recent_block + self.block_period:
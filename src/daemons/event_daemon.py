@@ -7,7 +7,7 @@ from web3.contract.contract import ContractEvent
 from src.classes import Daemon, Trigger
 from src.common import AttributeDict
 from src.exceptions import EventFetchingError
-from src.globals import get_sdk, get_constants, get_logger
+from src.globals import get_sdk, get_constants, get_logger, get_block_cache
 from src.database.events import find_latest_event
 from src.helpers.event import get_all_events
 
@@ -82,6 +82,9 @@ class EventDaemon(Daemon):
         # but this allows block_identifier.
         curr_block: int = (get_sdk().w3.eth.get_block(self.block_identifier)).number
         get_logger().debug(f"Processing Block: {curr_block}")
+        # calls are made on the latest block, other identifiers can not keep the cache valid
+        if get_block_cache() and self.block_identifier == "latest":
+            get_block_cache().advance(curr_block)
 
         # check if required number of blocks have past:
         if curr_block >= self.__last_snapshot.block_number + self.block_period:
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+
+from src.classes import Database
+from src.exceptions import DatabaseError
+from src.globals import get_logger
+
+
+def create_accounts_table() -> None:
+    """Creates the sql database table for Accounts, on the shared database.
+    Every row is an account on an ethdo wallet, so it is not pinged before every deposit.
+    It is refreshed from ethdo on startup, see load_accounts.
+
+    Raises:
+        DatabaseError: Error creating Accounts table
+    """
+
+    try:
+        with Database(Database.shared) as db:
+            db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS Accounts (
+                    wallet TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    PRIMARY KEY (wallet, name)
+                )
+                """
+            )
+        get_logger().debug(f"Created a new table: Accounts")
+    except Exception as e:
+        raise DatabaseError(f"Error creating Accounts table") from e
+
+
+def drop_accounts_table() -> None:
+    """Removes Accounts table from the database.
+
+    Raises:
+        DatabaseError: Error dropping Accounts table
+    """
+
+    try:
+        with Database(Database.shared) as db:
+            db.execute("""DROP TABLE IF EXISTS Accounts""")
+        get_logger().debug(f"Dropped Table: Accounts")
+    except Exception as e:
+        raise DatabaseError(f"Error dropping Accounts table") from e
+
+
+def reinitialize_accounts_table() -> None:
+    """Removes Accounts table and creates an empty one."""
+
+    drop_accounts_table()
+    create_accounts_table()
+
+
+def fetch_accounts(wallet: str) -> set[str]:
+    """Fetches the names of the accounts on the given wallet.
+
+    Args:
+        wallet (str): ethdo wallet
+
+    Returns:
+        set[str]: account names
+
+    Raises:
+        DatabaseError: Error fetching accounts from Accounts table
+    """
+
+    try:
+        with Database(Database.shared) as db:
+            db.execute("SELECT name FROM Accounts WHERE wallet = ?", (wallet,))
+            return {row[0] for row in db.fetchall()}
+    except Exception as e:
+        raise DatabaseError(f"Error fetching accounts from table Accounts") from e
+
+
+def save_accounts(wallet: str, names: list[str]) -> None:
+    """Saves the given accounts of the wallet.
+
+    Args:
+        wallet (str): ethdo wallet
+        names (list[str]): account names
+
+    Raises:
+        DatabaseError: Error saving accounts into Accounts table
+    """
+
+    try:
+        with Database(Database.shared) as db:
+            db.executemany(
+                "INSERT OR IGNORE INTO Accounts VALUES (?,?)",
+                [(wallet, name) for name in names],
+            )
+    except Exception as e:
+        raise DatabaseError(f"Error saving accounts into table Accounts") from e
+
+
+def replace_accounts(wallet: str, names: list[str]) -> None:
+    """Replaces the accounts of the wallet with the given ones, as listed by ethdo.
+
+    Args:
+        wallet (str): ethdo wallet
+        names (list[str]): account names
+
+    Raises:
+        DatabaseError: Error replacing accounts on Accounts table
+    """
+
+    try:
+        with Database(Database.shared) as db:
+            db.execute("DELETE FROM Accounts WHERE wallet = ?", (wallet,))
+            db.executemany(
+                "INSERT OR IGNORE INTO Accounts VALUES (?,?)",
+                [(wallet, name) for name in names],
+            )
+    except Exception as e:
+        raise DatabaseError(f"Error replacing accounts on table Accounts") from e
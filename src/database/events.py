@@ -19,7 +19,7 @@ def find_latest_event(event_name: str) -> AttributeDict:
     """
 
     try:
-        with Database() as db:
+        with Database(Database.shared) as db:
             db.execute(
                 f"""
                 SELECT block_number,transaction_index,log_index
@@ -56,7 +56,7 @@ def create_alienated_table() -> None:
         DatabaseError: Error creating Alienated table
     """
     try:
-        with Database() as db:
+        with Database(Database.shared) as db:
             db.execute(
                 """
                 CREATE TABLE IF NOT EXISTS Alienated (
@@ -81,7 +81,7 @@ def drop_alienated_table() -> None:
     """
 
     try:
-        with Database() as db:
+        with Database(Database.shared) as db:
             db.execute("""DROP TABLE IF EXISTS Alienated""")
         get_logger().debug(f"Dropped Table: Alienated")
     except Exception as e:
@@ -102,7 +102,7 @@ def create_delegation_table() -> None:
         DatabaseError: Error creating Delegation table
     """
     try:
-        with Database() as db:
+        with Database(Database.shared) as db:
             db.execute(
                 """
                 CREATE TABLE IF NOT EXISTS Delegation (
@@ -128,7 +128,7 @@ def drop_delegation_table() -> None:
         DatabaseError: Error dropping Delegation table
     """
     try:
-        with Database() as db:
+        with Database(Database.shared) as db:
             db.execute("""DROP TABLE IF EXISTS Delegation""")
         get_logger().debug(f"Dropped Table: Delegation")
     except Exception as e:
@@ -149,7 +149,7 @@ def create_deposit_table() -> None:
         DatabaseError: Error creating Deposit table
     """
     try:
-        with Database() as db:
+        with Database(Database.shared) as db:
             db.execute(
                 """
                 CREATE TABLE IF NOT EXISTS Deposit (
@@ -176,7 +176,7 @@ def drop_deposit_table() -> None:
     """
 
     try:
-        with Database() as db:
+        with Database(Database.shared) as db:
             db.execute("""DROP TABLE IF EXISTS Deposit""")
         get_logger().debug(f"Dropped Table: Deposit")
     except Exception as e:
@@ -197,7 +197,7 @@ def create_fallback_operator_table() -> None:
         DatabaseError: Error creating FallbackOperator table
     """
     try:
-        with Database() as db:
+        with Database(Database.shared) as db:
             db.execute(
                 """
                 CREATE TABLE IF NOT EXISTS FallbackOperator (
@@ -223,7 +223,7 @@ def drop_fallback_operator_table() -> None:
     """
 
     try:
-        with Database() as db:
+        with Database(Database.shared) as db:
             db.execute("""DROP TABLE IF EXISTS FallbackOperator""")
         get_logger().debug(f"Dropped Table: FallbackOperator")
     except Exception as e:
@@ -244,7 +244,7 @@ def create_id_initiated_table() -> None:
         DatabaseError: Error creating IdInitiated table
     """
     try:
-        with Database() as db:
+        with Database(Database.shared) as db:
             db.execute(
                 """
                 CREATE TABLE IF NOT EXISTS IdInitiated (
@@ -269,7 +269,7 @@ def drop_id_initiated_table() -> None:
     """
 
     try:
-        with Database() as db:
+        with Database(Database.shared) as db:
             db.execute("""DROP TABLE IF EXISTS IdInitiated""")
         get_logger().debug(f"Dropped Table: IdInitiated")
     except Exception as e:
@@ -290,7 +290,7 @@ def create_exit_request_table() -> None:
         DatabaseError: Error creating ExitRequest table
     """
     try:
-        with Database() as db:
+        with Database(Database.shared) as db:
             db.execute(
                 """
                 CREATE TABLE IF NOT EXISTS ExitRequest (
@@ -316,7 +316,7 @@ def drop_exit_request_table() -> None:
     """
 
     try:
-        with Database() as db:
+        with Database(Database.shared) as db:
             db.execute("""DROP TABLE IF EXISTS ExitRequest""")
         get_logger().debug(f"Dropped Table: ExitRequest")
     except Exception as e:
@@ -337,7 +337,7 @@ def create_stake_proposal_table() -> None:
         DatabaseError: Error creating StakeProposal table
     """
     try:
-        with Database() as db:
+        with Database(Database.shared) as db:
             db.execute(
                 """
                 CREATE TABLE IF NOT EXISTS StakeProposal (
@@ -366,7 +366,7 @@ def drop_stake_proposal_table() -> None:
     """
 
     try:
-        with Database() as db:
+        with Database(Database.shared) as db:
             db.execute("""DROP TABLE IF EXISTS StakeProposal""")
         get_logger().debug(f"Dropped Table: StakeProposal")
     except Exception as e:
@@ -387,7 +387,7 @@ def create_stake_table() -> None:
         DatabaseError: Error creating Stake table
     """
     try:
-        with Database() as db:
+        with Database(Database.shared) as db:
             db.execute(
                 """
                 CREATE TABLE IF NOT EXISTS Stake (
@@ -414,7 +414,7 @@ def drop_stake_table() -> None:
     """
 
     try:
-        with Database() as db:
+        with Database(Database.shared) as db:
             db.execute("""DROP TABLE IF EXISTS Stake""")
         get_logger().debug(f"Dropped Table: Stake")
     except Exception as e:
@@ -435,7 +435,7 @@ def create_verification_index_updated_table() -> None:
         DatabaseError: Error creating VerificationIndexUpdated table
     """
     try:
-        with Database() as db:
+        with Database(Database.shared) as db:
             db.execute(
                 """
                 CREATE TABLE IF NOT EXISTS VerificationIndexUpdated (
@@ -459,7 +459,7 @@ def drop_verification_index_updated_table() -> None:
     """
 
     try:
-        with Database() as db:
+        with Database(Database.shared) as db:
             db.execute("""DROP TABLE IF EXISTS VerificationIndexUpdated""")
         get_logger().debug(f"Dropped Table: VerificationIndexUpdated")
     except Exception as e:
@@ -471,3 +471,27 @@ def reinitialize_verification_index_updated_table() -> None:
 
     drop_verification_index_updated_table()
     create_verification_index_updated_table()
+
+
+def fetch_delegated_pools(operator_id: int) -> list[int]:
+    """Fetches the pools that have delegated to the given operator, at least once.
+
+    Args:
+        operator_id (int): ID of the operator
+
+    Returns:
+        list[int]: list of pool IDs
+
+    Raises:
+        DatabaseError: Error fetching delegated pools from Delegation table
+    """
+
+    try:
+        with Database(Database.shared) as db:
+            db.execute(
+                "SELECT DISTINCT pool_id FROM Delegation WHERE operator_id = ?",
+                (str(operator_id),),
+            )
+            return [int(pool_id) for (pool_id,) in db.fetchall()]
+    except Exception as e:
+        raise DatabaseError(f"Error fetching delegated pools from table Delegation") from e
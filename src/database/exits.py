@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+
+from geodefi.globals import VALIDATOR_STATE
+
+from src.classes import Database
+from src.exceptions import DatabaseError
+from src.globals import get_logger
+
+
+def create_exit_deadlines_table() -> None:
+    """Creates the sql database table for ExitDeadlines.
+    Every row is a validator that requested an exit and waiting to be finalized.
+    An exit is due on the withdrawable epoch of the validator, or on its exit epoch if unknown.
+
+    Raises:
+        DatabaseError: Error creating ExitDeadlines table
+    """
+
+    try:
+        with Database() as db:
+            db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS ExitDeadlines (
+                    pubkey TEXT NOT NULL PRIMARY KEY,
+                    pool_id TEXT NOT NULL,
+                    exit_epoch INTEGER NOT NULL,
+                    withdrawable_epoch INTEGER
+                )
+                """
+            )
+            db.execute(
+                """
+                CREATE INDEX IF NOT EXISTS ExitDeadlinesEpoch
+                ON ExitDeadlines (exit_epoch)
+                """
+            )
+        get_logger().debug(f"Created a new table: ExitDeadlines")
+    except Exception as e:
+        raise DatabaseError(f"Error creating ExitDeadlines table") from e
+
+
+def drop_exit_deadlines_table() -> None:
+    """Removes ExitDeadlines table from the database.
+
+    Raises:
+        DatabaseError: Error dropping ExitDeadlines table
+    """
+
+    try:
+        with Database() as db:
+            db.execute("""DROP TABLE IF EXISTS ExitDeadlines""")
+        get_logger().debug(f"Dropped Table: ExitDeadlines")
+    except Exception as e:
+        raise DatabaseError(f"Error dropping ExitDeadlines table") from e
+
+
+def reinitialize_exit_deadlines_table() -> None:
+    """Removes ExitDeadlines table and creates an empty one."""
+
+    drop_exit_deadlines_table()
+    create_exit_deadlines_table()
+
+
+def save_exit_deadlines(deadlines: list[tuple[str, str, int, int]]) -> None:
+    """Saves the exit deadlines of the given validators, replacing the known ones.
+
+    Args:
+        deadlines (list[tuple[str, str, int, int]]): list of\
+            (pubkey, pool_id, exit_epoch, withdrawable_epoch), withdrawable epoch can be None.
+
+    Raises:
+        DatabaseError: Error saving deadlines into ExitDeadlines table
+    """
+
+    try:
+        with Database() as db:
+            db.executemany(
+                "INSERT OR REPLACE INTO ExitDeadlines VALUES (?,?,?,?)",
+                [
+                    (
+                        pk,
+                        str(pool_id),
+                        int(exit_epoch),
+                        None if withdrawable_epoch is None else int(withdrawable_epoch),
+                    )
+                    for pk, pool_id, exit_epoch, withdrawable_epoch in deadlines
+                ],
+            )
+        get_logger().debug(f"Saved {len(deadlines)} exit deadlines")
+    except Exception as e:
+        raise DatabaseError(f"Error saving deadlines into table ExitDeadlines") from e
+
+
+def import_exit_requested_validators() -> None:
+    """Schedules the validators that are EXIT_REQUESTED on the Validators table, but not
+    known by the ExitDeadlines table yet. Relies on the exit_epoch that was saved previously,
+    withdrawable epochs of them are not known.
+
+    Raises:
+        DatabaseError: Error importing validators into ExitDeadlines table
+    """
+
+    try:
+        with Database() as db:
+            db.execute(
+                """
+                INSERT OR IGNORE INTO ExitDeadlines (pubkey, pool_id, exit_epoch)
+                SELECT pubkey, pool_id, exit_epoch FROM Validators
+                WHERE portal_state = ? AND exit_epoch IS NOT NULL
+                """,
+                (int(VALIDATOR_STATE.EXIT_REQUESTED),),
+            )
+    except Exception as e:
+        raise DatabaseError(f"Error importing validators into table ExitDeadlines") from e
+
+
+def fetch_next_exit_epoch() -> int:
+    """Fetches the earliest epoch that an exit is due on, see create_exit_deadlines_table.
+
+    Returns:
+        int: earliest due epoch, None if there are no validators waiting.
+
+    Raises:
+        DatabaseError: Error fetching the next exit epoch from ExitDeadlines table
+    """
+
+    try:
+        with Database() as db:
+            db.execute("SELECT MIN(COALESCE(withdrawable_epoch, exit_epoch)) FROM ExitDeadlines")
+            return db.fetchone()[0]
+    except Exception as e:
+        raise DatabaseError(f"Error fetching the next exit epoch from table ExitDeadlines") from e
+
+
+def fetch_due_exits(epoch: int) -> list[tuple[str, str]]:
+    """Fetches the validators that are due on the given epoch: reached their withdrawable epoch,
+    or their exit epoch if the withdrawable epoch is not known.
+
+    Args:
+        epoch (int): current epoch
+
+    Returns:
+        list[tuple[str, str]]: list of (pubkey, pool_id)
+
+    Raises:
+        DatabaseError: Error fetching due exits from ExitDeadlines table
+    """
+
+    try:
+        with Database() as db:
+            db.execute(
+                """
+                SELECT pubkey, pool_id FROM ExitDeadlines
+                WHERE COALESCE(withdrawable_epoch, exit_epoch) <= ?
+                ORDER BY COALESCE(withdrawable_epoch, exit_epoch)
+                """,
+                (int(epoch),),
+            )
+            return db.fetchall()
+    except Exception as e:
+        raise DatabaseError(f"Error fetching due exits from table ExitDeadlines") from e
+
+
+def remove_exit_deadlines(pubkeys: list[str]) -> None:
+    """Removes the given validators from the ExitDeadlines table, after their exit is finalized.
+
+    Args:
+        pubkeys (list[str]): public keys of the validators
+
+    Raises:
+        DatabaseError: Error removing deadlines from ExitDeadlines table
+    """
+
+    try:
+        with Database() as db:
+            db.executemany(
+                "DELETE FROM ExitDeadlines WHERE pubkey = ?",
+                [(pk,) for pk in pubkeys],
+            )
+    except Exception as e:
+        raise DatabaseError(f"Error removing deadlines from table ExitDeadlines") from e
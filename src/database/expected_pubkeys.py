@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+
+from src.classes import Database
+from src.exceptions import DatabaseError
+from src.globals import get_logger
+
+
+def create_expected_pubkeys_table() -> None:
+    """Creates the sql database table for ExpectedPubkeys.
+    Every row is a pubkey that is waiting to be visible on the beacon chain.
+
+    Raises:
+        DatabaseError: Error creating ExpectedPubkeys table
+    """
+
+    try:
+        with Database() as db:
+            # queue seperates the pubkeys of different ExpectPubkeysTriggers.
+            db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS ExpectedPubkeys (
+                    queue TEXT NOT NULL,
+                    pubkey TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_check_ts INTEGER NOT NULL,
+                    created_ts INTEGER NOT NULL,
+                    PRIMARY KEY (queue, pubkey)
+                )
+                """
+            )
+            db.execute(
+                """
+                CREATE INDEX IF NOT EXISTS ExpectedPubkeysDue
+                ON ExpectedPubkeys (queue, next_check_ts)
+                """
+            )
+        get_logger().debug(f"Created a new table: ExpectedPubkeys")
+    except Exception as e:
+        raise DatabaseError(f"Error creating ExpectedPubkeys table") from e
+
+
+def drop_expected_pubkeys_table() -> None:
+    """Removes ExpectedPubkeys table from the database.
+
+    Raises:
+        DatabaseError: Error dropping ExpectedPubkeys table
+    """
+
+    try:
+        with Database() as db:
+            db.execute("""DROP TABLE IF EXISTS ExpectedPubkeys""")
+        get_logger().debug(f"Dropped Table: ExpectedPubkeys")
+    except Exception as e:
+        raise DatabaseError(f"Error dropping ExpectedPubkeys table") from e
+
+
+def reinitialize_expected_pubkeys_table() -> None:
+    """Removes ExpectedPubkeys table and creates an empty one."""
+
+    drop_expected_pubkeys_table()
+    create_expected_pubkeys_table()
+
+
+def insert_expected_pubkeys(queue: str, pubkeys: list[str], timestamp: int) -> None:
+    """Adds the given pubkeys to the queue, they will be due immediately.
+    Pubkeys that are already in the queue are ignored, keeping their attempts.
+
+    Args:
+        queue (str): name of the queue
+        pubkeys (list[str]): pubkeys that will be expected
+        timestamp (int): current timestamp, used as the first check time
+
+    Raises:
+        DatabaseError: Error inserting pubkeys into ExpectedPubkeys table
+    """
+
+    try:
+        with Database() as db:
+            db.executemany(
+                """
+                INSERT OR IGNORE INTO ExpectedPubkeys
+                (queue, pubkey, attempts, next_check_ts, created_ts)
+                VALUES (?,?,0,?,?)
+                """,
+                [(queue, pk, timestamp, timestamp) for pk in pubkeys],
+            )
+        get_logger().debug(f"Inserted {len(pubkeys)} pubkeys into ExpectedPubkeys: {queue}")
+    except Exception as e:
+        raise DatabaseError(f"Error inserting pubkeys into table ExpectedPubkeys") from e
+
+
+def fetch_due_pubkeys(queue: str, timestamp: int, limit: int = -1) -> list[tuple[str, int]]:
+    """Fetches the pubkeys that should be checked at the given timestamp, oldest first.
+
+    Args:
+        queue (str): name of the queue
+        timestamp (int): current timestamp
+        limit (int, optional): maximum number of pubkeys to fetch. Defaults to -1, no limit.
+
+    Returns:
+        list[tuple[str, int]]: list of (pubkey, attempts)
+
+    Raises:
+        DatabaseError: Error fetching due pubkeys from ExpectedPubkeys table
+    """
+
+    try:
+        with Database() as db:
+            db.execute(
+                """
+                SELECT pubkey, attempts FROM ExpectedPubkeys
+                WHERE queue = ? AND next_check_ts <= ?
+                ORDER BY next_check_ts
+                LIMIT ?
+                """,
+                (queue, timestamp, limit),
+            )
+            return db.fetchall()
+    except Exception as e:
+        raise DatabaseError(f"Error fetching due pubkeys from table ExpectedPubkeys") from e
+
+
+def postpone_expected_pubkeys(queue: str, entries: list[tuple[str, int, int]]) -> None:
+    """Updates the attempt counters and the next check timestamps of the given pubkeys.
+
+    Args:
+        queue (str): name of the queue
+        entries (list[tuple[str, int, int]]): list of (pubkey, attempts, next_check_ts)
+
+    Raises:
+        DatabaseError: Error postponing pubkeys on ExpectedPubkeys table
+    """
+
+    try:
+        with Database() as db:
+            db.executemany(
+                """
+                UPDATE ExpectedPubkeys
+                SET attempts = ?, next_check_ts = ?
+                WHERE queue = ? AND pubkey = ?
+                """,
+                [(attempts, ts, queue, pk) for pk, attempts, ts in entries],
+            )
+    except Exception as e:
+        raise DatabaseError(f"Error postponing pubkeys on table ExpectedPubkeys") from e
+
+
+def remove_expected_pubkeys(queue: str, pubkeys: list[str]) -> None:
+    """Removes the given pubkeys from the queue.
+
+    Args:
+        queue (str): name of the queue
+        pubkeys (list[str]): pubkeys that are not expected anymore
+
+    Raises:
+        DatabaseError: Error removing pubkeys from ExpectedPubkeys table
+    """
+
+    try:
+        with Database() as db:
+            db.executemany(
+                "DELETE FROM ExpectedPubkeys WHERE queue = ? AND pubkey = ?",
+                [(queue, pk) for pk in pubkeys],
+            )
+        get_logger().debug(f"Removed {len(pubkeys)} pubkeys from ExpectedPubkeys: {queue}")
+    except Exception as e:
+        raise DatabaseError(f"Error removing pubkeys from table ExpectedPubkeys") from e
+
+
+def count_expected_pubkeys(queue: str) -> int:
+    """Returns the number of pubkeys waiting in the queue.
+
+    Args:
+        queue (str): name of the queue
+
+    Returns:
+        int: number of pubkeys in the queue
+
+    Raises:
+        DatabaseError: Error counting pubkeys on ExpectedPubkeys table
+    """
+
+    try:
+        with Database() as db:
+            db.execute("SELECT COUNT(*) FROM ExpectedPubkeys WHERE queue = ?", (queue,))
+            return db.fetchone()[0]
+    except Exception as e:
+        raise DatabaseError(f"Error counting pubkeys on table ExpectedPubkeys") from e
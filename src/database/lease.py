@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+from src.classes import Database
+from src.exceptions import DatabaseError
+from src.globals import get_config, get_logger
+
+
+def __lease_db() -> Database:
+    """Returns the database that is shared by all instances, to keep the lease.
+
+    Returns:
+        Database: shared lease database
+    """
+    return Database(db_name="lease", path=os.path.join(os.getcwd(), get_config().ha.dir))
+
+
+def create_lease_table() -> None:
+    """Creates the sql database table for Lease, on the shared lease database.
+    There is only 1 row, keeping the current leader, its fencing token and deadline.
+
+    Raises:
+        DatabaseError: Error creating Lease table
+    """
+
+    try:
+        with __lease_db() as db:
+            db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS Lease (
+                    id INTEGER NOT NULL PRIMARY KEY CHECK (id = 0),
+                    holder TEXT,
+                    token INTEGER NOT NULL DEFAULT 0,
+                    expires REAL NOT NULL DEFAULT 0
+                )
+                """
+            )
+            db.execute("INSERT OR IGNORE INTO Lease (id) VALUES (0)")
+        get_logger().debug(f"Created a new table: Lease")
+    except Exception as e:
+        raise DatabaseError(f"Error creating Lease table") from e
+
+
+def claim_lease(holder: str, now: float, duration: float) -> int:
+    """Claims the lease for the given holder, renewing it if already held.
+    Takes over the lease if it is expired, increasing the fencing token.
+    Both cases are a single atomic update, so only one instance can succeed.
+
+    Args:
+        holder (str): unique name of the instance
+        now (float): current timestamp
+        duration (float): seconds that the claim will be valid for
+
+    Returns:
+        int: fencing token if the lease is held by the holder, None otherwise.
+
+    Raises:
+        DatabaseError: Error claiming the lease on Lease table
+    """
+
+    try:
+        with __lease_db() as db:
+            db.execute(
+                """
+                UPDATE Lease
+                SET token = CASE WHEN holder = ? THEN token ELSE token + 1 END,
+                    holder = ?,
+                    expires = ?
+                WHERE id = 0 AND (holder = ? OR holder IS NULL OR expires < ?)
+                """,
+                (holder, holder, now + duration, holder, now),
+            )
+            if db.rowcount == 0:
+                return None
+
+            db.execute("SELECT token FROM Lease WHERE id = 0")
+            return db.fetchone()[0]
+    except Exception as e:
+        raise DatabaseError(f"Error claiming the lease on table Lease") from e
+
+
+def release_lease(holder: str) -> None:
+    """Releases the lease if it is held by the given holder, so a standby can take over now.
+
+    Args:
+        holder (str): unique name of the instance
+
+    Raises:
+        DatabaseError: Error releasing the lease on Lease table
+    """
+
+    try:
+        with __lease_db() as db:
+            db.execute("UPDATE Lease SET expires = 0 WHERE id = 0 AND holder = ?", (holder,))
+    except Exception as e:
+        raise DatabaseError(f"Error releasing the lease on table Lease") from e
+
+
+def is_lease_held(holder: str, token: int, now: float) -> bool:
+    """Checks if the lease is still held by the given holder, with the given fencing token.
+
+    Args:
+        holder (str): unique name of the instance
+        token (int): fencing token of the leadership
+        now (float): current timestamp
+
+    Returns:
+        bool: True if the holder, the token and the deadline are still valid.
+
+    Raises:
+        DatabaseError: Error reading the lease from Lease table
+    """
+
+    try:
+        with __lease_db() as db:
+            db.execute("SELECT holder, token, expires FROM Lease WHERE id = 0")
+            row: tuple = db.fetchone()
+            return row is not None and row[0] == holder and row[1] == token and row[2] > now
+    except Exception as e:
+        raise DatabaseError(f"Error reading the lease from table Lease") from e
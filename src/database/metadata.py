@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+
+from typing import Any
+
+from src.classes import Database
+from src.exceptions import DatabaseError
+from src.globals import get_logger
+
+
+def create_metadata_table() -> None:
+    """Creates the sql database table for Metadata, on the shared database.
+    Every row is a field of a pool, an operator or a validator, that never changes once it is set.
+    Except the fields that are kept by geonius itself, see update_metadata.
+    Values keep their own types: integers, texts and bytes.
+
+    Raises:
+        DatabaseError: Error creating Metadata table
+    """
+
+    try:
+        with Database(Database.shared) as db:
+            db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS Metadata (
+                    id TEXT NOT NULL,
+                    field TEXT NOT NULL,
+                    value,
+                    PRIMARY KEY (id, field)
+                )
+                """
+            )
+        get_logger().debug(f"Created a new table: Metadata")
+    except Exception as e:
+        raise DatabaseError(f"Error creating Metadata table") from e
+
+
+def drop_metadata_table() -> None:
+    """Removes Metadata table from the database.
+
+    Raises:
+        DatabaseError: Error dropping Metadata table
+    """
+
+    try:
+        with Database(Database.shared) as db:
+            db.execute("""DROP TABLE IF EXISTS Metadata""")
+        get_logger().debug(f"Dropped Table: Metadata")
+    except Exception as e:
+        raise DatabaseError(f"Error dropping Metadata table") from e
+
+
+def reinitialize_metadata_table() -> None:
+    """Removes Metadata table and creates an empty one."""
+
+    drop_metadata_table()
+    create_metadata_table()
+
+
+def fetch_metadata(_id: Any) -> dict[str, Any]:
+    """Fetches the known fields of the given ID.
+
+    Args:
+        _id (Any): ID of the pool or operator, or the pubkey of the validator
+
+    Returns:
+        dict[str, Any]: values of the known fields
+
+    Raises:
+        DatabaseError: Error fetching metadata from table
+    """
+
+    try:
+        with Database(Database.shared) as db:
+            db.execute("SELECT field, value FROM Metadata WHERE id = ?", (str(_id),))
+            return dict(db.fetchall())
+    except Exception as e:
+        raise DatabaseError(f"Error fetching metadata of {_id} from table Metadata") from e
+
+
+def save_metadata(_id: Any, fields: dict[str, Any]) -> None:
+    """Saves the given fields of the given ID. Known fields are not changed.
+
+    Args:
+        _id (Any): ID of the pool or operator, or the pubkey of the validator
+        fields (dict[str, Any]): values of the fields
+
+    Raises:
+        DatabaseError: Error saving metadata to table
+    """
+
+    try:
+        with Database(Database.shared) as db:
+            db.executemany(
+                "INSERT OR IGNORE INTO Metadata VALUES (?,?,?)",
+                [(str(_id), field, value) for field, value in fields.items()],
+            )
+    except Exception as e:
+        raise DatabaseError(f"Error saving metadata of {_id} to table Metadata") from e
+
+
+def update_metadata(_id: Any, fields: dict[str, Any]) -> None:
+    """Saves the given fields of the given ID, replacing the known ones.
+    Only for the fields that are kept by geonius itself, such as the next validator index.
+
+    Args:
+        _id (Any): ID of the pool or operator, or the pubkey of the validator
+        fields (dict[str, Any]): values of the fields
+
+    Raises:
+        DatabaseError: Error updating metadata on table
+    """
+
+    try:
+        with Database(Database.shared) as db:
+            db.executemany(
+                "INSERT OR REPLACE INTO Metadata VALUES (?,?,?)",
+                [(str(_id), field, value) for field, value in fields.items()],
+            )
+    except Exception as e:
+        raise DatabaseError(f"Error updating metadata of {_id} on table Metadata") from e
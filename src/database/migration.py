@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+from src.classes import Database
+from src.exceptions import DatabaseError
+from src.globals import get_logger
+
+# tables that are kept for every operator, within their namespace
+OPERATOR_TABLES: list[str] = [
+    "Pools",
+    "Validators",
+    "ExpectedPubkeys",
+    "ExitDeadlines",
+    "Transactions",
+    "ProposalQueue",
+    "Reservoir",
+]
+
+
+def migrate_operator_tables() -> None:
+    """Moves the tables of the current operator from the shared database into its namespace.
+    Tables are kept in the shared database on single operator mode, and the events are never
+    fetched again after switching to multi-operator mode. So, the rows are copied into the
+    (already created) tables of the current namespace, and the shared tables are dropped.
+    Only the columns that exist on both tables are copied.
+
+    Does nothing if the current namespace is the shared database, or it is already migrated.
+
+    Raises:
+        DatabaseError: Error migrating the operator tables
+    """
+
+    try:
+        with Database() as db:
+            if db.db_name == Database.shared:
+                return
+
+            shared: str = os.path.join(db.path, Database.shared + Database.db_ext)
+            if not os.path.exists(shared):
+                return
+            db.execute("ATTACH DATABASE ? AS shared", (shared,))
+
+            for table in OPERATOR_TABLES:
+                db.execute(
+                    "SELECT name FROM shared.sqlite_master WHERE type = 'table' AND name = ?",
+                    (table,),
+                )
+                if not db.fetchone():
+                    continue
+
+                db.execute(f"PRAGMA main.table_info({table})")
+                columns: set[str] = {row[1] for row in db.fetchall()}
+                db.execute(f"PRAGMA shared.table_info({table})")
+                common: str = ", ".join(row[1] for row in db.fetchall() if row[1] in columns)
+
+                db.execute(
+                    f"INSERT OR IGNORE INTO main.{table} ({common}) "
+                    f"SELECT {common} FROM shared.{table}"
+                )
+                db.execute(f"DROP TABLE shared.{table}")
+                get_logger().info(f"Migrated {table} table into {db.db_name} database")
+
+            db.connection.commit()
+            db.execute("DETACH DATABASE shared")
+    except Exception as e:
+        raise DatabaseError("Error migrating the operator tables") from e
@@ -3,8 +3,9 @@
 from src.classes import Database
 from src.exceptions import DatabaseError
 from src.helpers.portal import get_fallback_operator
-from src.globals import get_config, get_logger
+from src.globals import get_logger, get_operator_id, get_operator_ids
 from src.utils.thread import multithread
+from src.utils.operator import operator_scope
 
 
 def create_pools_table() -> None:
@@ -53,30 +54,39 @@ def reinitialize_pools_table() -> None:
     create_pools_table()
 
 
-def fetch_pools_batch(ids: list[int]) -> list[dict]:
-    """Fetches the data for pools within the given ids list. Returns the gathered data.
+def fetch_pools_batch(ids: list[int]) -> list[int]:
+    """Fetches the fallback operators for pools within the given ids list.
 
     Args:
         ids (list[int]): pool IDs that will be fetched
 
     Returns:
-        list[dict]: list of dictionaries containing the pool info
-         in format of [{id: val, fallback: bool,...},...]
+        list[int]: list of fallback operator IDs, in the same order with the pool IDs
     """
     get_logger().debug(f"Fetching pools.")
 
-    fallback_operators: list[int] = multithread(get_fallback_operator, ids)
+    return multithread(get_fallback_operator, ids)
+
+
+def transpose_pools_batch(ids: list[int], fallback_operators: list[int]) -> list[dict]:
+    """Transposes the fetched pool info for the current operator.
+
+    Args:
+        ids (list[int]): pool IDs
+        fallback_operators (list[int]): fallback operator IDs of the pools
 
-    # transpose the info and insert all the pools
-    pools_transposed: list[dict] = [
+    Returns:
+        list[dict]: list of dictionaries containing the pool info
+         in format of [{id: val, fallback: bool,...},...]
+    """
+    return [
         {
             "id": str(id),
-            "fallback": 1 if fallback == get_config().operator_id else 0,
+            "fallback": 1 if fallback == get_operator_id() else 0,
             "last_proposal_ts": 0,
         }
         for (id, fallback) in zip(ids, fallback_operators)
     ]
-    return pools_transposed
 
 
 def insert_many_pools(new_pools: list[dict]) -> None:
@@ -110,12 +120,16 @@ def insert_many_pools(new_pools: list[dict]) -> None:
 
 def fill_pools_table(ids: list[int]) -> None:
     """Fills the pools table with the data of the given pool IDs.
+    Data is fetched once, then inserted into the database of every operator.
 
     Args:
         ids (list[int]): pool IDs that will be fetched and inserted into the database
     """
 
-    insert_many_pools(fetch_pools_batch(ids))
+    fallback_operators: list[int] = fetch_pools_batch(ids)
+    for operator_id in get_operator_ids():
+        with operator_scope(operator_id):
+            insert_many_pools(transpose_pools_batch(ids, fallback_operators))
 
 
 def save_fallback_operator(pool_id: int, value: bool) -> None:
@@ -200,3 +214,18 @@ def fetch_last_proposal_timestamp(pool_id: int) -> int:
         raise DatabaseError(f"Error fetching last proposal timestamp for pool {pool_id}") from e
 
     return last_proposal_ts
+
+
+def fetch_pool_ids() -> list[int]:
+    """Fetches the IDs of all pools on the Pools table.
+
+    Returns:
+        list[int]: pool IDs
+    """
+
+    try:
+        with Database() as db:
+            db.execute("SELECT id FROM Pools")
+            return [int(row[0]) for row in db.fetchall()]
+    except Exception as e:
+        raise DatabaseError(f"Error fetching pool ids from table Pools") from e
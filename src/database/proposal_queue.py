@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+
+from src.classes import Database
+from src.exceptions import DatabaseError
+from src.globals import get_logger
+
+# kinds of the work that is queued
+PROPOSE: str = "propose"
+STAKE: str = "stake"
+
+
+def create_proposal_queue_table() -> None:
+    """Creates the sql database table for ProposalQueue.
+    Every row is a pool waiting to be proposed for, or a pubkey waiting to be staked,
+    until there is enough work to fill a transaction, see strategy.min_proposal_queue.
+
+    Raises:
+        DatabaseError: Error creating ProposalQueue table
+    """
+
+    try:
+        with Database() as db:
+            db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS ProposalQueue (
+                    kind TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    queued INTEGER NOT NULL,
+                    PRIMARY KEY (kind, key)
+                )
+                """
+            )
+        get_logger().debug(f"Created a new table: ProposalQueue")
+    except Exception as e:
+        raise DatabaseError(f"Error creating ProposalQueue table") from e
+
+
+def drop_proposal_queue_table() -> None:
+    """Removes ProposalQueue table from the database.
+
+    Raises:
+        DatabaseError: Error dropping ProposalQueue table
+    """
+
+    try:
+        with Database() as db:
+            db.execute("""DROP TABLE IF EXISTS ProposalQueue""")
+        get_logger().debug(f"Dropped Table: ProposalQueue")
+    except Exception as e:
+        raise DatabaseError(f"Error dropping ProposalQueue table") from e
+
+
+def reinitialize_proposal_queue_table() -> None:
+    """Removes ProposalQueue table and creates an empty one."""
+
+    drop_proposal_queue_table()
+    create_proposal_queue_table()
+
+
+def enqueue(kind: str, keys: list[str], timestamp: int) -> None:
+    """Queues the given pools or pubkeys. Keys that are already queued keep their timestamp.
+
+    Args:
+        kind (str): propose or stake
+        keys (list[str]): pool ids or pubkeys
+        timestamp (int): time that the work became eligible
+
+    Raises:
+        DatabaseError: Error queueing into ProposalQueue table
+    """
+
+    try:
+        with Database() as db:
+            db.executemany(
+                "INSERT OR IGNORE INTO ProposalQueue VALUES (?,?,?)",
+                [(kind, str(key), int(timestamp)) for key in keys],
+            )
+    except Exception as e:
+        raise DatabaseError(f"Error queueing into table ProposalQueue") from e
+
+
+def fetch_queue(kind: str) -> list[tuple[str, int]]:
+    """Fetches the queued work of the given kind, oldest first.
+
+    Args:
+        kind (str): propose or stake
+
+    Returns:
+        list[tuple[str, int]]: list of (key, queued)
+
+    Raises:
+        DatabaseError: Error fetching the queue from ProposalQueue table
+    """
+
+    try:
+        with Database() as db:
+            db.execute(
+                "SELECT key, queued FROM ProposalQueue WHERE kind = ? ORDER BY queued",
+                (kind,),
+            )
+            return db.fetchall()
+    except Exception as e:
+        raise DatabaseError(f"Error fetching the queue from table ProposalQueue") from e
+
+
+def dequeue(kind: str, keys: list[str]) -> None:
+    """Removes the given pools or pubkeys from the queue, after they are handled.
+
+    Args:
+        kind (str): propose or stake
+        keys (list[str]): pool ids or pubkeys
+
+    Raises:
+        DatabaseError: Error removing from ProposalQueue table
+    """
+
+    try:
+        with Database() as db:
+            db.executemany(
+                "DELETE FROM ProposalQueue WHERE kind = ? AND key = ?",
+                [(kind, str(key)) for key in keys],
+            )
+    except Exception as e:
+        raise DatabaseError(f"Error removing from table ProposalQueue") from e
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+
+import json
+from typing import Optional
+
+from src.classes import Database
+from src.exceptions import DatabaseError
+from src.globals import get_logger
+from src.utils.crypto import encrypt, decrypt
+
+
+def create_reservoir_table() -> None:
+    """Creates the sql database table for Reservoir.
+    Every row is the deposit data of an upcoming validator index for a withdrawal address,
+    generated before it is needed. Deposit data is kept encrypted, see utils/crypto.py.
+
+    Raises:
+        DatabaseError: Error creating Reservoir table
+    """
+
+    try:
+        with Database() as db:
+            db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS Reservoir (
+                    withdrawal_address TEXT NOT NULL,
+                    idx INTEGER NOT NULL,
+                    data BLOB NOT NULL,
+                    created INTEGER NOT NULL,
+                    PRIMARY KEY (withdrawal_address, idx)
+                )
+                """
+            )
+        get_logger().debug(f"Created a new table: Reservoir")
+    except Exception as e:
+        raise DatabaseError(f"Error creating Reservoir table") from e
+
+
+def drop_reservoir_table() -> None:
+    """Removes Reservoir table from the database.
+
+    Raises:
+        DatabaseError: Error dropping Reservoir table
+    """
+
+    try:
+        with Database() as db:
+            db.execute("""DROP TABLE IF EXISTS Reservoir""")
+        get_logger().debug(f"Dropped Table: Reservoir")
+    except Exception as e:
+        raise DatabaseError(f"Error dropping Reservoir table") from e
+
+
+def reinitialize_reservoir_table() -> None:
+    """Removes Reservoir table and creates an empty one."""
+
+    drop_reservoir_table()
+    create_reservoir_table()
+
+
+def save_deposit_data(
+    withdrawal_address: str, index: int, proposal: dict, stake: dict, timestamp: int
+) -> None:
+    """Saves the deposit data of a validator index, for 1 ETH and 31 ETH deposits.
+
+    Args:
+        withdrawal_address (str): withdrawal address of the pool
+        index (int): index of the validator of the operator
+        proposal (dict): deposit data for the proposal
+        stake (dict): deposit data for the stake
+        timestamp (int): time that the deposit data is generated
+
+    Raises:
+        DatabaseError: Error saving deposit data into Reservoir table
+    """
+
+    try:
+        data: bytes = encrypt(json.dumps({"proposal": proposal, "stake": stake}).encode())
+        with Database() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO Reservoir VALUES (?,?,?,?)",
+                (withdrawal_address.lower(), int(index), data, int(timestamp)),
+            )
+    except Exception as e:
+        raise DatabaseError(f"Error saving deposit data into table Reservoir") from e
+
+
+def fetch_deposit_data(withdrawal_address: str, index: int) -> Optional[tuple[dict, dict]]:
+    """Fetches the deposit data of a validator index, if it is generated before.
+    Deposit data that can not be decrypted, such as after the passphrase is changed,
+    is removed so it is generated again.
+
+    Args:
+        withdrawal_address (str): withdrawal address of the pool
+        index (int): index of the validator of the operator
+
+    Returns:
+        Optional[tuple[dict, dict]]: deposit data for the proposal and the stake,\
+            None if it is not available.
+
+    Raises:
+        DatabaseError: Error fetching deposit data from Reservoir table
+    """
+
+    try:
+        with Database() as db:
+            db.execute(
+                "SELECT data FROM Reservoir WHERE withdrawal_address = ? AND idx = ?",
+                (withdrawal_address.lower(), int(index)),
+            )
+            row = db.fetchone()
+    except Exception as e:
+        raise DatabaseError(f"Error fetching deposit data from table Reservoir") from e
+
+    if row is None:
+        return None
+
+    try:
+        data: dict = json.loads(decrypt(row[0]))
+        return data["proposal"], data["stake"]
+    except ValueError:
+        get_logger().warning(f"Deposit data for index {index} can not be decrypted, removing.")
+        remove_deposit_data(withdrawal_address, index)
+        return None
+
+
+def fetch_reserved_indexes(withdrawal_address: str) -> set[int]:
+    """Fetches the validator indexes that have deposit data for the withdrawal address.
+
+    Args:
+        withdrawal_address (str): withdrawal address of the pool
+
+    Returns:
+        set[int]: validator indexes
+
+    Raises:
+        DatabaseError: Error fetching indexes from Reservoir table
+    """
+
+    try:
+        with Database() as db:
+            db.execute(
+                "SELECT idx FROM Reservoir WHERE withdrawal_address = ?",
+                (withdrawal_address.lower(),),
+            )
+            return {row[0] for row in db.fetchall()}
+    except Exception as e:
+        raise DatabaseError(f"Error fetching indexes from table Reservoir") from e
+
+
+def remove_deposit_data(withdrawal_address: str, index: int) -> None:
+    """Removes the deposit data of a validator index.
+
+    Args:
+        withdrawal_address (str): withdrawal address of the pool
+        index (int): index of the validator of the operator
+
+    Raises:
+        DatabaseError: Error removing deposit data from Reservoir table
+    """
+
+    try:
+        with Database() as db:
+            db.execute(
+                "DELETE FROM Reservoir WHERE withdrawal_address = ? AND idx = ?",
+                (withdrawal_address.lower(), int(index)),
+            )
+    except Exception as e:
+        raise DatabaseError(f"Error removing deposit data from table Reservoir") from e
+
+
+def prune_reservoir(index: int) -> None:
+    """Removes the deposit data of the validator indexes that are already used,
+    for every withdrawal address, since an account can only be proposed once.
+
+    Args:
+        index (int): number of the validators owned by the operator
+
+    Raises:
+        DatabaseError: Error pruning Reservoir table
+    """
+
+    try:
+        with Database() as db:
+            db.execute("DELETE FROM Reservoir WHERE idx < ?", (int(index),))
+    except Exception as e:
+        raise DatabaseError(f"Error pruning table Reservoir") from e
@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+
+from time import time
+
+from src.classes import Database
+from src.exceptions import DatabaseError
+from src.globals import get_logger
+
+# statuses of the transactions, only the pending ones are watched
+PENDING: str = "pending"
+MINED: str = "mined"
+REVERTED: str = "reverted"
+DROPPED: str = "dropped"
+
+
+def create_transactions_table() -> None:
+    """Creates the sql database table for Transactions.
+    Every row is a transaction that is submitted by this operator, with its lifecycle.
+    A transaction that is sped up is kept, with the hash of its replacement.
+
+    Raises:
+        DatabaseError: Error creating Transactions table
+    """
+
+    try:
+        with Database() as db:
+            db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS Transactions (
+                    tx_hash TEXT NOT NULL PRIMARY KEY,
+                    function TEXT NOT NULL,
+                    sender TEXT NOT NULL,
+                    nonce INTEGER,
+                    payload TEXT NOT NULL,
+                    pubkeys TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    submitted INTEGER NOT NULL,
+                    block INTEGER,
+                    replaced_by TEXT
+                )
+                """
+            )
+            db.execute(
+                """
+                CREATE INDEX IF NOT EXISTS TransactionsStatus
+                ON Transactions (status)
+                """
+            )
+        get_logger().debug(f"Created a new table: Transactions")
+    except Exception as e:
+        raise DatabaseError(f"Error creating Transactions table") from e
+
+
+def drop_transactions_table() -> None:
+    """Removes Transactions table from the database.
+
+    Raises:
+        DatabaseError: Error dropping Transactions table
+    """
+
+    try:
+        with Database() as db:
+            db.execute("""DROP TABLE IF EXISTS Transactions""")
+        get_logger().debug(f"Dropped Table: Transactions")
+    except Exception as e:
+        raise DatabaseError(f"Error dropping Transactions table") from e
+
+
+def reinitialize_transactions_table() -> None:
+    """Removes Transactions table and creates an empty one."""
+
+    drop_transactions_table()
+    create_transactions_table()
+
+
+def save_transaction(
+    tx_hash: str, function: str, sender: str, nonce: int, payload: str, pubkeys: list[str]
+) -> None:
+    """Saves a submitted transaction as pending.
+
+    Args:
+        tx_hash (str): hash of the transaction
+        function (str): name of the contract function, such as stake
+        sender (str): address that signed the transaction
+        nonce (int): nonce of the transaction, None if it is not known
+        payload (str): hash of the calldata
+        pubkeys (list[str]): public keys of the validators that the transaction is for
+
+    Raises:
+        DatabaseError: Error saving transaction into Transactions table
+    """
+
+    try:
+        with Database() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO Transactions VALUES (?,?,?,?,?,?,?,?,?,?)",
+                (
+                    tx_hash,
+                    function,
+                    sender,
+                    nonce,
+                    payload,
+                    ",".join(pubkeys),
+                    PENDING,
+                    int(time()),
+                    None,
+                    None,
+                ),
+            )
+        get_logger().debug(f"Saved the {function} transaction: {tx_hash}")
+    except Exception as e:
+        raise DatabaseError(f"Error saving transaction into table Transactions") from e
+
+
+def save_replacement(tx_hash: str, new_hash: str) -> None:
+    """Saves the replacement of a pending transaction, with the same nonce and the payload.
+    Both are kept as pending, since any of them can be mined.
+
+    Args:
+        tx_hash (str): hash of the replaced transaction
+        new_hash (str): hash of the new transaction
+
+    Raises:
+        DatabaseError: Error saving replacement into Transactions table
+    """
+
+    try:
+        with Database() as db:
+            db.execute(
+                """
+                INSERT OR REPLACE INTO Transactions
+                SELECT ?, function, sender, nonce, payload, pubkeys, ?, ?, NULL, NULL
+                FROM Transactions WHERE tx_hash = ?
+                """,
+                (new_hash, PENDING, int(time()), tx_hash),
+            )
+            db.execute(
+                "UPDATE Transactions SET replaced_by = ? WHERE tx_hash = ?",
+                (new_hash, tx_hash),
+            )
+    except Exception as e:
+        raise DatabaseError(f"Error saving replacement into table Transactions") from e
+
+
+def save_transaction_status(tx_hash: str, status: str, block: int = None) -> None:
+    """Saves the status of a transaction, and the block it is mined on.
+
+    Args:
+        tx_hash (str): hash of the transaction
+        status (str): mined, reverted or dropped
+        block (int, optional): block number of the receipt. Defaults to None.
+
+    Raises:
+        DatabaseError: Error saving status into Transactions table
+    """
+
+    try:
+        with Database() as db:
+            db.execute(
+                "UPDATE Transactions SET status = ?, block = ? WHERE tx_hash = ?",
+                (status, block, tx_hash),
+            )
+    except Exception as e:
+        raise DatabaseError(f"Error saving status into table Transactions") from e
+
+
+def fetch_pending_transactions() -> list[tuple[str, str, str, int, int, str]]:
+    """Fetches the transactions that are not mined or dropped yet.
+
+    Returns:
+        list[tuple[str, str, str, int, int, str]]: list of \
+            (tx_hash, function, sender, nonce, submitted, replaced_by)
+
+    Raises:
+        DatabaseError: Error fetching pending transactions from Transactions table
+    """
+
+    try:
+        with Database() as db:
+            db.execute(
+                """
+                SELECT tx_hash, function, sender, nonce, submitted, replaced_by
+                FROM Transactions WHERE status = ?
+                ORDER BY nonce
+                """,
+                (PENDING,),
+            )
+            return db.fetchall()
+    except Exception as e:
+        raise DatabaseError(f"Error fetching pending transactions from table Transactions") from e
+
+
+def fetch_pending_pubkeys(function: str) -> set[str]:
+    """Fetches the public keys that have a pending transaction for the given function.
+    They should not be sent again, until the transaction is mined or dropped.
+
+    Args:
+        function (str): name of the contract function, such as stake
+
+    Returns:
+        set[str]: public keys of the validators
+
+    Raises:
+        DatabaseError: Error fetching pending pubkeys from Transactions table
+    """
+
+    try:
+        with Database() as db:
+            db.execute(
+                "SELECT pubkeys FROM Transactions WHERE status = ? AND function = ?",
+                (PENDING, function),
+            )
+            return {pk for (pubkeys,) in db.fetchall() for pk in pubkeys.split(",") if pk}
+    except Exception as e:
+        raise DatabaseError(f"Error fetching pending pubkeys from table Transactions") from e
+
+
+def count_pending_transactions(function: str) -> int:
+    """Counts the pending transactions for the given function.
+
+    Args:
+        function (str): name of the contract function, such as proposeStake
+
+    Returns:
+        int: number of pending transactions
+
+    Raises:
+        DatabaseError: Error counting pending transactions in Transactions table
+    """
+
+    try:
+        with Database() as db:
+            db.execute(
+                "SELECT COUNT(*) FROM Transactions WHERE status = ? AND function = ?",
+                (PENDING, function),
+            )
+            return db.fetchone()[0]
+    except Exception as e:
+        raise DatabaseError(f"Error counting pending transactions in table Transactions") from e
@@ -5,9 +5,10 @@ from geodefi.classes import Validator
 
 from src.classes import Database
 from src.exceptions import DatabaseError, DatabaseMismatchError
-from src.globals import get_logger, get_sdk
-from src.helpers.portal import get_StakeParams
+from src.globals import get_logger, get_sdk, get_operator_ids
+from src.helpers.portal import get_StakeParams, get_validator_constants
 from src.utils.thread import multithread
+from src.utils.operator import operator_scope
 
 
 def create_validators_table() -> None:
@@ -72,16 +73,17 @@ def fetch_validator(pubkey: str) -> dict:
     """
 
     val: Validator = get_sdk().portal.validator(pubkey)
+    constants: dict = get_validator_constants(pubkey, val)
 
     return {
-        "portal_index": val.portal_index,  # constant
-        "beacon_index": val.beacon_index,  # constant
-        "pubkey": val.pubkey,  # constant
-        "pool_id": val.poolId,  # constant
-        "local_state": val.portal_state,
-        "portal_state": val.portal_state,
-        "signature31": val.signature31,  # constant
-        "withdrawal_credentials": val.withdrawal_credentials,  # constant
+        "portal_index": constants["portal_index"],
+        "beacon_index": constants.get("beacon_index"),
+        "pubkey": pubkey,
+        "pool_id": str(constants["pool_id"]),
+        "local_state": val.state,
+        "portal_state": val.state,
+        "signature31": constants["signature31"],
+        "withdrawal_credentials": constants.get("withdrawal_credentials"),
         "exit_epoch": val.exit_epoch,  # can be set after proposal tx is mined
     }
 
@@ -101,6 +103,7 @@ def fetch_validators_batch(pks: list[str]) -> list[dict]:
 
 def insert_many_validators(new_validators: list[dict]) -> None:
     """Inserts the given validators data into the database.
+    Already known validators are replaced with the latest data.
 
     Args:
         new_validators (list[dict]): list of dictionaries containing the validator info
@@ -112,7 +115,7 @@ def insert_many_validators(new_validators: list[dict]) -> None:
     try:
         with Database() as db:
             db.executemany(
-                "INSERT INTO Validators VALUES (?,?,?,?,?,?,?,?,?)",
+                "INSERT OR REPLACE INTO Validators VALUES (?,?,?,?,?,?,?,?,?)",
                 [
                     (
                         a["portal_index"],
@@ -157,7 +160,7 @@ def save_local_state(pubkey: str, local_state: VALIDATOR_STATE) -> None:
             db.execute(
                 """
                 UPDATE Validators 
-                SET local_storage = ?
+                SET local_state = ?
                 WHERE pubkey = ?
                 """,
                 (int(local_state), pubkey),
@@ -228,6 +231,77 @@ def save_exit_epoch(pubkey: str, exit_epoch: str) -> None:
         ) from e
 
 
+def save_local_states(pubkeys: list[str], local_state: VALIDATOR_STATE) -> None:
+    """Sets local_state of the given validators on db, at once.
+
+    Args:
+        pubkeys (list[str]): public keys of the validators
+        local_state (VALIDATOR_STATE): new local state of the validators
+
+    Raises:
+        DatabaseError: Error updating local states of validators
+    """
+
+    try:
+        with Database() as db:
+            db.executemany(
+                "UPDATE Validators SET local_state = ? WHERE pubkey = ?",
+                [(int(local_state), pubkey) for pubkey in pubkeys],
+            )
+        get_logger().debug(f"Updated local_state of {len(pubkeys)} validators to: {local_state}")
+    except Exception as e:
+        raise DatabaseError(
+            f"Error updating local state of {len(pubkeys)} validators to table Validators"
+        ) from e
+
+
+def save_portal_states(pubkeys: list[str], portal_state: VALIDATOR_STATE) -> None:
+    """Sets portal_state of the given validators on db, at once.
+
+    Args:
+        pubkeys (list[str]): public keys of the validators
+        portal_state (VALIDATOR_STATE): new portal state of the validators
+
+    Raises:
+        DatabaseError: Error updating portal states of validators
+    """
+
+    try:
+        with Database() as db:
+            db.executemany(
+                "UPDATE Validators SET portal_state = ? WHERE pubkey = ?",
+                [(int(portal_state), pubkey) for pubkey in pubkeys],
+            )
+        get_logger().debug(f"Updated portal_state of {len(pubkeys)} validators to: {portal_state}")
+    except Exception as e:
+        raise DatabaseError(
+            f"Error updating portal state of {len(pubkeys)} validators to table Validators"
+        ) from e
+
+
+def save_exit_epochs(exit_epochs: list[tuple[str, int]]) -> None:
+    """Sets exit_epoch of the given validators on db, at once.
+
+    Args:
+        exit_epochs (list[tuple[str, int]]): list of (pubkey, exit_epoch)
+
+    Raises:
+        DatabaseError: Error updating exit epochs of validators
+    """
+
+    try:
+        with Database() as db:
+            db.executemany(
+                "UPDATE Validators SET exit_epoch = ? WHERE pubkey = ?",
+                [(int(exit_epoch), pubkey) for pubkey, exit_epoch in exit_epochs],
+            )
+        get_logger().debug(f"Updated the exit epochs of {len(exit_epochs)} validators")
+    except Exception as e:
+        raise DatabaseError(
+            f"Error updating exit epoch of {len(exit_epochs)} validators to table Validators"
+        ) from e
+
+
 def fetch_verified_pks() -> list[str]:
     """Fetches the data of the validators that are in the proposed state.
 
@@ -250,7 +324,7 @@ def fetch_verified_pks() -> list[str]:
                 """,
                 (int(VALIDATOR_STATE.PROPOSED), verification_index),
             )
-            approved_pks: list[str] = db.fetchall()
+            approved_pks: list[str] = [pk for (pk,) in db.fetchall()]
             get_logger().info(f"{len(approved_pks)} new verified public keys are detected.")
             get_logger().debug(",".join(map(str, approved_pks)))
 
@@ -279,6 +353,22 @@ def check_pk_in_db(pubkey: str) -> bool:
         raise DatabaseError(f"Error checking if pubkey {pubkey} is in table Validators") from e
 
 
+def find_operator_of(pubkey: str) -> int:
+    """Finds the operator that owns the given public key, within the operators' databases.
+
+    Args:
+        pubkey (str): public key of the validator
+
+    Returns:
+        int: ID of the operator, None if the public key is not in any of the databases
+    """
+    for operator_id in get_operator_ids():
+        with operator_scope(operator_id):
+            if check_pk_in_db(pubkey):
+                return operator_id
+    return None
+
+
 def fetch_pool_id(pubkey: str) -> str:
     """Fetches the pool_id of the validator with the given pubkey.
 
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 
 from .actions import EthdoError, CallFailedError
-from .classes import DaemonError, DatabaseError, DatabaseMismatchError
+from .classes import DaemonError, DatabaseError, DatabaseMismatchError, StandbyError
 from .daemons import EventFetchingError
 from .globals import (
     SDKError,
@@ -2,3 +2,4 @@
 
 from .daemon import DaemonError
 from .database import DatabaseError, DatabaseMismatchError
+from .lease import StandbyError
@@ -0,0 +1,5 @@
+# -*- coding: utf-8 -*-
+
+
+class StandbyError(Exception):
+    """Exception raised when a transaction is attempted without holding the lease."""
@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 # pylint: disable=global-statement
 
+from threading import local
+
 
 # global CONFIG referance that requires initialization
 __CONFIG = None
@@ -14,6 +16,36 @@ __CONSTANTS = None
 
 __LOGGER = None
 
+# global referance for the shared budget of concurrent calls, which also requires initialization
+__GATE = None
+
+# global referance for the leadership of this instance, which also requires initialization
+__LEASE = None
+
+# global referance for the cache of contract calls on the current block, requires initialization
+__BLOCK_CACHE = None
+
+# global referance for the slots and epochs of the beacon chain, requires initialization
+__CLOCK = None
+
+# global referance for the head of the beacon chain that is streamed, requires initialization
+__HEAD_TRACKER = None
+
+# global referance for the nonces of the transactions that are submitted, requires initialization
+__NONCE_MANAGER = None
+
+# global referance for the subprocesses of ethdo, which also requires initialization
+__ETHDO_POOL = None
+
+# global referance for the signer of the deposit data, ethdo is called if it is not initialized
+__SIGNER = None
+
+# global referance for the capacity of the pools, they are read from the chain if not initialized
+__CAPACITY = None
+
+# thread local referance for the operator that is being served, on multi-operator mode
+__OPERATOR = local()
+
 
 def set_config(value):
     global __CONFIG
@@ -49,3 +81,97 @@ def set_logger(value):
 
 def get_logger():
     return __LOGGER
+
+
+def set_gate(value):
+    global __GATE
+    __GATE = value
+
+
+def get_gate():
+    return __GATE
+
+
+def set_lease(value):
+    global __LEASE
+    __LEASE = value
+
+
+def get_lease():
+    return __LEASE
+
+
+def set_block_cache(value):
+    global __BLOCK_CACHE
+    __BLOCK_CACHE = value
+
+
+def get_block_cache():
+    return __BLOCK_CACHE
+
+
+def set_clock(value):
+    global __CLOCK
+    __CLOCK = value
+
+
+def get_clock():
+    return __CLOCK
+
+
+def set_head_tracker(value):
+    global __HEAD_TRACKER
+    __HEAD_TRACKER = value
+
+
+def get_head_tracker():
+    return __HEAD_TRACKER
+
+
+def set_nonce_manager(value):
+    global __NONCE_MANAGER
+    __NONCE_MANAGER = value
+
+
+def get_nonce_manager():
+    return __NONCE_MANAGER
+
+
+def set_ethdo_pool(value):
+    global __ETHDO_POOL
+    __ETHDO_POOL = value
+
+
+def get_ethdo_pool():
+    return __ETHDO_POOL
+
+
+def set_signer(value):
+    global __SIGNER
+    __SIGNER = value
+
+
+def get_signer():
+    return __SIGNER
+
+
+def set_capacity(value):
+    global __CAPACITY
+    __CAPACITY = value
+
+
+def get_capacity():
+    return __CAPACITY
+
+
+def set_operator_id(value):
+    __OPERATOR.id = value
+
+
+def get_operator_id():
+    operator_id = getattr(__OPERATOR, "id", None)
+    return operator_id if operator_id is not None else __CONFIG.operator_id
+
+
+def get_operator_ids():
+    return __CONFIG.operator_ids
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 
+from typing import Union
 import os
 from os import getenv
 import json
@@ -8,6 +9,29 @@ from src.common import AttributeDict
 from src.exceptions import ConfigurationFileError, MissingConfigurationError
 
 
+def __replace_api_key(apis: Union[str, list[str]], key: str) -> Union[str, list[str]]:
+    """Puts the api key in the given api urls, from the environment variables.
+
+    Args:
+        apis (Union[str, list[str]]): api url, or a list of api urls for a pool of endpoints.
+        key (str): name of the environment variable, placeholder is `<key>`.
+
+    Returns:
+        Union[str, list[str]]: api url(s) with the api key
+
+    Raises:
+        MissingConfigurationError: if the environment variable is not provided.
+    """
+    if isinstance(apis, list):
+        return [__replace_api_key(api, key) for api in apis]
+
+    if f"<{key}>" in apis:
+        if getenv(key):
+            return apis.replace(f"<{key}>", getenv(key))
+        raise MissingConfigurationError(f"{key} environment var should be provided.")
+    return apis
+
+
 def apply_flags(
     config: AttributeDict,
     flags: AttributeDict,
@@ -26,6 +50,12 @@ def apply_flags(
 
     if "operator_id" in flags:
         config.operator_id = flags.operator_id
+        config.operator_ids = [flags.operator_id]
+    elif "operator_ids" in config and config.operator_ids:
+        # multi-operator mode, first operator is the default one
+        config.operator_id = config.operator_ids[0]
+    else:
+        config.operator_ids = [config.operator_id]
 
     if "chain_start" in flags:
         config.chains[config.chain_name].start = flags.chain_start
@@ -37,10 +67,10 @@ def apply_flags(
         config.chains[config.chain_name].interval = int(flags.chain_interval)
     if "chain_range" in flags:
         config.chains[config.chain_name].range = int(flags.chain_range)
-    if "execution_api" in flags:
-        config.chains[config.chain_name].execution_api = int(flags.execution_api)
-    if "consensus_api" in flags:
-        config.chains[config.chain_name].consensus_api = int(flags.consensus_api)
+    if "chain_execution_api" in flags:
+        config.chains[config.chain_name].execution_api = flags.chain_execution_api
+    if "chain_consensus_api" in flags:
+        config.chains[config.chain_name].consensus_api = flags.chain_consensus_api
 
     if "network_refresh_rate" in flags:
         config.network.refresh_rate = flags.network_refresh_rate
@@ -48,11 +78,19 @@ def apply_flags(
         config.network.max_attempt = flags.network_max_attempt
     if "network_attempt_rate" in flags:
         config.network.attempt_rate = flags.network_attempt_rate
+    if "network_rpc_budget" in flags:
+        config.network.rpc_budget = flags.network_rpc_budget
 
     if "min_proposal_queue" in flags:
         config.strategy.min_proposal_queue = flags.min_proposal_queue
     if "max_proposal_delay" in flags:
         config.strategy.max_proposal_delay = flags.max_proposal_delay
+    if "gas_ceiling" in flags:
+        config.strategy.gas_ceiling = flags.gas_ceiling
+    if "reservoir_depth" in flags:
+        config.strategy.reservoir_depth = flags.reservoir_depth
+    if "capacity_interval" in flags:
+        config.strategy.capacity_interval = flags.capacity_interval
 
     if "no_log_stream" in flags:
         config.logger.no_stream = flags.no_log_stream
@@ -76,6 +114,14 @@ def apply_flags(
         config.ethdo.wallet = flags.ethdo_wallet
     if "ethdo_account_prefix" in flags:
         config.ethdo.account_prefix = flags.ethdo_account_prefix
+    if "ethdo_processes" in flags:
+        config.ethdo.processes = flags.ethdo_processes
+    if "ethdo_timeout" in flags:
+        config.ethdo.timeout = flags.ethdo_timeout
+    if "ethdo_signer" in flags:
+        config.ethdo.signer = flags.ethdo_signer
+    if "ethdo_base_dir" in flags:
+        config.ethdo.base_dir = flags.ethdo_base_dir
 
     if "dont_notify_devs" in flags:
         # Gas and Email sections can not be provided as flags, as they are optional.
@@ -92,26 +138,12 @@ def apply_flags(
 
     # Apply environment variables if desired
 
-    if "<API_KEY_EXECUTION>" in config.chains[flags.chain].execution_api:
-        # put the execution api key in configuration from environment variables
-        if getenv("API_KEY_EXECUTION"):
-            config.chains[config.chain_name].execution_api = config.chains[
-                config.chain_name
-            ].execution_api.replace("<API_KEY_EXECUTION>", getenv("API_KEY_EXECUTION"))
-        else:
-            raise MissingConfigurationError("API_KEY_EXECUTION environment var should be provided.")
-
-    if "<API_KEY_CONSENSUS>" in config.chains[config.chain_name].consensus_api:
-        # put the consensus api key in configuration from environment variables
-        if getenv("API_KEY_CONSENSUS"):
-            config.chains[config.chain_name].consensus_api = config.chains[
-                config.chain_name
-            ].consensus_api.replace("<API_KEY_CONSENSUS>", getenv("API_KEY_CONSENSUS"))
-        else:
-            raise MissingConfigurationError("API_KEY_CONSENSUS environment var should be provided.")
+    chain: AttributeDict = config.chains[config.chain_name]
+    chain.execution_api = __replace_api_key(chain.execution_api, "API_KEY_EXECUTION")
+    chain.consensus_api = __replace_api_key(chain.consensus_api, "API_KEY_CONSENSUS")
 
     # put the gas api key in configuration from environment variables
-    if "gas" in config:
+    if "gas" in config and "api" in config.gas:
         if "<API_KEY_GAS>" in config.gas.api:
             if getenv("API_KEY_GAS"):
                 config.gas.api = config.gas.api.replace("<API_KEY_GAS>", getenv("API_KEY_GAS"))
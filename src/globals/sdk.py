@@ -1,40 +1,98 @@
 # -*- coding: utf-8 -*-
 
+from typing import Union
 from web3.middleware import construct_sign_and_send_raw_middleware
 from geodefi import Geode
 
+from src.classes import EndpointPool, PooledBeacon, PooledHTTPProvider
 from src.exceptions import MissingPrivateKeyError, SDKError
 
 
-def __set_web3_account(sdk: Geode, private_key: str) -> Geode:
-    """Sets the web3 account to the private key provided in the environment variables.
+def parse_private_keys(priv_keys: str) -> list[str]:
+    """Parses the comma seperated private keys provided in the environment variables.
+
+    Args:
+        priv_keys (str): One private key, or comma seperated private keys for multiple operators.
+
+    Returns:
+        list[str]: list of private keys
+    """
+    return [key.strip() for key in priv_keys.split(",") if key.strip()] if priv_keys else []
+
+
+def parse_endpoints(apis: Union[str, list[str]]) -> list[str]:
+    """Parses the api endpoints provided in the configuration.
+
+    Args:
+        apis (Union[str, list[str]]): One url, comma seperated urls or a list of urls.
+
+    Returns:
+        list[str]: list of urls
+    """
+    if isinstance(apis, str):
+        apis = apis.split(",")
+    return [api.strip() for api in apis if api.strip()]
+
+
+def __set_endpoint_pools(sdk: Geode, exec_apis: list[str], cons_apis: list[str]) -> Geode:
+    """Replaces the execution provider and the beacon with pooled ones, when there are
+    multiple endpoints. Requests go to the healthiest endpoint and fail over to others.
+
+    Args:
+        sdk: Initialized Geode SDK instance.
+        exec_apis (list[str]): Execution API URLs.
+        cons_apis (list[str]): Consensus API URLs.
+
+    Returns:
+        Geode: Initialized Geode SDK instance.
+    """
+    # websocket providers are kept as they are
+    if len(exec_apis) > 1 and all(api.startswith("http") for api in exec_apis):
+        sdk.w3.provider = PooledHTTPProvider(EndpointPool(exec_apis))
+
+    if len(cons_apis) > 1:
+        beacon: PooledBeacon = PooledBeacon(EndpointPool(cons_apis), sdk.network)
+        sdk.beacon = beacon
+        sdk.portal.beacon = beacon
+
+    return sdk
+
+
+def __set_web3_accounts(sdk: Geode, private_keys: list[str]) -> Geode:
+    """Sets the web3 accounts to the private keys provided in the environment variables.
+    The first one is used as the default account.
 
     Args:
         sdk: Initialized Geode SDK instance.
+        private_keys (list[str]): private keys of the maintainers.
 
     Returns:
         Geode: Initialized Geode SDK instance.
     """
-    # Create account on Geode's web3py instance
-    signer = sdk.w3.eth.account.from_key(private_key)
+    # Create accounts on Geode's web3py instance
+    signers: list = [sdk.w3.eth.account.from_key(key) for key in private_keys]
 
-    # Allow Geodefi to use your private key on transact
-    sdk.w3.middleware_onion.add(construct_sign_and_send_raw_middleware(signer))
+    # Allow Geodefi to use your private keys on transact, chosen by the "from" field
+    sdk.w3.middleware_onion.add(construct_sign_and_send_raw_middleware(signers))
 
     # Set default account if one address is used generally
-    sdk.w3.eth.default_account = signer.address
+    sdk.w3.eth.default_account = signers[0].address
 
     return sdk
 
 
-def init_sdk(exec_api: str, cons_api: str, priv_key: str = None) -> Geode:
+def init_sdk(
+    exec_api: Union[str, list[str]], cons_api: Union[str, list[str]], priv_key: str = None
+) -> Geode:
     """Initializes the SDK with the provided APIs and private key.
      If private key is provided, sets the web3 account.
+     Multiple private keys can be provided comma seperated, for multiple operators.
+     Multiple APIs can be provided as a list, or comma seperated, to be used as a pool.
 
     Args:
-        exec_api (str): Execution API URL.
-        cons_api (str): Consensus API URL.
-        priv_key (str, optional): Private key to be used. Default is None.
+        exec_api (Union[str, list[str]]): Execution API URL(s).
+        cons_api (Union[str, list[str]]): Consensus API URL(s).
+        priv_key (str, optional): Private key(s) to be used. Default is None.
 
     Returns:
         Geode: Initialized Geode SDK instance.
@@ -43,12 +101,16 @@ def init_sdk(exec_api: str, cons_api: str, priv_key: str = None) -> Geode:
         SDKException: If an error occurs while initializing the SDK.
     """
     try:
-        sdk: Geode = Geode(exec_api=exec_api, cons_api=cons_api)
-        if not priv_key:
+        exec_apis: list[str] = parse_endpoints(exec_api)
+        cons_apis: list[str] = parse_endpoints(cons_api)
+        sdk: Geode = Geode(exec_api=exec_apis[0], cons_api=cons_apis[0])
+        sdk = __set_endpoint_pools(sdk, exec_apis, cons_apis)
+        priv_keys: list[str] = parse_private_keys(priv_key)
+        if not priv_keys:
             raise MissingPrivateKeyError(
                 "Problem occured while connecting to SDK, private key is missing in .env file."
             )
-        sdk = __set_web3_account(sdk, priv_key)
+        sdk = __set_web3_accounts(sdk, priv_keys)
         return sdk
 
     except Exception as e:
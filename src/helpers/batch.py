@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+from typing import Callable
+from web3.contract.contract import ContractFunction
+
+from src.globals import get_config, get_logger
+from src.utils.gas import get_sender
+
+# Portal does not accept more validators in a single call
+MAX_DEPOSITS_PER_CALL: int = 50
+
+# gas that a single transaction can use, if not configured with strategy.gas_ceiling
+DEFAULT_GAS_CEILING: int = 10_000_000
+
+# gas costs of the functions: (gas of the call, gas per pubkey)
+__GAS_COSTS: dict[str, tuple[int, int]] = {}
+
+
+def estimate_gas_costs(function: str, build: Callable[[int], ContractFunction]) -> tuple[int, int]:
+    """Estimates the gas cost of a call and of every pubkey of the given function, by estimating
+    the gas for a sample of 1 and 2 pubkeys. Costs are cached for the function.
+
+    Args:
+        function (str): name of the function, such as stake
+        build (Callable[[int], ContractFunction]): returns the call with the given number of pubkeys
+
+    Returns:
+        tuple[int, int]: gas of the call, and gas per pubkey
+    """
+    if function not in __GAS_COSTS:
+        one: int = build(1).estimate_gas({"from": get_sender()})
+        two: int = build(2).estimate_gas({"from": get_sender()})
+        per_key: int = max(1, two - one)
+        __GAS_COSTS[function] = (max(0, one - per_key), per_key)
+        get_logger().debug(
+            "Gas costs of %s: %s per call, %s per pubkey", function, *__GAS_COSTS[function]
+        )
+    return __GAS_COSTS[function]
+
+
+def get_batch_size(function: str, build: Callable[[int], ContractFunction], count: int) -> int:
+    """Returns the number of pubkeys that should be sent within a single transaction,
+    as many as possible without exceeding the gas ceiling.
+    Uses the maximum number of pubkeys if the gas can not be estimated.
+
+    Args:
+        function (str): name of the function, such as stake
+        build (Callable[[int], ContractFunction]): returns the call with the given number of pubkeys
+        count (int): number of pubkeys waiting to be sent, 2 of them are used as a sample
+
+    Returns:
+        int: number of pubkeys for every transaction
+    """
+    if count <= 1:
+        return 1
+
+    try:
+        base, per_key = estimate_gas_costs(function, build)
+    except Exception as e:
+        get_logger().debug("Could not estimate the gas costs of %s: %s", function, e)
+        return min(count, MAX_DEPOSITS_PER_CALL)
+
+    ceiling: int = get_config().strategy.get("gas_ceiling", DEFAULT_GAS_CEILING)
+    return max(1, min(count, MAX_DEPOSITS_PER_CALL, (ceiling - base) // per_key))
@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+
+from typing import Any, Callable
+import requests
+
+from src.classes import BeaconClock, BeaconEventStream, HeadTracker, PooledBeacon
+from src.common import AttributeDict
+from src.globals import get_sdk, get_logger, get_clock
+
+# number of validators queried with a POST request, beacon nodes accept at least 1000.
+POST_BATCH: int = 500
+
+# number of validators queried with a GET request, urls are limited to ~8KB.
+GET_BATCH: int = 50
+
+# beacon nodes that do not support POST respond with one of these
+POST_UNSUPPORTED: tuple[int] = (404, 405, 415)
+
+
+def beacon_request(func: Callable[[str], Any]) -> Any:
+    """Calls the given function with the api base of the beacon node.
+    Fails over to the other endpoints if there are multiple.
+
+    Args:
+        func (Callable[[str], Any]): function that sends a request to the given api base.
+
+    Returns:
+        Any: result of the function
+    """
+    beacon: Any = get_sdk().beacon
+    if isinstance(beacon, PooledBeacon):
+        return beacon.failover(func)
+    return func(beacon.api_base)
+
+
+def __post_validators(api_base: str, state_id: str, ids: list[str]) -> list[dict]:
+    """Queries the given validators with a POST request.
+
+    Args:
+        api_base (str): url of the beacon node
+        state_id (str): state to query, such as head or finalized
+        ids (list[str]): pubkeys or indexes of the validators
+
+    Returns:
+        list[dict]: validators that are known by the beacon node
+    """
+    res: requests.Response = requests.post(
+        f"{api_base}/eth/v1/beacon/states/{state_id}/validators", json={"ids": ids}, timeout=10
+    )
+    res.raise_for_status()
+    return res.json()["data"]
+
+
+def __get_validators(api_base: str, state_id: str, ids: list[str]) -> list[dict]:
+    """Queries the given validators with GET requests, for the nodes that do not support POST.
+
+    Args:
+        api_base (str): url of the beacon node
+        state_id (str): state to query, such as head or finalized
+        ids (list[str]): pubkeys or indexes of the validators
+
+    Returns:
+        list[dict]: validators that are known by the beacon node
+    """
+    data: list[dict] = []
+    for i in range(0, len(ids), GET_BATCH):
+        res: requests.Response = requests.get(
+            f"{api_base}/eth/v1/beacon/states/{state_id}/validators",
+            params={"id": ",".join(ids[i : i + GET_BATCH])},
+            timeout=10,
+        )
+        res.raise_for_status()
+        data.extend(res.json()["data"])
+    return data
+
+
+def __query_validators(api_base: str, state_id: str, ids: list[str]) -> list[dict]:
+    """Queries the given validators with a POST request, or with GET requests if not supported.
+
+    Args:
+        api_base (str): url of the beacon node
+        state_id (str): state to query, such as head or finalized
+        ids (list[str]): pubkeys or indexes of the validators
+
+    Returns:
+        list[dict]: validators that are known by the beacon node
+    """
+    try:
+        return __post_validators(api_base, state_id, ids)
+    except requests.HTTPError as e:
+        if e.response is None or e.response.status_code not in POST_UNSUPPORTED:
+            raise
+    get_logger().debug("Beacon node does not support POST for validators, using GET.")
+    return __get_validators(api_base, state_id, ids)
+
+
+def get_validators(pubkeys: list[str], state_id: str = "head") -> dict[str, AttributeDict]:
+    """Returns the beacon chain status, balance and index of the given validators,
+    querying hundreds of them on every request.
+    Validators that are not visible on the beacon chain are not included.
+
+    Args:
+        pubkeys (list[str]): public keys of the validators
+        state_id (str, optional): state to query. Defaults to "head".
+
+    Returns:
+        dict[str, AttributeDict]: status (str), balance (int), index (int), exit_epoch (int)\
+            and withdrawable_epoch (int) of the validators, by their lowercase pubkeys.
+    """
+    validators: dict[str, AttributeDict] = {}
+    for i in range(0, len(pubkeys), POST_BATCH):
+        ids: list[str] = pubkeys[i : i + POST_BATCH]
+        data: list[dict] = beacon_request(
+            lambda api_base, ids=ids: __query_validators(api_base, state_id, ids)
+        )
+        for val in data:
+            validators[val["validator"]["pubkey"].lower()] = AttributeDict(
+                {
+                    "status": val["status"],
+                    "balance": int(val["balance"]),
+                    "index": int(val["index"]),
+                    "exit_epoch": int(val["validator"]["exit_epoch"]),
+                    "withdrawable_epoch": int(val["validator"]["withdrawable_epoch"]),
+                }
+            )
+
+    get_logger().debug("%s of %s validators are visible on beacon.", len(validators), len(pubkeys))
+    return validators
+
+
+def init_beacon_clock() -> BeaconClock:
+    """Reads the genesis time and the spec from the beacon node, once, to calculate
+    the slots and the epochs locally. Also records the current head.
+
+    Returns:
+        BeaconClock: clock of the beacon chain
+    """
+    genesis: dict[str, Any] = get_sdk().beacon.beacon_genesis()
+    spec: dict[str, Any] = get_sdk().beacon.config_spec()
+
+    clock: BeaconClock = BeaconClock(
+        genesis_time=int(genesis["genesis_time"]),
+        seconds_per_slot=int(spec["SECONDS_PER_SLOT"]),
+        slots_per_epoch=int(spec["SLOTS_PER_EPOCH"]),
+    )
+    refresh_head(clock)
+    get_logger().debug(
+        "Beacon clock is initiated: slot %s, epoch %s, head lag %s",
+        clock.slot(),
+        clock.epoch(),
+        clock.head_lag(),
+    )
+    return clock
+
+
+def refresh_head(clock: BeaconClock) -> int:
+    """Reads the head slot from the beacon node, and records it on the given clock.
+
+    Args:
+        clock (BeaconClock): clock of the beacon chain
+
+    Returns:
+        int: head slot
+    """
+    res: dict[str, Any] = get_sdk().beacon.beacon_headers_id("head")
+    slot: int = int(res["header"]["message"]["slot"])
+    clock.observe_head(slot)
+    return slot
+
+
+def beacon_urls() -> list[str]:
+    """Returns the api bases of the beacon nodes, healthiest first.
+
+    Returns:
+        list[str]: urls of the beacon nodes
+    """
+    beacon: Any = get_sdk().beacon
+    if isinstance(beacon, PooledBeacon):
+        return [endpoint.url for endpoint in beacon.pool.ranked()]
+    return [beacon.api_base]
+
+
+def start_event_stream(tracker: HeadTracker) -> BeaconEventStream:
+    """Subscribes to the head and the finalized checkpoints of the beacon chain, feeding
+    the given tracker. Reads the heads 3 slots at most, before reconnecting.
+
+    Args:
+        tracker (HeadTracker): tracker of the beacon chain head
+
+    Returns:
+        BeaconEventStream: the stream that is started
+    """
+    clock: BeaconClock = get_clock()
+    stream: BeaconEventStream = BeaconEventStream(
+        urls=beacon_urls,
+        tracker=tracker,
+        clock=clock,
+        read_timeout=3 * clock.seconds_per_slot if clock else 36,
+    )
+    stream.start()
+    return stream
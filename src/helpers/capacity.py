@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+
+from typing import Any, Iterable
+from itertools import repeat
+from web3.types import EventData
+from geodefi.utils import to_bytes32
+
+from src.classes import CapacityModel
+from src.globals import get_sdk, get_logger, get_operator_id, get_operator_ids, get_capacity
+from src.helpers.portal import get_operator_allowance, get_surplus, get_wallet_balance
+from src.database.pools import fetch_pool_ids
+from src.database.transactions import fetch_pending_pubkeys
+from src.utils.thread import multithread
+from src.utils.operator import operator_scope
+
+
+def __hex(pubkey: Any) -> str:
+    """Returns the pubkey as a lowercase hex string with 0x prefix, as events provide bytes."""
+    pubkey: str = pubkey if isinstance(pubkey, str) else bytes(pubkey).hex()
+    return ("0x" + pubkey if not pubkey.startswith("0x") else pubkey).lower()
+
+
+def get_allowance(pool_id: int) -> int:
+    """Returns the number of validators the operator can propose for the given pool.
+    Read from the capacity model if it is known, otherwise from the chain.
+
+    Args:
+        pool_id (int): ID of the pool
+
+    Returns:
+        int: allowance of the operator
+    """
+    model: CapacityModel = get_capacity()
+    if model is None:
+        return get_operator_allowance(pool_id)
+
+    allowance: int = model.allowance(get_operator_id(), pool_id)
+    if allowance is None:
+        model.remember("allowance", (get_operator_id(), pool_id), get_operator_allowance(pool_id))
+        allowance = model.allowance(get_operator_id(), pool_id)
+    return allowance
+
+
+def get_pool_surplus(pool_id: int) -> int:
+    """Returns the surplus of the given pool as wei.
+    Read from the capacity model if it is known, otherwise from the chain.
+
+    Args:
+        pool_id (int): ID of the pool
+
+    Returns:
+        int: surplus of the pool
+    """
+    model: CapacityModel = get_capacity()
+    if model is None:
+        return get_surplus(pool_id)
+
+    surplus: int = model.surplus(pool_id)
+    if surplus is None:
+        model.remember("surplus", pool_id, get_surplus(pool_id))
+        surplus = model.surplus(pool_id)
+    return surplus
+
+
+def get_operator_wallet() -> int:
+    """Returns the internal wallet balance of the operator as wei.
+    Read from the capacity model if it is known, otherwise from the chain.
+
+    Returns:
+        int: wallet balance of the operator
+    """
+    model: CapacityModel = get_capacity()
+    if model is None:
+        return get_wallet_balance(get_operator_id())
+
+    wallet: int = model.wallet(get_operator_id())
+    if wallet is None:
+        model.remember("wallet", get_operator_id(), get_wallet_balance(get_operator_id()))
+        wallet = model.wallet(get_operator_id())
+    return wallet
+
+
+def record_deposits(events: Iterable[EventData]) -> None:
+    """Increases the surplus of the pools with the Deposit events.
+    gETH is minted for at least 1 ether, so minted gETH amount never overestimates the surplus
+    until the model is reconciled.
+
+    Args:
+        events (Iterable[EventData]): Deposit emits
+    """
+    model: CapacityModel = get_capacity()
+    if model is None:
+        return
+    for event in events:
+        model.deposit(event.blockNumber, event.args.poolId, event.args.mintedgETH)
+
+
+def record_delegations(events: Iterable[EventData]) -> None:
+    """Forgets the allowances that are changed with the Delegation or FallbackOperator events.
+    Delegation provides the total allowance, and fallback operators are not limited by it.
+    So, the remaining allowance is fetched once more, on the next proposal.
+
+    Args:
+        events (Iterable[EventData]): Delegation or FallbackOperator emits
+    """
+    model: CapacityModel = get_capacity()
+    if model is None:
+        return
+    for event in events:
+        for operator_id in get_operator_ids():
+            model.forget("allowance", (operator_id, event.args.poolId))
+
+
+def record_proposals(events: Iterable[EventData]) -> None:
+    """Consumes the surplus of the pools with the StakeProposal events of all operators,
+    and the allowances and the wallets of the operators that are served.
+
+    Args:
+        events (Iterable[EventData]): StakeProposal emits
+    """
+    model: CapacityModel = get_capacity()
+    if model is None:
+        return
+    for event in events:
+        model.propose(
+            event.blockNumber,
+            event.args.operatorId,
+            event.args.poolId,
+            [__hex(pubkey) for pubkey in event.args.pubkeys],
+        )
+
+
+def record_submitted_proposals(pool_id: int, pubkeys: list[str]) -> None:
+    """Consumes the capacity with the proposals of the operator that are just submitted,
+    so the next proposals do not wait for the StakeProposal event.
+
+    Args:
+        pool_id (int): ID of the pool
+        pubkeys (list[str]): public keys of the proposed validators
+    """
+    model: CapacityModel = get_capacity()
+    if model is None:
+        return
+    model.propose(None, get_operator_id(), pool_id, [__hex(pubkey) for pubkey in pubkeys])
+
+
+def record_stakes(events: Iterable[EventData]) -> None:
+    """Returns the 1 ether of the operator for every validator that is staked,
+    with the Stake events of the current operator.
+
+    Args:
+        events (Iterable[EventData]): Stake emits
+    """
+    model: CapacityModel = get_capacity()
+    if model is None:
+        return
+    for event in events:
+        model.stake(event.blockNumber, get_operator_id(), len(event.args.pubkeys))
+
+
+def __read(kind: str, key: Any, block: int) -> int:
+    """Reads a value of the capacity model from the chain, on the given block.
+
+    Args:
+        kind (str): allowance, surplus or wallet
+        key (Any): (operator ID, pool ID) for allowance, pool ID or operator ID
+        block (int): block number
+
+    Returns:
+        int: value on the block
+    """
+    functions: Any = get_sdk().portal.functions
+    if kind == "allowance":
+        operator_id, pool_id = key
+        return functions.operatorAllowance(pool_id, operator_id).call(block_identifier=block)
+    if kind == "surplus":
+        return functions.readUint(key, to_bytes32("surplus")).call(block_identifier=block)
+    return functions.readUint(key, to_bytes32("wallet")).call(block_identifier=block)
+
+
+def reconcile_capacity() -> None:
+    """Reads the allowances of the operators for every known pool, the surplus of the pools and
+    the wallets of the operators from the chain, in bulk and on the same block.
+    Then, replaces the values of the capacity model with them.
+    """
+    model: CapacityModel = get_capacity()
+    if model is None:
+        return
+
+    # pending proposals are read before the block, so the mined ones are not applied twice
+    pending: set[str] = set()
+    keys: list[tuple[str, Any]] = []
+    pools: set[int] = set()
+    for operator_id in get_operator_ids():
+        with operator_scope(operator_id):
+            pending.update(__hex(pk) for pk in fetch_pending_pubkeys("proposeStake"))
+            pool_ids: list[int] = fetch_pool_ids()
+        keys.extend(("allowance", (operator_id, pool_id)) for pool_id in pool_ids)
+        keys.append(("wallet", operator_id))
+        pools.update(pool_ids)
+    keys.extend(("surplus", pool_id) for pool_id in sorted(pools))
+
+    block: int = get_sdk().w3.eth.block_number
+    kinds, ids = zip(*keys)
+    values: list[int] = multithread(__read, kinds, ids, repeat(block))
+
+    read: dict[str, dict[Any, int]] = {"allowance": {}, "surplus": {}, "wallet": {}}
+    for (kind, key), value in zip(keys, values):
+        read[kind][key] = value
+
+    model.reconcile(block, read["allowance"], read["surplus"], read["wallet"], pending)
+    get_logger().debug(
+        f"Reconciled the capacity of {len(pools)} pools and {len(read['wallet'])} operators"
+        f" on block {block}"
+    )
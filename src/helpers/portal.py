@@ -4,11 +4,28 @@ from typing import Any
 from itertools import repeat
 from geodefi.globals import ID_TYPE
 from geodefi.utils import to_bytes32, get_key
+from geodefi.classes import Validator
 
-from src.globals import get_sdk, get_config, get_logger
+from src.common import Lazy
+from src.exceptions import DatabaseError
+from src.globals import get_sdk, get_logger, get_operator_id
+from src.database.metadata import fetch_metadata, save_metadata
 from src.utils.thread import multithread
+from src.utils.cache import block_cached, cached_block, immutable
 
 
+# fields of a validator that never change, after it is proposed
+VALIDATOR_CONSTANTS: tuple[str] = (
+    "portal_index",
+    "beacon_index",
+    "pool_id",
+    "operator_id",
+    "signature31",
+    "withdrawal_credentials",
+)
+
+
+@block_cached("portal")
 # pylint: disable-next=invalid-name
 def get_StakeParams() -> list[Any]:
     """Returns the result of portal.StakeParams function.
@@ -17,9 +34,10 @@ def get_StakeParams() -> list[Any]:
         list: list of StakeParams
     """
     get_logger().debug("Calling StakeParams() from portal")
-    return get_sdk().portal.functions.StakeParams().call()
+    return get_sdk().portal.functions.StakeParams().call(block_identifier=cached_block())
 
 
+@block_cached("portal")
 # pylint: disable-next=invalid-name
 def get_allIdsByType(_type: ID_TYPE, index: int) -> int:
     """A helper function to call allIdsByType on Portal. Returns the ID of the given type and index.
@@ -33,12 +51,16 @@ def get_allIdsByType(_type: ID_TYPE, index: int) -> int:
     """
 
     get_logger().debug("Calling allIdsByType() from portal")
-    return get_sdk().portal.functions.allIdsByType(_type, index).call()
+    return (
+        get_sdk().portal.functions.allIdsByType(_type, index).call(block_identifier=cached_block())
+    )
 
 
 # related to pools >
 
 
+@immutable("NAME")
+@block_cached("portal")
 def get_name(pool_id: int) -> str:
     """Returns the name of the pool with given ID.
 
@@ -49,10 +71,16 @@ def get_name(pool_id: int) -> str:
         str: Name of the pool.
     """
 
-    get_logger().debug("Fetching the name of a pool: {pool_id}")
-    return get_sdk().portal.functions.readBytes(pool_id, to_bytes32("NAME")).call().decode("utf-8")
+    get_logger().debug("Fetching the name of a pool: %s", pool_id)
+    return (
+        get_sdk()
+        .portal.functions.readBytes(pool_id, to_bytes32("NAME"))
+        .call(block_identifier=cached_block())
+        .decode("utf-8")
+    )
 
 
+@block_cached("portal")
 def get_maintainer(_id: int) -> str:
     """Returns the maintainer of the given ID.
 
@@ -60,10 +88,15 @@ def get_maintainer(_id: int) -> str:
         id (int): ID of the pool or operator to fetch maintainer for.
     """
 
-    get_logger().debug("Fetching the maintainer of id: {_id}")
-    return get_sdk().portal.functions.readAddress(_id, to_bytes32("maintainer")).call()
+    get_logger().debug("Fetching the maintainer of id: %s", _id)
+    return (
+        get_sdk()
+        .portal.functions.readAddress(_id, to_bytes32("maintainer"))
+        .call(block_identifier=cached_block())
+    )
 
 
+@block_cached("portal")
 def get_wallet_balance(_id: int) -> str:
     """Returns the internal wallet a balance for the given ID.
 
@@ -71,10 +104,15 @@ def get_wallet_balance(_id: int) -> str:
         id (int): ID of the pool or operator to fetch maintainer for.
     """
 
-    get_logger().debug("Fetching the wallet balance for id: {_id}")
-    return get_sdk().portal.functions.readUint(_id, to_bytes32("wallet")).call()
+    get_logger().debug("Fetching the wallet balance for id: %s", _id)
+    return (
+        get_sdk()
+        .portal.functions.readUint(_id, to_bytes32("wallet"))
+        .call(block_identifier=cached_block())
+    )
 
 
+@block_cached("portal")
 def get_withdrawal_address(pool_id: int) -> str:
     """Returns the withdrawal address for given pool.
 
@@ -85,12 +123,17 @@ def get_withdrawal_address(pool_id: int) -> str:
         str: Withdrawal address of the pool.
     """
 
-    get_logger().debug("Fetching the withdrawal address of a pool: {pool_id}")
-    res = get_sdk().portal.functions.readAddress(pool_id, to_bytes32("withdrawalPackage")).call()
+    get_logger().debug("Fetching the withdrawal address of a pool: %s", pool_id)
+    res = (
+        get_sdk()
+        .portal.functions.readAddress(pool_id, to_bytes32("withdrawalPackage"))
+        .call(block_identifier=cached_block())
+    )
 
     return res
 
 
+@block_cached("portal")
 def get_surplus(pool_id: int) -> int:
     """Returns the Ether amount that can be used to create validators for given pool, as wei.
 
@@ -101,10 +144,15 @@ def get_surplus(pool_id: int) -> int:
         int: Surplus of the pool in wei.
     """
 
-    get_logger().debug(f"Fetching the surplus of a pool: {get_name(pool_id)}")
-    return get_sdk().portal.functions.readUint(pool_id, to_bytes32("surplus")).call()
+    get_logger().debug("Fetching the surplus of a pool: %s", Lazy(get_name, pool_id))
+    return (
+        get_sdk()
+        .portal.functions.readUint(pool_id, to_bytes32("surplus"))
+        .call(block_identifier=cached_block())
+    )
 
 
+@block_cached("portal")
 def get_fallback_operator(pool_id: int) -> int:
     """Returns the fallbackOperator for given pool.
     Fallback Operators can create validators without approval.
@@ -115,10 +163,15 @@ def get_fallback_operator(pool_id: int) -> int:
     Returns:
         int: Fallback operator ID of the pool.
     """
-    get_logger().debug("Fetching the fallbackOperator of a pool: {pool_id}")
-    return get_sdk().portal.functions.readUint(pool_id, to_bytes32("fallbackOperator")).call()
+    get_logger().debug("Fetching the fallbackOperator of a pool: %s", pool_id)
+    return (
+        get_sdk()
+        .portal.functions.readUint(pool_id, to_bytes32("fallbackOperator"))
+        .call(block_identifier=cached_block())
+    )
 
 
+@block_cached("portal")
 def can_stake(pubkey: str) -> bool:
     """Checks if the validator proposal for the given pubkey is approved by Oracle
 
@@ -128,10 +181,11 @@ def can_stake(pubkey: str) -> bool:
     Returns:
         bool: True if can proceed and call stake. False if not yet confirmed; or alienated.
     """
-    get_logger().debug(f"Checking if the validator can be staked and finalized: {pubkey}")
-    return get_sdk().portal.functions.canStake(pubkey).call()
+    get_logger().debug("Checking if the validator can be staked and finalized: %s", pubkey)
+    return get_sdk().portal.functions.canStake(pubkey).call(block_identifier=cached_block())
 
 
+@block_cached("portal")
 def get_pools_count() -> int:
     """Returns the number of current pools from Portal
 
@@ -139,8 +193,12 @@ def get_pools_count() -> int:
         int: Number of pools.
     """
 
-    get_logger().debug("Fetching the pools count of a pool: {pool_id}")
-    return get_sdk().portal.functions.allIdsByTypeLength(ID_TYPE.POOL).call()
+    get_logger().debug("Fetching the pools count")
+    return (
+        get_sdk()
+        .portal.functions.allIdsByTypeLength(ID_TYPE.POOL)
+        .call(block_identifier=cached_block())
+    )
 
 
 def get_all_pool_ids(start_index: int = 0) -> list[int]:
@@ -163,20 +221,22 @@ def get_all_pool_ids(start_index: int = 0) -> list[int]:
 # validators
 
 
+@block_cached("portal", scoped=True)
 def get_owned_pubkeys_count() -> int:
     """Returns the number of all validators that is owned by the operator.
 
     Returns:
         int: Number of validators owned by the operator.
     """
-    get_logger().debug("Fetching the number of pools owned pubkeys from a validator: {pool_id}")
+    get_logger().debug("Fetching the number of owned pubkeys of operator: %s", get_operator_id())
     return (
         get_sdk()
-        .portal.functions.readUint(get_config().operator_id, to_bytes32("validators"))
-        .call()
+        .portal.functions.readUint(get_operator_id(), to_bytes32("validators"))
+        .call(block_identifier=cached_block())
     )
 
 
+@block_cached("portal", scoped=True)
 def get_owned_pubkey(index: int) -> str:
     """Returns the pubkey of given index for the operator's validator list.
 
@@ -188,10 +248,10 @@ def get_owned_pubkey(index: int) -> str:
     """
     pk: str = (
         get_sdk()
-        .portal.functions.readBytes(index, get_key(get_config().operator_id, "validators"))
-        .call()
+        .portal.functions.readBytes(index, get_key(get_operator_id(), "validators"))
+        .call(block_identifier=cached_block())
     )
-    get_logger().debug("Fetching an owned pubkey. index:{index} : pubkey:{pk}")
+    get_logger().debug("Fetching an owned pubkey. index:%s : pubkey:%s", index, pk)
     return pk
 
 
@@ -210,6 +270,7 @@ def get_all_owned_pubkeys(start_index: int = 0) -> list[str]:
     )
 
 
+@block_cached("portal", scoped=True)
 def get_operator_allowance(pool_id: int) -> int:
     """Returns the result of portal.operatorAllowance function.
 
@@ -219,4 +280,55 @@ def get_operator_allowance(pool_id: int) -> int:
     Returns:
         int: Operator allowance for the given pool.
     """
-    return get_sdk().portal.functions.operatorAllowance(pool_id, get_config().operator_id).call()
+    return (
+        get_sdk()
+        .portal.functions.operatorAllowance(pool_id, get_operator_id())
+        .call(block_identifier=cached_block())
+    )
+
+
+def get_validator_constants(pubkey: str, val: Validator = None) -> dict[str, Any]:
+    """Returns the fields of the validator that never change, see VALIDATOR_CONSTANTS.
+    Constants are kept on the Metadata table once they are fetched.
+    beacon_index and withdrawal_credentials are only known after the validator is\
+        visible on the beacon chain.
+
+    Args:
+        pubkey (str): public key of the validator.
+        val (Validator, optional): validator object to read from, if already fetched.
+
+    Returns:
+        dict[str, Any]: constants of the validator
+    """
+    try:
+        constants: dict[str, Any] = fetch_metadata(pubkey)
+    except DatabaseError:
+        # table might not be created yet, such as when the commands are used.
+        constants: dict[str, Any] = {}
+
+    if not all(field in constants for field in VALIDATOR_CONSTANTS):
+        get_logger().debug("Fetching the constants of a validator: %s", pubkey)
+        if val is None:
+            val: Validator = get_sdk().portal.validator(pubkey)
+
+        # IDs can not fit into sqlite integers
+        constants: dict[str, Any] = {
+            "portal_index": val.portal_index,
+            "pool_id": str(val.poolId),
+            "operator_id": str(val.operatorId),
+            "signature31": val.signature31,
+        }
+        try:
+            constants["beacon_index"] = int(val.beacon_index)
+            constants["withdrawal_credentials"] = val.withdrawal_credentials
+        except Exception:
+            get_logger().debug("Validator is not visible on the beacon chain yet: %s", pubkey)
+
+        try:
+            save_metadata(pubkey, constants)
+        except DatabaseError:
+            get_logger().debug("Could not save the constants of %s to the Metadata.", pubkey)
+
+    constants["pool_id"] = int(constants["pool_id"])
+    constants["operator_id"] = int(constants["operator_id"])
+    return constants
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+
+from time import time
+from typing import Any
+from geodefi.globals import DEPOSIT_SIZE
+
+from src.globals import get_config, get_logger, get_lease
+from src.utils.thread import multithread
+from src.actions.ethdo import generate_deposit_data, ethdo_pool
+from src.helpers.portal import get_owned_pubkeys_count, get_withdrawal_address
+from src.helpers.capacity import get_allowance
+from src.database.pools import fetch_pool_ids
+from src.database.transactions import count_pending_transactions
+from src.database.reservoir import (
+    fetch_deposit_data,
+    fetch_reserved_indexes,
+    prune_reservoir,
+    save_deposit_data,
+)
+
+
+def __generate(withdrawal_address: str, index: int) -> tuple[list[Any], list[Any]]:
+    """Generates the deposit data of a validator index with ethdo, for 1 ETH and 31 ETH deposits.
+
+    Args:
+        withdrawal_address (str): withdrawal address of the pool
+        index (int): index of the validator of the operator
+
+    Returns:
+        tuple[list[Any], list[Any]]: deposit data for the proposal and the stake
+
+    Raises:
+        EthdoError: Raised if the deposit data generation fails.
+    """
+    proposal: list[Any] = generate_deposit_data(
+        withdrawal_address=withdrawal_address,
+        deposit_value=DEPOSIT_SIZE.PROPOSAL * 1_000_000_000,
+        index=index,
+    )
+    stake: list[Any] = generate_deposit_data(
+        withdrawal_address=withdrawal_address,
+        deposit_value=DEPOSIT_SIZE.STAKE * 1_000_000_000,
+        index=index,
+    )
+    return proposal, stake
+
+
+def get_deposit_data(withdrawal_address: str, index: int) -> tuple[list[Any], list[Any]]:
+    """Returns the deposit data of a validator index, for 1 ETH and 31 ETH deposits.
+    Deposit data is taken from the reservoir if it is generated before, otherwise by ethdo.
+
+    Args:
+        withdrawal_address (str): withdrawal address of the pool
+        index (int): index of the validator of the operator
+
+    Returns:
+        tuple[list[Any], list[Any]]: deposit data for the proposal and the stake
+
+    Raises:
+        EthdoError: Raised if the deposit data generation fails.
+    """
+    data = fetch_deposit_data(withdrawal_address, index)
+    if data is not None:
+        get_logger().debug("Deposit data for index %s is taken from the reservoir", index)
+        return data
+    return __generate(withdrawal_address, index)
+
+
+def get_deposit_data_many(withdrawal_address: str, indexes: list[int]) -> list[tuple[Any, Any]]:
+    """Returns the deposit data of the given validator indexes, see get_deposit_data.
+    Validators are generated concurrently, as many as the ethdo pool allows.
+
+    Args:
+        withdrawal_address (str): withdrawal address of the pool
+        indexes (list[int]): indexes of the validators of the operator
+
+    Returns:
+        list[tuple[Any, Any]]: deposit data for the proposal and the stake, in the same order
+
+    Raises:
+        EthdoError: Raised if the deposit data generation fails.
+    """
+    return multithread(
+        get_deposit_data,
+        [withdrawal_address] * len(indexes),
+        indexes,
+        num_threads=ethdo_pool().size,
+        gated=False,
+    )
+
+
+def __reserve(withdrawal_address: str, index: int) -> bool:
+    """Generates the deposit data of a validator index, and saves it on the reservoir.
+
+    Args:
+        withdrawal_address (str): withdrawal address of the pool
+        index (int): index of the validator of the operator
+
+    Returns:
+        bool: False if it is skipped, since the instance lost the lease.
+
+    Raises:
+        EthdoError: Raised if the deposit data generation fails.
+    """
+    if not get_lease().is_leader():
+        return False
+
+    proposal, stake = __generate(withdrawal_address, index)
+    save_deposit_data(withdrawal_address, index, proposal, stake, int(time()))
+    return True
+
+
+def fill_reservoir() -> int:
+    """Generates the deposit data for the upcoming validator indexes of the current operator,
+    up to strategy.reservoir_depth, for every pool that the operator has allowance for.
+    Nearest indexes are generated first for all pools, since any pool can use the next one.
+    Validators are generated concurrently, as many as the ethdo pool allows.
+    Deposit data of the indexes that are already used are removed.
+
+    Returns:
+        int: number of the validator indexes that are generated
+
+    Raises:
+        EthdoError: Raised if the deposit data generation fails.
+    """
+    depth: int = get_config().strategy.get("reservoir_depth", 0)
+    if not depth:
+        return 0
+
+    # index of the next validator is not updated until the pending proposals are mined
+    if count_pending_transactions("proposeStake"):
+        return 0
+
+    index: int = get_owned_pubkeys_count()
+    prune_reservoir(index)
+
+    pool_ids: list[int] = fetch_pool_ids()
+    allowances: list[int] = multithread(get_allowance, pool_ids)
+    addresses: list[str] = []
+    for pool_id, allowance in zip(pool_ids, allowances):
+        if allowance:
+            address: str = get_withdrawal_address(pool_id)
+            if address not in addresses:
+                addresses.append(address)
+
+    reserved: dict[str, set[int]] = {addr: fetch_reserved_indexes(addr) for addr in addresses}
+
+    missing: list[tuple[str, int]] = [
+        (address, i)
+        for i in range(index, index + depth)
+        for address in addresses
+        if i not in reserved[address]
+    ]
+    if not missing:
+        return 0
+
+    filled: list[bool] = multithread(
+        __reserve,
+        *zip(*missing),
+        num_threads=ethdo_pool().size,
+        gated=False,
+    )
+
+    get_logger().debug("Generated deposit data for %s validators in the reservoir", sum(filled))
+    return sum(filled)
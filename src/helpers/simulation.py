@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+
+from typing import Any, Callable
+from web3 import Web3
+from web3.exceptions import ContractLogicError, ContractCustomError
+from web3.contract.contract import ContractFunction
+
+from src.classes import BlockCache
+from src.globals import get_sdk, get_logger, get_block_cache
+from src.utils.gas import get_sender
+
+
+def __custom_errors() -> dict[str, str]:
+    """Returns the custom errors of the Portal, by their selectors.
+
+    Returns:
+        dict[str, str]: signatures of the errors, such as EnforcedPause()
+    """
+    errors: dict[str, str] = {}
+    for item in get_sdk().portal.contract.abi:
+        if item.get("type") == "error":
+            types: str = ",".join(arg["type"] for arg in item.get("inputs", []))
+            signature: str = f"{item['name']}({types})"
+            errors[Web3.to_hex(Web3.keccak(text=signature)[:4])[2:]] = signature
+    return errors
+
+
+def decode_revert(error: ContractLogicError) -> str:
+    """Returns the reason of a revert. Reasons are decoded by web3 for the require statements
+    and panics, custom errors of the Portal are decoded by their selectors.
+
+    Args:
+        error (ContractLogicError): error raised by the call
+
+    Returns:
+        str: reason of the revert
+    """
+    if isinstance(error, ContractCustomError):
+        data: str = str(error.data or "")
+        data = data[2:] if data.startswith("0x") else data
+        return __custom_errors().get(data[:8], f"unknown custom error: 0x{data[:8]}")
+    return str(error.message or error)
+
+
+def __simulate(func: ContractFunction, block_identifier: str) -> str:
+    """Calls the given function with eth_call on the given block.
+
+    Args:
+        func (ContractFunction): contract function that is called with its arguments
+        block_identifier (str): block to simulate on
+
+    Returns:
+        str: reason of the revert, None if it would succeed.
+    """
+    try:
+        func.call({"from": get_sender()}, block_identifier=block_identifier)
+        return None
+    except ContractLogicError as e:
+        return decode_revert(e)
+
+
+def simulate(func: ContractFunction, block_identifier: str = "pending") -> str:
+    """Simulates the transaction of the given Portal function before it is submitted.
+    Results are cached for the current block, by the hash of the calldata.
+
+    Args:
+        func (ContractFunction): contract function that is called with its arguments
+        block_identifier (str, optional): block to simulate on. Defaults to pending, replacements\
+            are simulated on latest, since the pending block might include the replaced one.
+
+    Returns:
+        str: reason of the revert, None if it would succeed.
+    """
+    payload: str = get_sdk().portal.contract.encodeABI(fn_name=func.fn_name, args=func.args)
+
+    cache: BlockCache = get_block_cache()
+    if cache is None:
+        return __simulate(func, block_identifier)
+    return cache.get(
+        ("simulation", Web3.keccak(hexstr=payload), block_identifier),
+        lambda: __simulate(func, block_identifier),
+    )
+
+
+def bisect_batch(
+    items: list[Any], build: Callable[[list[Any]], ContractFunction]
+) -> tuple[list[Any], list[tuple[Any, str]]]:
+    """Removes the items that would make the transaction of a batch revert, by simulating
+    the halves of the batch, recursively. A batch without any bad items is simulated once.
+    If the halves only revert together, the first half is kept and the rest waits.
+
+    Args:
+        items (list[Any]): items of the batch, such as pubkeys
+        build (Callable[[list[Any]], ContractFunction]): returns the call with the given items
+
+    Returns:
+        tuple[list[Any], list[tuple[Any, str]]]: items that can be submitted,\
+            and the items that would revert with their reasons.
+    """
+    if not items:
+        return [], []
+
+    reason: str = simulate(build(items))
+    if reason is None:
+        return items, []
+    if len(items) == 1:
+        get_logger().debug("Simulation reverted for %s: %s", items[0], reason)
+        return [], [(items[0], reason)]
+
+    mid: int = len(items) // 2
+    first, first_bad = bisect_batch(items[:mid], build)
+    second, second_bad = bisect_batch(items[mid:], build)
+    bad: list[tuple[Any, str]] = first_bad + second_bad
+
+    if first and second and simulate(build(first + second)) is not None:
+        return first, bad
+    return first + second, bad
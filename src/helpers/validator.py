@@ -1,34 +1,57 @@
 # -*- coding: utf-8 -*-
 
+from time import time
 from typing import Any
 from threading import Lock
 from datetime import datetime
-from geodefi.globals import DEPOSIT_SIZE, VALIDATOR_STATE, BEACON_DENOMINATOR
-from geodefi.utils import to_bytes32
-
-from src.exceptions import DatabaseMismatchError, EthdoError
-from src.globals import get_sdk, get_config, get_constants, get_logger
+from geodefi.globals import DEPOSIT_SIZE, BEACON_DENOMINATOR
+
+from src.common import AttributeDict, Lazy
+from src.exceptions import EthdoError
+from src.globals import (
+    get_sdk,
+    get_config,
+    get_logger,
+    get_operator_id,
+    get_lease,
+    get_clock,
+    get_capacity,
+)
 from src.utils.notify import send_email
 from src.utils.thread import multithread
-from src.actions.ethdo import generate_deposit_data
 from src.actions.portal import call_proposeStake, call_stake
 from src.helpers.portal import (
-    get_operator_allowance,
-    get_surplus,
     get_withdrawal_address,
+    get_owned_pubkeys_count,
     get_name,
+    get_validator_constants,
     can_stake,
 )
-from src.database.validators import save_local_state, fetch_filtered_pubkeys
+from src.helpers.batch import get_batch_size
+from src.helpers.capacity import (
+    get_allowance,
+    get_pool_surplus,
+    get_operator_wallet,
+    record_submitted_proposals,
+)
+from src.helpers.simulation import bisect_batch
+from src.helpers.reservoir import get_deposit_data_many
 from src.database.pools import save_last_proposal_timestamp
+from src.database.metadata import fetch_metadata, update_metadata
+from src.database.transactions import count_pending_transactions, fetch_pending_pubkeys
+from src.database.proposal_queue import PROPOSE, STAKE, enqueue, fetch_queue, dequeue
 
 
 propose_mutex = Lock()
 stake_mutex = Lock()
 
+# field of the operator on Metadata, index of the next validator after the submitted proposals
+NEXT_INDEX: str = "next_index"
+
 
 def max_proposals_count(pool_id: int) -> int:
-    """Returns the maximum proposals count for given pool
+    """Returns the maximum proposals count for given pool.
+    Allowance, surplus and the wallet balance are read from the capacity model, if initialized.
 
     Args:
         pool_id (int): ID of the pool to get max proposals count for
@@ -40,16 +63,16 @@ def max_proposals_count(pool_id: int) -> int:
         DatabaseError: Error fetching allowance and surplus for pool from table
     """
 
-    allowance: int = get_operator_allowance(pool_id)
+    allowance: int = get_allowance(pool_id)
 
-    get_logger().debug(f"Allowance for pool {get_name(pool_id)}: {allowance}")
+    get_logger().debug("Allowance for pool %s: %s", Lazy(get_name, pool_id), allowance)
 
     if allowance == 0:
         return 0
 
-    surplus: int = get_surplus(pool_id)
+    surplus: int = get_pool_surplus(pool_id)
 
-    get_logger().debug(f"Surplus for pool {get_name(pool_id)}: {surplus}")
+    get_logger().debug("Surplus for pool %s: %s", Lazy(get_name, pool_id), surplus)
 
     if surplus == 0:
         return 0
@@ -59,15 +82,13 @@ def max_proposals_count(pool_id: int) -> int:
 
     curr_max: int = min(allowance, eth_per_prop)
 
-    get_logger().debug(f"Current max proposals for pool {get_name(pool_id)}: {curr_max}")
+    get_logger().debug("Current max proposals for pool %s: %s", Lazy(get_name, pool_id), curr_max)
 
     # considering the wallet balance of the operator since it might not be enough (1 eth per val)
-    wallet_balance: int = (
-        get_sdk().portal.functions.readUint(get_config().operator_id, to_bytes32("wallet")).call()
-    )
+    wallet_balance: int = get_operator_wallet()
 
     get_logger().debug(
-        f"Wallet balance for operator {get_name(get_config().operator_id)}: {wallet_balance}"
+        "Wallet balance for operator %s: %s", Lazy(get_name, get_operator_id()), wallet_balance
     )
 
     eth_per_wallet_balance: int = wallet_balance // (DEPOSIT_SIZE.PROPOSAL * BEACON_DENOMINATOR)
@@ -89,164 +110,291 @@ def max_proposals_count(pool_id: int) -> int:
     return curr_max
 
 
-def check_and_propose(pool_id: int) -> None:
-    """Propose for given pool if able to propose for all of them at once \
-        or in batches of 50 pubkeys at a time if needed to.
+def is_due(count: int, oldest: int, now: int = None) -> bool:
+    """Returns True if the queued work should be sent. That is when there is enough of it
+    to fill a transaction (strategy.min_proposal_queue), or when the oldest work has
+    waited long enough (strategy.max_proposal_delay).
 
     Args:
-        pool_id (int): ID of the pool to propose for
+        count (int): number of validators waiting
+        oldest (int): timestamp of the oldest work
+        now (int, optional): timestamp. Defaults to the current time.
 
     Returns:
-        list[str]: list of pubkeys proposed
+        bool: True if the queued work should be sent
     """
-    with propose_mutex:
-        max_allowed: int = max_proposals_count(pool_id)
-
-        get_logger().debug(f"Max allowed proposals for pool {get_name(pool_id)}: {max_allowed}")
+    strategy: AttributeDict = get_config().strategy
+    now = int(time()) if now is None else now
+    if count >= max(1, strategy.min_proposal_queue):
+        return True
+    return count > 0 and now - oldest >= strategy.max_proposal_delay
 
-        if max_allowed == 0:
-            return []
 
-        try:
-            # This returns the length of the validators array in the contract
-            # so it is same as the index of the next validator
-            new_val_ind: int = (
-                get_sdk()
-                .portal.functions.readUint(get_config().operator_id, to_bytes32("validators"))
-                .call()
-            )
+def __propose(pool_id: int, count: int, index: int) -> int:
+    """Proposes the given number of validators for the given pool, in batches
+    as large as the gas ceiling allows.
 
-            for i in range(max_allowed):
+    Args:
+        pool_id (int): ID of the pool to propose for
+        count (int): number of validators to propose
+        index (int): index of the first validator of the operator
 
-                proposal_data: list[Any] = generate_deposit_data(
-                    withdrawal_address=get_withdrawal_address(pool_id),
-                    deposit_value=DEPOSIT_SIZE.PROPOSAL * 1_000_000_000,
-                    index=new_val_ind + i,
-                )
+    Returns:
+        int: number of validators proposed
+    """
+    try:
+        withdrawal_address: str = get_withdrawal_address(pool_id)
 
-                get_logger().debug(f"Proposal data for index {new_val_ind + i}: {proposal_data}")
+        proposal_data: list[Any] = []
+        stake_data: list[Any] = []
+        deposit_data: list[tuple[Any, Any]] = get_deposit_data_many(
+            withdrawal_address, list(range(index, index + count))
+        )
+        for i, (proposal, stake) in enumerate(deposit_data):
+            proposal_data.extend(proposal)
+            get_logger().debug("Proposal data for index %s: %s", index + i, proposal_data[-1])
 
-                stake_data: list[Any] = generate_deposit_data(
-                    withdrawal_address=get_withdrawal_address(pool_id),
-                    deposit_value=DEPOSIT_SIZE.STAKE * 1_000_000_000,
-                    index=new_val_ind + i,
-                )
+            stake_data.extend(stake)
+            get_logger().debug("Stake data for index %s: %s", index + i, stake_data[-1])
 
-                get_logger().debug(f"Stake data for index {new_val_ind + i}: {proposal_data}")
+    except EthdoError as e:
+        send_email("Ethdo failed", str(e), dont_notify_devs=True)
+        return 0
 
-        except EthdoError as e:
-            send_email("Ethdo failed", str(e), dont_notify_devs=True)
-            return []
+    pubkeys: list[str] = ["0x" + prop["pubkey"] for prop in proposal_data]
+    signatures1: list[str] = ["0x" + prop["signature"] for prop in proposal_data]
+    signatures31: list[str] = ["0x" + prop["signature"] for prop in stake_data]
 
-        pubkeys: list[str] = ["0x" + prop["pubkey"] for prop in proposal_data]
-        signatures1: list[str] = ["0x" + prop["signature"] for prop in proposal_data]
-        signatures31: list[str] = ["0x" + prop["signature"] for prop in stake_data]
+    size: int = get_batch_size(
+        "proposeStake",
+        lambda k: get_sdk().portal.functions.proposeStake(
+            pool_id, get_operator_id(), pubkeys[:k], signatures1[:k], signatures31[:k]
+        ),
+        len(pubkeys),
+    )
+    proposed: int = 0
+    for i in range(0, len(pubkeys), size):
+        items: list[tuple[str, str, str]] = list(
+            zip(pubkeys[i : i + size], signatures1[i : i + size], signatures31[i : i + size])
+        )
+        batch, bad = bisect_batch(
+            items,
+            lambda chunk: get_sdk().portal.functions.proposeStake(
+                pool_id, get_operator_id(), *[list(field) for field in zip(*chunk)]
+            ),
+        )
+        for (pk, _, _), reason in bad:
+            get_logger().critical(f"Proposal for {pk} would revert: {reason}")
 
-        for i in range(0, len(pubkeys), 50):
-            temp_pks: list[str] = pubkeys[i : i + 50]
-            temp_sigs1: list[str] = signatures1[i : i + 50]
-            temp_sigs31: list[str] = signatures31[i : i + 50]
+        # validator indexes should be consecutive, proposals after a bad one wait for the next time
+        ok: int = 0
+        while ok < len(items) and items[ok] in batch:
+            ok += 1
 
+        if ok:
+            temp_pks, temp_sigs1, temp_sigs31 = [list(field) for field in zip(*items[:ok])]
             call_proposeStake(pool_id, temp_pks, temp_sigs1, temp_sigs31)
+            record_submitted_proposals(pool_id, temp_pks)
             save_last_proposal_timestamp(
                 pool_id, int(round(datetime.now().timestamp()))
             )  # why is this needed?
+            proposed += ok
 
+        if ok < len(items):
+            break
 
-def check_and_stake(pks: list[str]):
-    """Stake for given pubkeys if able to stake for all of them at
-    once or in batches of 50 pubkeys at a time if needed to.
+    return proposed
+
+
+def check_and_propose(pool_id: int) -> None:
+    """Queues the given pool for proposals, and proposes for the queued pools if they are due.
+
+    Args:
+        pool_id (int): ID of the pool to propose for
+    """
+    if not get_lease().is_leader():
+        get_logger().debug("Standby, not proposing for pool %s", pool_id)
+        return
+
+    enqueue(PROPOSE, [pool_id], int(time()))
+    flush_proposals()
+
+
+def get_next_index() -> int:
+    """Returns the index of the next validator of the current operator, after the owned ones
+    and the ones that are submitted, but not mined yet. Indexes of the proposals that are
+    dropped or reverted are not used again, since the later ones might be mined already.
+    So, the index after the last submitted proposal is kept on the Metadata, across restarts.
+
+    Returns:
+        int: index of the next validator
+    """
+    pending: int = len(fetch_pending_pubkeys("proposeStake"))
+    submitted: int = fetch_metadata(get_operator_id()).get(NEXT_INDEX, 0)
+    return max(get_owned_pubkeys_count() + pending, submitted)
+
+
+def flush_proposals() -> None:
+    """Proposes for the queued pools, if there are enough proposals to fill a transaction,
+    or the oldest one has waited for long enough, see is_due.
+    Pools that can not propose are removed from the queue, until they are queued again.
+    """
+    if not get_lease().is_leader():
+        return
+
+    with propose_mutex:
+        # allowance, surplus and the wallet only reflect the pending proposals on the capacity model
+        if get_capacity() is None and count_pending_transactions("proposeStake"):
+            get_logger().debug("Waiting for the pending proposals to be mined.")
+            return
+
+        queue: list[tuple[str, int]] = fetch_queue(PROPOSE)
+        if not queue:
+            return
+
+        allowed: dict[int, int] = {}
+        for key, _ in queue:
+            allowed[int(key)] = max_proposals_count(int(key))
+            get_logger().debug(
+                "Max allowed proposals for pool %s: %s", Lazy(get_name, key), allowed[int(key)]
+            )
+
+        idle: list[int] = [pool_id for pool_id, count in allowed.items() if count == 0]
+        if idle:
+            dequeue(PROPOSE, idle)
+
+        waiting: dict[int, int] = {pool_id: count for pool_id, count in allowed.items() if count}
+        if not waiting:
+            return
+
+        oldest: int = min(queued for key, queued in queue if int(key) in waiting)
+        if not is_due(sum(waiting.values()), oldest):
+            get_logger().debug("Waiting for more proposals: %s", sum(waiting.values()))
+            return
+
+        # validator indexes and the wallet are shared by the pools, until the proposals are mined
+        index: int = get_next_index()
+        wallet: int = get_operator_wallet() // (DEPOSIT_SIZE.PROPOSAL * BEACON_DENOMINATOR)
+        for pool_id, count in waiting.items():
+            count = min(count, wallet)
+            if count == 0:
+                break
+
+            proposed: int = __propose(pool_id, count, index)
+            if proposed:
+                index += proposed
+                wallet -= proposed
+                update_metadata(get_operator_id(), {NEXT_INDEX: index})
+                dequeue(PROPOSE, [pool_id])
+
+
+def __stake(pks: list[str]) -> None:
+    """Stakes for the given pubkeys, in batches as large as the gas ceiling allows.
     Pubkeys are ordered according to their poolId to decrease gas costs.
 
     Args:
         pks (list[str]): pubkeys to stake for
     """
-    # TODO: (later) implement "min_proposal_queue" and "max_proposal_delay"
-    # under strategy for both propose and stake steps.
-    # Thus allow delays on stake and proposal to save gas.
-    # min_proposal_queue => min number of validators to be filled before sending a tx.
-    # max_proposal_delay => max delay a proposal will wait.
-    # Then, they should be grouped by the pool id to save gas as well.
-    with stake_mutex:
-        txs: list[list[str]] = []
-        failed_pks: list[str] = []
-
-        # Confirm all with canStake before calling stake
-        confirmations: list[bool] = multithread(can_stake, pks)
-
-        confirmed_pks: list[str] = []
-        for pk, conf in zip(pks, confirmations):
-            if conf:
-                if len(confirmed_pks) < 50:
-                    confirmed_pks.append(pk)
-                else:
-                    txs.append(confirmed_pks)
-                    confirmed_pks = []
-            else:
-                get_logger().critical(f"Not allowed to finalize staking for: {pk}")
-                failed_pks.append(pks)
-
-        if txs:
-            for tx in txs:
-                if tx:
-                    tx_hash: str = call_stake(pubkeys=tx)
-                    send_email(
-                        f"{len(tx)} proposals have been staked",
-                        f"Here is the transaction hash:\n{tx_hash}",
-                        dont_notify_devs=True,
-                    )
-
-        if failed_pks:
-            f_pks: str = "\n".join(failed_pks)
-            send_email(
-                f"{len(failed_pks)} validator proposals have failed unexpectedly",
-                f"Here is the list of validator pubkeys that have failed:\n{f_pks}",
-                dont_notify_devs=True,
-            )
+    txs: list[list[str]] = []
+    failed_pks: list[str] = []
 
+    # Confirm all with canStake before calling stake
+    confirmations: list[bool] = multithread(can_stake, pks)
 
-def run_finalize_exit_triggers():
-    """Run finalize exit trigger for all validators which are in EXIT_REQUESTED state"""
+    confirmed_pks: list[str] = []
+    for pk, conf in zip(pks, confirmations):
+        if conf:
+            confirmed_pks.append(pk)
+        else:
+            get_logger().critical(f"Not allowed to finalize staking for: {pk}")
+            failed_pks.append(pk)
 
-    pks: list[str] = fetch_filtered_pubkeys(portal_state=VALIDATOR_STATE.EXIT_REQUESTED)
+    # validators of the same pool are packed together
+    confirmed_pks.sort(key=lambda pk: int(get_validator_constants(pk)["pool_id"]))
 
-    for pk, exit_epoch in pks:
-        # check portal status, if it is not EXITTED or EXIT_REQUESTED raise an error
-        chain_val_status: str = get_sdk().portal.validator(pk).state
-        if chain_val_status not in ["EXIT_REQUESTED", "EXITTED"]:
-            raise DatabaseMismatchError(
-                f"Validator status mismatch in chain and database for pubkey {pk}"
-            )
+    size: int = get_batch_size(
+        "stake",
+        lambda k: get_sdk().portal.functions.stake(get_operator_id(), confirmed_pks[:k]),
+        len(confirmed_pks),
+    )
+    for i in range(0, len(confirmed_pks), size):
+        # pubkeys that would revert are removed from the batch
+        batch, bad = bisect_batch(
+            confirmed_pks[i : i + size],
+            lambda pubkeys: get_sdk().portal.functions.stake(get_operator_id(), pubkeys),
+        )
+        for pk, reason in bad:
+            get_logger().critical(f"Staking for {pk} would revert: {reason}")
+            failed_pks.append(pk)
+        if batch:
+            txs.append(batch)
+
+    for tx in txs:
+        tx_hash: str = call_stake(pubkeys=tx)
+        dequeue(STAKE, tx)
+        send_email(
+            f"{len(tx)} proposals have been staked",
+            f"Here is the transaction hash:\n{tx_hash}",
+            dont_notify_devs=True,
+        )
 
-        # check portal status, if it is EXITTED save local state and continue
-        if chain_val_status == "EXITTED":
-            save_local_state(pk, VALIDATOR_STATE.EXITED)
-            continue
+    if failed_pks:
+        dequeue(STAKE, failed_pks)
+        f_pks: str = "\n".join(failed_pks)
+        send_email(
+            f"{len(failed_pks)} validator proposals have failed unexpectedly",
+            f"Here is the list of validator pubkeys that have failed:\n{f_pks}",
+            dont_notify_devs=True,
+        )
 
-        # calculate the delay for the daemon to run
-        res: dict[str, Any] = get_sdk().beacon.beacon_headers_id("head")
 
-        slots_per_epoch: int = 32
-        slot_interval: int = int(get_constants().chain.interval)
+def check_and_stake(pks: list[str]):
+    """Queues the given pubkeys for staking, and stakes for the queued pubkeys if they are due.
 
-        current_slot: int = int(res["header"]["message"]["slot"])
-        current_epoch: int = current_slot // slots_per_epoch
+    Args:
+        pks (list[str]): pubkeys to stake for
+    """
+    if not get_lease().is_leader():
+        get_logger().debug("Standby, not staking for %s pubkeys", len(pks))
+        return
 
-        if current_epoch >= exit_epoch:
-            init_delay: int = 0
-        else:
-            epoch_diff: int = exit_epoch - current_epoch
-            seconds_per_epoch: int = slots_per_epoch * slot_interval
-            init_delay: int = epoch_diff * seconds_per_epoch
-
-        # initialize and run the daemon
-        # finalize_exit_daemon: TimeDaemon = TimeDaemon(
-        #     interval=slot_interval + 1,
-        #     trigger=FinalizeExitTrigger(pk),
-        #     initial_delay=init_delay,
-        # )
-
-        # finalize_exit_daemon.run()
+    enqueue(STAKE, pks, int(time()))
+    flush_stakes()
+
+
+def flush_stakes() -> None:
+    """Stakes for the queued pubkeys, if there are enough of them to fill a transaction,
+    or the oldest one has waited for long enough, see is_due.
+    """
+    if not get_lease().is_leader():
+        return
+
+    with stake_mutex:
+        queue: list[tuple[str, int]] = fetch_queue(STAKE)
+        if not queue:
+            return
+
+        # pubkeys that have a pending stake transaction are not sent again
+        pending: set[str] = fetch_pending_pubkeys("stake")
+        sent: list[str] = [pk for pk, _ in queue if pk in pending]
+        if sent:
+            dequeue(STAKE, sent)
+        queue = [(pk, queued) for pk, queued in queue if pk not in pending]
+
+        if not queue or not is_due(len(queue), queue[0][1]):
+            get_logger().debug("Waiting for more pubkeys to stake: %s", len(queue))
+            return
+
+        __stake([pk for pk, _ in queue])
+
+
+def get_current_epoch() -> int:
+    """Returns the current epoch of the beacon chain, calculated locally by the beacon clock.
+
+    Returns:
+        int: current epoch
+    """
+    return get_clock().epoch()
 
 
 def ping_pubkey_balance(pubkey: str, expected_balance: int) -> bool:
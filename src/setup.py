@@ -7,13 +7,23 @@ from geodefi import Geode
 from geodefi.globals.constants import ETHER_DENOMINATOR
 
 from src.common import AttributeDict, Loggable
+from src.classes import (
+    PriorityGate,
+    Lease,
+    BlockCache,
+    HeadTracker,
+    NonceManager,
+    ProcessPool,
+    KeystoreSigner,
+    CapacityModel,
+)
 from src.exceptions import (
     ConfigurationFieldError,
     MissingConfigurationError,
     EthdoError,
     GasApiError,
 )
-from src.daemons import BlockDaemon, EventDaemon
+from src.daemons import BlockDaemon, EventDaemon, TimeDaemon
 from src.triggers.event import (
     AlienatedTrigger,
     DelegationTrigger,
@@ -25,10 +35,19 @@ from src.triggers.event import (
     StakeTrigger,
     ExitRequestTrigger,
 )
+from src.triggers.time import (
+    LeaseTrigger,
+    ReceiptTrigger,
+    ProposalQueueTrigger,
+    ReservoirTrigger,
+    CapacityTrigger,
+    FinalizeExitTrigger,
+)
 from src.actions.ethdo import ping_wallet
 
 from src.utils.gas import parse_gas, fetch_gas
 from src.utils.notify import send_email
+from src.utils.operator import operator_scope, is_multi_operator
 
 from src.helpers.portal import get_name
 from src.globals import (
@@ -36,18 +55,46 @@ from src.globals import (
     set_sdk,
     set_constants,
     set_logger,
+    set_gate,
+    set_lease,
+    set_block_cache,
+    set_clock,
+    set_head_tracker,
+    set_nonce_manager,
+    set_ethdo_pool,
+    set_signer,
+    set_capacity,
     get_config,
     get_sdk,
     get_logger,
+    get_lease,
+    get_constants,
+    get_clock,
 )
 from src.helpers.portal import get_maintainer, get_wallet_balance
+from src.helpers.beacon import init_beacon_clock, start_event_stream
 
 from src.globals.config import apply_flags, init_config
 from src.globals.constants import init_constants
-from src.globals.sdk import init_sdk
+from src.globals.sdk import init_sdk, parse_private_keys
 
 from src.database.pools import reinitialize_pools_table, create_pools_table
 from src.database.validators import reinitialize_validators_table, create_validators_table
+from src.database.exits import reinitialize_exit_deadlines_table, create_exit_deadlines_table
+from src.database.transactions import reinitialize_transactions_table, create_transactions_table
+from src.database.proposal_queue import (
+    reinitialize_proposal_queue_table,
+    create_proposal_queue_table,
+)
+from src.database.reservoir import reinitialize_reservoir_table, create_reservoir_table
+from src.database.lease import create_lease_table
+from src.database.migration import migrate_operator_tables
+from src.database.metadata import create_metadata_table
+from src.database.accounts import create_accounts_table
+from src.database.expected_pubkeys import (
+    reinitialize_expected_pubkeys_table,
+    create_expected_pubkeys_table,
+)
 from src.database.events import (
     reinitialize_alienated_table,
     reinitialize_delegation_table,
@@ -76,7 +123,7 @@ def preflight_checks(test_email: bool = False, test_ethdo=False, test_operator=F
         however they should be valid if provided.
     - Checks if ethdo is available and account exists
     - Checks if gas api working, when provided
-    - Checks if given private key can control the provided Operator ID
+    - Checks if given private keys can control the provided Operator IDs
     - Checks if there is enough money in the operator wallet and prints
 
     Raises:
@@ -118,6 +165,11 @@ def preflight_checks(test_email: bool = False, test_ethdo=False, test_operator=F
     elif network.max_attempt <= 0 or network.attempt_rate > 10:
         raise ConfigurationFieldError("Provided value is unexpected: (0-10] seconds")
 
+    if not "rpc_budget" in network:
+        network.rpc_budget = 8
+    elif network.rpc_budget <= 0 or network.rpc_budget > 64:
+        raise ConfigurationFieldError("Provided value is unexpected: (0-64] concurrent calls")
+
     strategy: AttributeDict = config.strategy
     if not "min_proposal_queue" in strategy:
         raise MissingConfigurationError(
@@ -133,6 +185,21 @@ def preflight_checks(test_email: bool = False, test_ethdo=False, test_operator=F
     elif strategy.max_proposal_delay < 0 or strategy.max_proposal_delay > 604800:
         raise ConfigurationFieldError("Provided value is unexpected: [0-604800] seconds")
 
+    if not "gas_ceiling" in strategy:
+        strategy.gas_ceiling = 10_000_000
+    elif strategy.gas_ceiling < 1_000_000 or strategy.gas_ceiling > 30_000_000:
+        raise ConfigurationFieldError("Provided value is unexpected: [1M-30M] gas")
+
+    if not "reservoir_depth" in strategy:
+        strategy.reservoir_depth = 0
+    elif strategy.reservoir_depth < 0 or strategy.reservoir_depth > 100:
+        raise ConfigurationFieldError("Provided value is unexpected: [0-100] validators")
+
+    if not "capacity_interval" in strategy:
+        strategy.capacity_interval = 15
+    elif strategy.capacity_interval < 0 or strategy.capacity_interval > 1440:
+        raise ConfigurationFieldError("Provided value is unexpected: [0-1440] minutes")
+
     logger: AttributeDict = config.logger
     if not "no_stream" in logger:
         raise MissingConfigurationError("'logger' section is missing the 'no_stream' field.")
@@ -157,25 +224,52 @@ def preflight_checks(test_email: bool = False, test_ethdo=False, test_operator=F
     if not "dir" in database:
         raise MissingConfigurationError("'database' section is missing the 'dir' field.")
 
+    if "ha" in config:
+        ha: AttributeDict = config.ha
+        if not "enabled" in ha:
+            ha.enabled = False
+        if not "dir" in ha:
+            raise MissingConfigurationError("'ha' section is missing the 'dir' field.")
+        if not "lease_duration" in ha:
+            # standby takes over within 1 to 2 slots
+            ha.lease_duration = int(config.chains[config.chain_name].interval)
+        elif ha.lease_duration < 3 or ha.lease_duration > 120:
+            raise ConfigurationFieldError("Provided value is unexpected: [3-120] seconds")
+
     if "gas" in config:
         gas: AttributeDict = config.gas
         if not "max_priority" in gas:
             raise MissingConfigurationError("'gas' section is missing the 'max_priority' field.")
         if not "max_fee" in gas:
             raise MissingConfigurationError("'gas' section is missing the 'max_fee' field.")
-        if not "api" in gas:
-            raise MissingConfigurationError("'gas' section is missing the 'api' field.")
-        if not "parser" in gas:
-            raise MissingConfigurationError(
-                "No parser could be identified for the provided gas api"
-            )
+        # fees are estimated from the fee history of the node, unless a gas api is provided
+        if "api" in gas:
+            if not "parser" in gas:
+                raise MissingConfigurationError(
+                    "No parser could be identified for the provided gas api"
+                )
+
+            priority_fee, base_fee = parse_gas(fetch_gas())
+            if priority_fee is None or base_fee is None or priority_fee <= 0 or base_fee <= 0:
+                raise GasApiError("Gas api did not respond or faulty")
+
+    ethdo: AttributeDict = config.ethdo
+    if not "processes" in ethdo:
+        ethdo.processes = os.cpu_count() or 1
+    elif ethdo.processes <= 0 or ethdo.processes > 64:
+        raise ConfigurationFieldError("Provided value is unexpected: (0-64] subprocesses")
 
-        priority_fee, base_fee = parse_gas(fetch_gas())
-        if priority_fee is None or base_fee is None or priority_fee <= 0 or base_fee <= 0:
-            raise GasApiError("Gas api did not respond or faulty")
+    if not "timeout" in ethdo:
+        ethdo.timeout = 60
+    elif ethdo.timeout <= 0 or ethdo.timeout > 600:
+        raise ConfigurationFieldError("Provided value is unexpected: (0-600] seconds")
+
+    if not "signer" in ethdo:
+        ethdo.signer = "ethdo"
+    elif ethdo.signer not in ("ethdo", KeystoreSigner.name):
+        raise ConfigurationFieldError("Provided value is unexpected: ethdo or native")
 
     if test_ethdo:
-        ethdo: AttributeDict = config.ethdo
         if not "wallet" in ethdo:
             raise MissingConfigurationError("'ethdo' section is missing the 'wallet' field.")
         if not "account_prefix" in ethdo:
@@ -187,21 +281,29 @@ def preflight_checks(test_email: bool = False, test_ethdo=False, test_operator=F
 
     if test_operator:
         sdk: Geode = get_sdk()
-        signer = sdk.w3.eth.default_account
-        maintainer = get_maintainer(config.operator_id)
+        signers: list[str] = [
+            sdk.w3.eth.account.from_key(key).address
+            for key in parse_private_keys(os.getenv("GEONIUS_PRIVATE_KEY"))
+        ]
+
+        for operator_id in config.operator_ids:
+            maintainer = get_maintainer(operator_id)
+
+            if maintainer not in signers:
+                raise ConfigurationFieldError(
+                    f"'maintainer' of {operator_id} is {maintainer}."
+                    f"Provided private keys for {signers} does not match."
+                )
 
-        if maintainer != signer:
-            raise ConfigurationFieldError(
-                f"'maintainer' of {config.operator_id} is {maintainer}."
-                "Provided private key for {signer} does not match."
-            )
+            balance: int = get_wallet_balance(operator_id)
 
-        balance: int = get_wallet_balance(config.operator_id)
+            get_logger().warning(
+                f"{get_name(operator_id)} has {balance/ETHER_DENOMINATOR}ETH ({balance} wei)"
+                f" balance in portal. Use 'geonius increase-wallet' to deposit more."
+            )
 
-        get_logger().warning(
-            f"{get_name(config.operator_id)} has {balance/ETHER_DENOMINATOR}ETH ({balance} wei)"
-            f" balance in portal. Use 'geonius increase-wallet' to deposit more."
-        )
+        # default operator's maintainer signs when there is no operator specified
+        sdk.w3.eth.default_account = get_maintainer(config.operator_id)
 
     if test_email:
         if "email" in config:
@@ -235,6 +337,10 @@ def setup(**kwargs):
     - Creates a config dict from provided json
     - Configures the geodefi python sdk
     - Configures the constant parameters for ease of use
+    - Configures the shared budget of concurrent calls for the daemons
+    - Configures the pool of the ethdo subprocesses, and the signer of the deposit data
+    - Configures the capacity model of the pools, if enabled
+    - Configures the lease for high availability, if enabled
 
     Args:
         flag_collector (Callable): a fuunction that provides the will
@@ -266,11 +372,36 @@ def setup(**kwargs):
         test_operator=kwargs["test_operator"],
     )
 
+    set_gate(PriorityGate(capacity=config.network.rpc_budget))
+    set_block_cache(BlockCache())
+    set_clock(init_beacon_clock())
+    set_nonce_manager(
+        NonceManager(lambda address: get_sdk().w3.eth.get_transaction_count(address, "pending"))
+    )
+    set_ethdo_pool(ProcessPool(size=config.ethdo.processes, timeout=config.ethdo.timeout))
+    if config.ethdo.signer == KeystoreSigner.name:
+        set_signer(
+            KeystoreSigner(
+                passphrase=os.getenv("ETHDO_ACCOUNT_PASSPHRASE"),
+                base_dir=config.ethdo.get("base_dir"),
+                processes=config.ethdo.processes,
+            )
+        )
+
+    if config.strategy.capacity_interval > 0:
+        set_capacity(CapacityModel())
+
+    if "ha" in config and config.ha.enabled:
+        set_lease(Lease(duration=config.ha.lease_duration))
+    else:
+        set_lease(Lease())
+
 
 def init_dbs(reset: bool = False):
     """Initializes the databases as suited.\
     This function is called at the beginning of the program to make sure the
     databases are up to date.
+    Event tables are shared, other tables are created for every operator, within their namespace.
 
     Args:
         reset (bool, optional): Wipes out all data if provided. Defaults to False.
@@ -278,8 +409,15 @@ def init_dbs(reset: bool = False):
     if reset:
         get_logger().warning("Dropping the database...")
 
-        reinitialize_pools_table()
-        reinitialize_validators_table()
+        for operator_id in get_config().operator_ids:
+            with operator_scope(operator_id):
+                reinitialize_pools_table()
+                reinitialize_validators_table()
+                reinitialize_expected_pubkeys_table()
+                reinitialize_exit_deadlines_table()
+                reinitialize_transactions_table()
+                reinitialize_proposal_queue_table()
+                reinitialize_reservoir_table()
 
         reinitialize_alienated_table()
         reinitialize_delegation_table()
@@ -292,8 +430,20 @@ def init_dbs(reset: bool = False):
         reinitialize_id_initiated_table()
 
     else:
-        create_pools_table()
-        create_validators_table()
+        for operator_id in get_config().operator_ids:
+            with operator_scope(operator_id):
+                create_pools_table()
+                create_validators_table()
+                create_expected_pubkeys_table()
+                create_exit_deadlines_table()
+                create_transactions_table()
+                create_proposal_queue_table()
+                create_reservoir_table()
+
+        if is_multi_operator():
+            # tables of a single operator deployment are kept in the shared database
+            with operator_scope(get_config().operator_id):
+                migrate_operator_tables()
 
         create_alienated_table()
         create_delegation_table()
@@ -305,6 +455,16 @@ def init_dbs(reset: bool = False):
         create_fallback_operator_table()
         create_id_initiated_table()
 
+    # keeps the values that never change on chain, so never reset
+    create_metadata_table()
+
+    # accounts of the ethdo wallet are refreshed on startup, so never reset
+    create_accounts_table()
+
+    if get_lease().enabled:
+        # shared by the instances, never reset
+        create_lease_table()
+
 
 def run_daemons():
     """Initializes and runs the daemons for the triggers.
@@ -314,6 +474,56 @@ def run_daemons():
     """
     events: ContractEvent = get_sdk().portal.contract.events
 
+    # Standby instances keep ingesting, but can not submit transactions without the lease
+    if get_lease().enabled:
+        lease_trigger: LeaseTrigger = LeaseTrigger()
+        lease_daemon: TimeDaemon = TimeDaemon(
+            interval=lease_trigger.heartbeat_interval, trigger=lease_trigger, initial_delay=0
+        )
+        lease_daemon.run()
+
+    # Submitted transactions are watched on every block, and sped up after 5 blocks
+    interval: int = int(get_constants().chain.interval)
+    receipt_daemon: TimeDaemon = TimeDaemon(
+        interval=interval, trigger=ReceiptTrigger(stuck_after=5 * interval), initial_delay=0
+    )
+    receipt_daemon.run()
+
+    # Queued proposals and stakes are sent when they wait longer than max_proposal_delay
+    if get_config().strategy.max_proposal_delay > 0:
+        proposal_queue_daemon: TimeDaemon = TimeDaemon(
+            interval=get_constants().one_minute,
+            trigger=ProposalQueueTrigger(),
+            initial_delay=0,
+        )
+        proposal_queue_daemon.run()
+
+    # Deposit data of the upcoming validators are generated in advance, every 10 minutes
+    if get_config().strategy.reservoir_depth > 0:
+        reservoir_daemon: TimeDaemon = TimeDaemon(
+            interval=10 * get_constants().one_minute,
+            trigger=ReservoirTrigger(),
+            initial_delay=0,
+        )
+        reservoir_daemon.run()
+
+    # Capacity of the pools is read from the chain in bulk, and kept up to date with the events
+    if get_config().strategy.capacity_interval > 0:
+        capacity_daemon: TimeDaemon = TimeDaemon(
+            interval=get_config().strategy.capacity_interval * get_constants().one_minute,
+            trigger=CapacityTrigger(),
+            initial_delay=0,
+        )
+        capacity_daemon.run()
+
+    # Exits are finalized when they are due, sleeps until the next deadline or for an epoch
+    finalize_exit_daemon: TimeDaemon = TimeDaemon(
+        interval=get_clock().seconds_per_epoch,
+        trigger=FinalizeExitTrigger(),
+        initial_delay=0,
+    )
+    finalize_exit_daemon.run()
+
     # Triggers
     id_initiated_trigger: IdInitiatedTrigger = IdInitiatedTrigger()
     deposit_trigger: DepositTrigger = DepositTrigger()
@@ -363,6 +573,22 @@ def run_daemons():
     #     event=events.ExitRequest(),
     # )
 
+    # Event daemons are woken on every new head of the beacon chain, polling as a fallback
+    tracker: HeadTracker = HeadTracker()
+    set_head_tracker(tracker)
+    for daemon in (
+        id_initiated_daemon,
+        deposit_daemon,
+        delegation_daemon,
+        stake_proposal_daemon,
+        verification_daemon,
+        stake_daemon,
+        fallback_operator_daemon,
+        alienated_daemon,
+    ):
+        daemon.follow(tracker)
+    start_event_stream(tracker)
+
     # Run the daemons
     id_initiated_daemon.run()
     deposit_daemon.run()
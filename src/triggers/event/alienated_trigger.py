@@ -9,11 +9,12 @@ from src.exceptions import DatabaseError
 from src.database.validators import (
     save_portal_state,
     save_local_state,
-    check_pk_in_db,
+    find_operator_of,
 )
 from src.globals import get_logger
 from src.helpers.event import event_handler
 from src.utils.notify import send_email
+from src.utils.operator import operator_scope
 
 
 class AlienatedTrigger(Trigger):
@@ -49,7 +50,7 @@ class AlienatedTrigger(Trigger):
         """
 
         # if pk is in db (validators table), then continue
-        return check_pk_in_db(event.args.pubkey)
+        return find_operator_of(event.args.pubkey) is not None
 
     def __parse_events(self, events: Iterable[EventData]) -> list[tuple]:
         """Parses the events to saveable format. Returns a list of tuples.
@@ -83,7 +84,7 @@ class AlienatedTrigger(Trigger):
         """
 
         try:
-            with Database() as db:
+            with Database(Database.shared) as db:
                 db.executemany(
                     "INSERT INTO Alienated VALUES (?,?,?,?)",
                     events,
@@ -114,8 +115,9 @@ class AlienatedTrigger(Trigger):
             for event in filtered_events:
                 pubkey: str = event.args.pubkey
                 get_logger().critical(f"Your validator is alienated: {pubkey}")
-                save_portal_state(pubkey, VALIDATOR_STATE.ALIENATED)
-                save_local_state(pubkey, VALIDATOR_STATE.ALIENATED)
+                with operator_scope(find_operator_of(pubkey)):
+                    save_portal_state(pubkey, VALIDATOR_STATE.ALIENATED)
+                    save_local_state(pubkey, VALIDATOR_STATE.ALIENATED)
 
             send_email(
                 "Proposal is Alienated and You are Prisoned!",
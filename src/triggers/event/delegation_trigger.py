@@ -6,8 +6,10 @@ from web3.types import EventData
 from src.classes import Trigger, Database
 from src.exceptions import DatabaseError
 from src.helpers.event import event_handler
+from src.helpers.capacity import record_delegations
 from src.helpers.validator import check_and_propose
-from src.globals import get_logger, get_config
+from src.globals import get_logger, get_operator_ids
+from src.utils.operator import operator_scope
 
 
 class DelegationTrigger(Trigger):
@@ -31,16 +33,16 @@ class DelegationTrigger(Trigger):
         get_logger().debug(f"{self.name} is initated.")
 
     def __filter_events(self, event: EventData) -> bool:
-        """Filters the events to check if the event is for the script's OPERATOR_ID.
+        """Filters the events to check if the event is for one of the script's OPERATOR_IDs.
 
         Args:
             event (EventData): Event to be checked
 
         Returns:
-            bool: True if the event is for the script's OPERATOR_ID, False otherwise
+            bool: True if the event is for one of the script's OPERATOR_IDs, False otherwise
         """
 
-        return event.args.operatorId == get_config().operator_id
+        return event.args.operatorId in get_operator_ids()
 
     def __parse_events(self, events: Iterable[EventData]) -> list[tuple]:
         """Parses the events to saveable format.
@@ -76,7 +78,7 @@ class DelegationTrigger(Trigger):
         """
 
         try:
-            with Database() as db:
+            with Database(Database.shared) as db:
                 db.executemany(
                     "INSERT INTO Delegation VALUES (?,?,?,?,?,?)",
                     events,
@@ -103,9 +105,10 @@ class DelegationTrigger(Trigger):
             self.__filter_events,
         )
 
-        # gather pool ids from filtered events
-        pool_ids: list[int] = [x.args.poolId for x in filtered_events]
+        # remaining allowances are fetched once more, on the next proposal
+        record_delegations(filtered_events)
 
-        for pool_id in pool_ids:
-            # if able to propose any new validators do so
-            check_and_propose(pool_id)
+        for event in filtered_events:
+            with operator_scope(event.args.operatorId):
+                # if able to propose any new validators do so
+                check_and_propose(event.args.poolId)
@@ -6,8 +6,10 @@ from web3.types import EventData
 from src.classes import Trigger, Database
 from src.exceptions import DatabaseError
 from src.helpers.event import event_handler
+from src.helpers.capacity import record_deposits
 from src.helpers.validator import check_and_propose
-from src.globals import get_logger
+from src.globals import get_logger, get_operator_ids
+from src.utils.operator import operator_scope
 
 
 class DepositTrigger(Trigger):
@@ -64,7 +66,7 @@ class DepositTrigger(Trigger):
             events (list[tuple]): list of Deposit emits
         """
         try:
-            with Database() as db:
+            with Database(Database.shared) as db:
                 db.executemany(
                     "INSERT INTO Deposit VALUES (?,?,?,?,?,?)",
                     events,
@@ -86,8 +88,13 @@ class DepositTrigger(Trigger):
             events, self.__parse_events, self.__save_events
         )
 
+        # surplus of the pools are increased, without reading them again
+        record_deposits(filtered_events)
+
         pool_ids: list[int] = [x.args.poolId for x in filtered_events]
 
         for pool_id in pool_ids:
-            # if able to propose any new validators do so
-            check_and_propose(pool_id)
+            for operator_id in get_operator_ids():
+                with operator_scope(operator_id):
+                    # if able to propose any new validators do so
+                    check_and_propose(pool_id)
@@ -1,31 +1,34 @@
 # -*- coding: utf-8 -*-
 
-from typing import Any, Iterable
+from typing import Iterable
 from web3.types import EventData
 from geodefi.globals import VALIDATOR_STATE
-from geodefi.classes import Validator
 
 from src.classes import Trigger, Database
-from src.daemons import TimeDaemon
-from src.triggers.time import FinalizeExitTrigger
 from src.exceptions import BeaconStateMismatchError, DatabaseError, EthdoError
-from src.actions.ethdo import exit_validator
+from src.common import AttributeDict
+from src.actions.ethdo import exit_validator, ethdo_pool
 from src.database.validators import (
-    save_portal_state,
-    save_local_state,
-    save_exit_epoch,
-    check_pk_in_db,
+    save_portal_states,
+    save_local_states,
+    save_exit_epochs,
+    find_operator_of,
 )
+from src.database.exits import save_exit_deadlines
 from src.helpers.event import event_handler
-
-# from src.helpers.validator import run_finalize_exit_triggers
-from src.globals import get_constants, get_sdk, get_logger
+from src.helpers.portal import get_validator_constants
+from src.helpers.beacon import get_validators
+from src.globals import get_logger, get_lease
 from src.utils.notify import send_email
+from src.utils.thread import multithread
+from src.utils.operator import operator_scope
 
 
 class ExitRequestTrigger(Trigger):
     """Trigger for the EXIT_REQUEST event. This event is emitted when a validator requests to exit.
 
+    Exits are finalized by the FinalizeExit daemon, when their exit epoch is reached.
+
     Attributes:
         name (str): The name of the trigger to be used when logging (value: EXIT_REQUEST)
     """
@@ -40,7 +43,6 @@ class ExitRequestTrigger(Trigger):
         """
 
         Trigger.__init__(self, name=self.name, action=self.update_validators_status)
-        # Runs finalize exit triggers if there are any validators to be finalized
         get_logger().debug(f"{self.name} is initated.")
 
     def __filter_events(self, event: EventData) -> bool:
@@ -54,7 +56,7 @@ class ExitRequestTrigger(Trigger):
         """
 
         # if pk is in db (validators table), then continue
-        return check_pk_in_db(event.args.pubkey)
+        return find_operator_of(event.args.pubkey) is not None
 
     def __parse_events(self, events: Iterable[EventData]) -> list[tuple]:
         """Parses the events to saveable format.
@@ -86,7 +88,7 @@ class ExitRequestTrigger(Trigger):
             events (list[tuple]): list of saveable events
         """
         try:
-            with Database() as db:
+            with Database(Database.shared) as db:
                 db.executemany(
                     "INSERT INTO ExitRequest VALUES (?,?,?,?)",
                     events,
@@ -98,9 +100,14 @@ class ExitRequestTrigger(Trigger):
     # pylint: disable-next=unused-argument
     def update_validators_status(self, events: Iterable[EventData], *args, **kwargs) -> None:
         """Updates the status of validators that have requested to exit the network.
+        Exits of every operator are handled together, see __exit_validators.
 
         Args:
             events (Iterable[EventData]): The events to be processed and saved to the database.
+
+        Raises:
+            BeaconStateMismatchError: Raised after every operator is handled, if any of the\
+                validators is not exiting on beacon.
         """
 
         # filter, parse and save events
@@ -111,56 +118,87 @@ class ExitRequestTrigger(Trigger):
             self.__filter_events,
         )
 
-        exitted_pks: list[str] = []
+        pubkeys: dict[int, list[str]] = {}
         for event in filtered_events:
-            pubkey: str = event.args.pubkey
-            save_portal_state(pubkey, VALIDATOR_STATE.EXIT_REQUESTED)
-
-            # TODO: (later) if this is not waiting for tx to be mined,
-            # there should be a way to handle and check the portal_state/beacon_status.
-            try:
-                exit_validator(pubkey)
-            except EthdoError as e:
-                send_email(
-                    f"Could not exit from validator: {pubkey}", str(e), dont_notify_devs=True
-                )
-                continue
-
-            val: Validator = get_sdk().portal.validator(pubkey)
-            if val.beacon_status == "active_exiting":
-                # write database the expected exit block
-                # TODO: (later) use validator.withdrawable_epoch instead of exit_epoch - today
-                # also check for default withdrawable_epoch which is too_far_epoch
-                save_exit_epoch(pubkey, val.exit_epoch)
-                exitted_pks.append(pubkey)
-            else:
-                raise BeaconStateMismatchError(f"Beacon state mismatch for pubkey {pubkey}")
-
-        # TODO: (later) exit_validator function (ethdo) is waiting for finalization
-        # we do not need to seperate the for loops and we can continue under the same loop
-        for pubkey in exitted_pks:
-            save_local_state(pubkey, VALIDATOR_STATE.EXIT_REQUESTED)
-
-            # calculate the delay for the daemon to run
-            res: dict[str, Any] = get_sdk().beacon.beacon_headers_id("head")
-            slots_per_epoch: int = 32
-            slot_interval: int = int(get_constants().chain.interval)
-
-            current_slot: int = int(res["header"]["message"]["slot"])
-            current_epoch: int = current_slot // slots_per_epoch
-
-            if current_epoch >= val.exit_epoch:
-                init_delay: int = 0
-            else:
-                epoch_diff: int = val.exit_epoch - current_epoch
-                seconds_per_epoch: int = slots_per_epoch * slot_interval
-                init_delay: int = epoch_diff * seconds_per_epoch
-
-            # initialize and run the daemon
-            finalize_exit_daemon: TimeDaemon = TimeDaemon(
-                interval=slot_interval + 1,
-                trigger=FinalizeExitTrigger(pubkey),
-                initial_delay=init_delay,
+            pubkeys.setdefault(find_operator_of(event.args.pubkey), []).append(event.args.pubkey)
+
+        mismatched: list[str] = []
+        for operator_id, operator_pubkeys in pubkeys.items():
+            with operator_scope(operator_id):
+                save_portal_states(operator_pubkeys, VALIDATOR_STATE.EXIT_REQUESTED)
+
+                if not get_lease().is_leader():
+                    get_logger().warning(
+                        f"Standby, not exiting from {len(operator_pubkeys)} validators"
+                    )
+                    continue
+
+                mismatched.extend(self.__exit_validators(operator_pubkeys))
+
+        if mismatched:
+            raise BeaconStateMismatchError(f"Beacon state mismatch for pubkeys {mismatched}")
+
+    def __exit_validator(self, pubkey: str) -> bool:
+        """Signs and broadcasts the exit of a validator with ethdo.
+
+        Args:
+            pubkey (str): public key of the validator
+
+        Returns:
+            bool: True if the exit is broadcasted
+        """
+        try:
+            exit_validator(pubkey)
+            return True
+        except EthdoError as e:
+            send_email(f"Could not exit from validator: {pubkey}", str(e), dont_notify_devs=True)
+            return False
+
+    def __exit_validators(self, pubkeys: list[str]) -> list[str]:
+        """Exits from the given validators of the current operator, concurrently,
+        as many as the ethdo pool allows. Then, the beacon statuses of the exited validators
+        are read at once, and their exit deadlines are saved together.
+
+        Args:
+            pubkeys (list[str]): public keys of the validators
+
+        Returns:
+            list[str]: public keys of the exited validators that are not exiting on beacon
+        """
+        exited: list[bool] = multithread(
+            self.__exit_validator, pubkeys, num_threads=ethdo_pool().size, gated=False
+        )
+        pubkeys = [pubkey for pubkey, ok in zip(pubkeys, exited) if ok]
+        if not pubkeys:
+            return []
+
+        # TODO: (later) if this is not waiting for tx to be mined,
+        # there should be a way to handle and check the portal_state/beacon_status.
+        validators: dict[str, AttributeDict] = get_validators(pubkeys)
+        exiting: list[str] = [
+            pubkey
+            for pubkey in pubkeys
+            if pubkey.lower() in validators
+            and validators[pubkey.lower()].status == "active_exiting"
+        ]
+        pool_ids: list[int] = [
+            constants["pool_id"] for constants in multithread(get_validator_constants, exiting)
+        ]
+
+        deadlines: list[tuple[str, str, int, int]] = [
+            (
+                pubkey,
+                pool_id,
+                validators[pubkey.lower()].exit_epoch,
+                validators[pubkey.lower()].withdrawable_epoch,
             )
+            for pubkey, pool_id in zip(exiting, pool_ids)
+        ]
+
+        if deadlines:
+            save_exit_epochs([(pubkey, exit_epoch) for pubkey, _, exit_epoch, _ in deadlines])
+            save_local_states(exiting, VALIDATOR_STATE.EXIT_REQUESTED)
+            # finalize exit daemon will pick them up when the exit epoch is reached
+            save_exit_deadlines(deadlines)
 
-            finalize_exit_daemon.run()
+        return [pubkey for pubkey in pubkeys if pubkey not in exiting]
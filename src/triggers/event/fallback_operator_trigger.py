@@ -8,8 +8,10 @@ from src.exceptions import DatabaseError
 from src.database.pools import save_fallback_operator
 from src.helpers.event import event_handler
 from src.helpers.portal import get_fallback_operator
+from src.helpers.capacity import record_delegations
 from src.helpers.validator import check_and_propose
-from src.globals import get_logger, get_config
+from src.globals import get_logger, get_operator_ids
+from src.utils.operator import operator_scope
 
 
 class FallbackOperatorTrigger(Trigger):
@@ -34,16 +36,16 @@ class FallbackOperatorTrigger(Trigger):
         get_logger().debug(f"{self.name} is initated.")
 
     def __filter_events(self, event: EventData) -> bool:
-        """Filters the events to check if the event is for the script's OPERATOR_ID.
+        """Filters the events to check if the event is for one of the script's OPERATOR_IDs.
 
         Args:
             event (EventData): Event to be checked
 
         Returns:
-            bool: True if the event is for the script's OPERATOR_ID, False otherwise
+            bool: True if the event is for one of the script's OPERATOR_IDs, False otherwise
         """
 
-        return event.args.operatorId == get_config().operator_id
+        return event.args.operatorId in get_operator_ids()
 
     def __parse_events(self, events: Iterable[EventData]) -> list[tuple]:
         """Parses the events to saveable format.
@@ -77,7 +79,7 @@ class FallbackOperatorTrigger(Trigger):
             events (list[tuple]): list of FallbackOperator emits
         """
         try:
-            with Database() as db:
+            with Database(Database.shared) as db:
                 db.executemany(
                     "INSERT INTO FallbackOperator VALUES (?,?,?,?,?)",
                     events,
@@ -95,19 +97,26 @@ class FallbackOperatorTrigger(Trigger):
             events (Iterable[EventData]): list of events
         """
 
+        events: list[EventData] = list(events)
         filtered_events: Iterable[EventData] = event_handler(
             events, self.__parse_events, self.__save_events, self.__filter_events
         )
 
+        # fallback operators are not limited by the allowance, even if they are replaced
+        record_delegations(events)
+
         # gather pool ids from filtered events
         pool_ids: list[int] = [x.args.poolId for x in filtered_events]
 
         for pool_id in pool_ids:
             fallback: int = get_fallback_operator(pool_id)
 
-            # check if the fallback id is OPERATOR_ID
-            # if so, column value is set to 1, sqlite3 don't do booleans
-            save_fallback_operator(pool_id, fallback == get_config().operator_id)
+            for operator_id in get_operator_ids():
+                with operator_scope(operator_id):
+                    # check if the fallback id is OPERATOR_ID
+                    # if so, column value is set to 1, sqlite3 don't do booleans
+                    save_fallback_operator(pool_id, fallback == operator_id)
 
-            # if able to propose any new validators do so
-            check_and_propose(pool_id)
+                    if fallback == operator_id:
+                        # if able to propose any new validators do so
+                        check_and_propose(pool_id)
@@ -4,7 +4,7 @@ from typing import Iterable
 from web3.types import EventData
 from geodefi.globals import ID_TYPE
 
-from src.classes import Trigger, Database
+from src.classes import PRIORITY, Trigger, Database
 from src.exceptions import DatabaseError
 from src.database.pools import fill_pools_table
 
@@ -17,9 +17,11 @@ class IdInitiatedTrigger(Trigger):
 
     Attributes:
         name (str): name of the trigger to be used when logging etc. (value: ID_INITIATED)
+        priority (PRIORITY): BACKGROUND, filling the pools table can wait.
     """
 
     name: str = "ID_INITIATED"
+    priority: PRIORITY = PRIORITY.BACKGROUND
 
     def __init__(self) -> None:
         """Initializes a IdInitiatedTrigger object.
@@ -78,7 +80,7 @@ class IdInitiatedTrigger(Trigger):
             events (list[tuple]): list of IdInitiated emits
         """
         try:
-            with Database() as db:
+            with Database(Database.shared) as db:
                 db.executemany(
                     "INSERT INTO IdInitiated VALUES(?,?,?,?)",
                     events,
@@ -9,8 +9,10 @@ from src.classes import Trigger, Database
 from src.daemons import TimeDaemon
 from src.triggers.time import ExpectPubkeysTrigger
 from src.exceptions import DatabaseError
-from src.globals import get_config, get_logger, get_constants
+from src.globals import get_logger, get_constants, get_operator_ids
+from src.utils.operator import operator_scope
 from src.helpers.event import event_handler
+from src.helpers.capacity import record_proposals
 
 
 class StakeProposalTrigger(Trigger):
@@ -35,7 +37,7 @@ class StakeProposalTrigger(Trigger):
 
         # initiate a TimeDaemon to keep track
         self.__except_pubkeys_trigger: ExpectPubkeysTrigger = ExpectPubkeysTrigger(
-            balance=DEPOSIT_SIZE.PROPOSAL, keep_alive=True
+            queue=self.name, balance=DEPOSIT_SIZE.PROPOSAL, keep_alive=True
         )
         self.__except_pubkeys_daemon: TimeDaemon = TimeDaemon(
             interval=15 * get_constants().one_minute,
@@ -46,16 +48,16 @@ class StakeProposalTrigger(Trigger):
         self.__except_pubkeys_daemon.run()
 
     def __filter_events(self, event: EventData) -> bool:
-        """Filters the events to check if the event is for the script's OPERATOR_ID.
+        """Filters the events to check if the event is for one of the script's OPERATOR_IDs.
 
         Args:
             event (EventData): Event to be checked
 
         Returns:
-            bool: True if the event is for the script's OPERATOR_ID, False otherwise
+            bool: True if the event is for one of the script's OPERATOR_IDs, False otherwise
         """
 
-        return event.args.operatorId == get_config().operator_id
+        return event.args.operatorId in get_operator_ids()
 
     def __parse_events(self, events: Iterable[EventData]) -> list[tuple]:
         """Parses the events to saveable format.
@@ -91,7 +93,7 @@ class StakeProposalTrigger(Trigger):
             events (list[tuple]): list of distinct pubkeys coming from StakeProposal emits
         """
         try:
-            with Database() as db:
+            with Database(Database.shared) as db:
                 db.executemany(
                     "INSERT INTO StakeProposal VALUES(?,?,?,?,?,?)",
                     events,
@@ -109,6 +111,7 @@ class StakeProposalTrigger(Trigger):
             events (Iterable[EventData]): list of events
         """
 
+        events: list[EventData] = list(events)
         filtered_events: Iterable[EventData] = event_handler(
             events,
             self.__parse_events,
@@ -116,9 +119,14 @@ class StakeProposalTrigger(Trigger):
             self.__filter_events,
         )
 
-        # gather all distinct pubkeys from filtered events' pubkeys list, then flatten
-        all_proposed_pks: list[list[str]] = [
-            pubkey for event in filtered_events for pubkey in event.args.pubkeys
-        ]
+        # proposals of every operator consume the surplus of the pools
+        record_proposals(events)
 
-        self.__except_pubkeys_trigger.extend(all_proposed_pks)
+        # gather all distinct pubkeys from filtered events' pubkeys list, per operator
+        proposed_pks: dict[int, list[str]] = {}
+        for event in filtered_events:
+            proposed_pks.setdefault(event.args.operatorId, []).extend(event.args.pubkeys)
+
+        for operator_id, pubkeys in proposed_pks.items():
+            with operator_scope(operator_id):
+                self.__except_pubkeys_trigger.extend(pubkeys)
@@ -4,14 +4,16 @@ from typing import Iterable
 from web3.types import EventData
 
 from geodefi.globals.beacon import DEPOSIT_SIZE
-from geodefi.classes import Validator
 
 from src.classes import Trigger, Database
 from src.daemons import TimeDaemon
 from src.triggers.time import ExpectPubkeysTrigger
 from src.exceptions import DatabaseError
-from src.globals import get_config, get_logger, get_constants, get_sdk
+from src.globals import get_logger, get_constants, get_operator_id, get_operator_ids
+from src.utils.operator import is_multi_operator, operator_scope
 from src.helpers.event import event_handler
+from src.helpers.portal import get_validator_constants
+from src.helpers.capacity import record_stakes
 
 
 class StakeTrigger(Trigger):
@@ -38,7 +40,7 @@ class StakeTrigger(Trigger):
 
         # initiate a TimeDaemon to keep track
         self.__expect_pubkeys_trigger: ExpectPubkeysTrigger = ExpectPubkeysTrigger(
-            balance=DEPOSIT_SIZE.PROPOSAL, keep_alive=True
+            queue=self.name, balance=DEPOSIT_SIZE.PROPOSAL, keep_alive=True
         )
         self.__expect_pubkeys_daemon: TimeDaemon = TimeDaemon(
             interval=15 * get_constants().one_minute,
@@ -75,17 +77,27 @@ class StakeTrigger(Trigger):
         return saveable_events
 
     def __filter_events(self, event: EventData) -> bool:
-        """Filters the events to check if the first pubkey's operator_id is OPERATOR_ID.
+        """Filters the events to check if the first pubkey's operator is one of OPERATOR_IDs.
 
         Args:
             event (EventData): Event to be checked
 
         Returns:
-            bool: True if the event is for the script's OPERATOR_ID, False otherwise
+            bool: True if the event is for one of the script's OPERATOR_IDs, False otherwise
         """
-        val: Validator = get_sdk().portal.validator(event.args.pubkeys[0])
+        return self.__operator_of(event) in get_operator_ids()
 
-        return val.poolId == get_config().operator_id
+    def __operator_of(self, event: EventData) -> int:
+        """Returns the operator of the first pubkey of the event.
+        Pubkeys that are staked within the same event belong to the same operator.
+
+        Args:
+            event (EventData): Event to be checked
+
+        Returns:
+            int: ID of the operator
+        """
+        return get_validator_constants(event.args.pubkeys[0])["operator_id"]
 
     def __save_events(self, events: list[tuple]) -> None:
         """Saves the parsed events to the database.
@@ -94,7 +106,7 @@ class StakeTrigger(Trigger):
             events (list[tuple]): list of distinct pubkeys coming from Stake emits
         """
         try:
-            with Database() as db:
+            with Database(Database.shared) as db:
                 db.executemany(
                     "INSERT INTO Stake VALUES(?,?,?,?,?)",
                     events,
@@ -121,9 +133,18 @@ class StakeTrigger(Trigger):
             self.__filter_events,
         )
 
-        # gather all distinct pubkeys from filtered events' pubkeys list, then flatten
-        all_proposed_pks: list[list[str]] = [
-            pubkey for event in filtered_events for pubkey in event.args.pubkeys
-        ]
-
-        self.__expect_pubkeys_trigger.extend(all_proposed_pks)
+        # gather all distinct pubkeys from filtered events' pubkeys list, per operator
+        staked_events: dict[int, list[EventData]] = {}
+        for event in filtered_events:
+            operator_id: int = (
+                self.__operator_of(event) if is_multi_operator() else get_operator_id()
+            )
+            staked_events.setdefault(operator_id, []).append(event)
+
+        for operator_id, operator_events in staked_events.items():
+            with operator_scope(operator_id):
+                # 1 ether of every validator is returned to the wallet of the operator
+                record_stakes(operator_events)
+                self.__expect_pubkeys_trigger.extend(
+                    [pubkey for event in operator_events for pubkey in event.args.pubkeys]
+                )
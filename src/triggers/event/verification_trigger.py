@@ -3,10 +3,11 @@
 from typing import Iterable
 from web3.types import EventData
 
-from src.classes import Trigger, Database
+from src.classes import PRIORITY, Trigger, Database
 from src.exceptions import DatabaseError
 from src.helpers.event import event_handler
-from src.globals import get_logger
+from src.globals import get_logger, get_operator_ids
+from src.utils.operator import operator_scope
 from src.database.validators import fetch_verified_pks
 from src.helpers.validator import check_and_stake
 
@@ -16,9 +17,11 @@ class VerificationTrigger(Trigger):
 
     Attributes:
         name (str): name of the trigger to be used when logging etc. (value: VERIFICATION)
+        priority (PRIORITY): CRITICAL, stakes are finalized on this trigger.
     """
 
     name: str = "VERIFICATION"
+    priority: PRIORITY = PRIORITY.CRITICAL
 
     def __init__(self) -> None:
         """Initializes a VerificationTrigger object.
@@ -61,7 +64,7 @@ class VerificationTrigger(Trigger):
             events (list[tuple]): list of VerificationIndexUpdated emits
         """
         try:
-            with Database() as db:
+            with Database(Database.shared) as db:
                 db.executemany(
                     "INSERT INTO VerificationIndexUpdated VALUES (?,?,?,?)",
                     events,
@@ -82,6 +85,8 @@ class VerificationTrigger(Trigger):
             events, self.__parse_events, self.__save_events
         )
 
-        verified_pks: list[str] = fetch_verified_pks()
+        for operator_id in get_operator_ids():
+            with operator_scope(operator_id):
+                verified_pks: list[str] = fetch_verified_pks()
 
-        check_and_stake(verified_pks)
+                check_and_stake(verified_pks)
@@ -2,3 +2,8 @@
 
 from .finalize_exit_trigger import FinalizeExitTrigger
 from .expect_pubkeys_trigger import ExpectPubkeysTrigger
+from .lease_trigger import LeaseTrigger
+from .receipt_trigger import ReceiptTrigger
+from .proposal_queue_trigger import ProposalQueueTrigger
+from .reservoir_trigger import ReservoirTrigger
+from .capacity_trigger import CapacityTrigger
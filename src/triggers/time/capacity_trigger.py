@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+
+from src.classes import Trigger
+from src.daemons import TimeDaemon
+from src.globals import get_logger
+from src.helpers.capacity import reconcile_capacity
+
+
+class CapacityTrigger(Trigger):
+    """Trigger for the CAPACITY. A time trigger that reconciles the capacity model with the chain.
+    Allowances, surplus and the wallet balances are read in bulk, and the events keep them
+    up to date until the next reconciliation. So, proposals do not call the Portal.
+
+    Attributes:
+        name (str): The name of the trigger to be used when logging etc. (value: CAPACITY)
+    """
+
+    name: str = "CAPACITY"
+
+    def __init__(self) -> None:
+        """Initializes a CapacityTrigger object.
+        The trigger will process the changes of the daemon after a loop.
+        It is a callable object. It is used to process the changes of the daemon.
+        It can only have 1 action.
+        """
+
+        Trigger.__init__(self, name=self.name, action=self.reconcile)
+        get_logger().debug(f"{self.name} is initated.")
+
+    # pylint: disable-next=unused-argument
+    def reconcile(self, daemon: TimeDaemon = None, *args, **kwargs) -> None:
+        """Reconciles the capacity of the pools, for all operators.
+
+        Args:
+            daemon (TimeDaemon): The daemon that triggers the action
+        """
+        reconcile_capacity()
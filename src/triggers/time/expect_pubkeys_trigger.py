@@ -1,15 +1,23 @@
 # -*- coding: utf-8 -*-
 
-from itertools import repeat
-from src.classes import Trigger
+from threading import Lock
+from datetime import datetime
+from src.classes import PRIORITY, Trigger
+from src.common import AttributeDict
 from src.daemons import TimeDaemon
-from src.utils.thread import multithread
+from src.utils.operator import operator_scope
 from src.database.validators import fill_validators_table
-from src.globals import get_logger
-from src.helpers.validator import ping_pubkey_balance, ping_pubkey_status
+from src.database.expected_pubkeys import (
+    insert_expected_pubkeys,
+    fetch_due_pubkeys,
+    postpone_expected_pubkeys,
+    remove_expected_pubkeys,
+    count_expected_pubkeys,
+)
+from src.globals import get_logger, get_constants, get_operator_ids
+from src.helpers.beacon import get_validators
 
 
-# TODO: (later) Stop and throw error after x attempts: This should be fault tolerant.
 class ExpectPubkeysTrigger(Trigger):
     """Trigger for the EXPECT_PUBKEYS.
     A time trigger that waits for a list of pubkeys, and checks if any can be filtered
@@ -17,83 +25,136 @@ class ExpectPubkeysTrigger(Trigger):
     Initial delay can be provided.
     Can stop the daemon after all the validators are recorded in db, if keep_alive is False.
 
+    Expected pubkeys are persisted in the ExpectedPubkeys table, so restarts do not lose them.
+    Every pubkey has its own attempt counter and the next check is postponed with an
+    exponential backoff, only the pubkeys that are due are checked on an iteration.
+
     Attributes:
         name (str): The name of the trigger to be used when logging etc. (value: EXPECT_DEPOSIT)
+        priority (PRIORITY): BACKGROUND, only bookkeeping.
+        __queue (str): Name of the queue on database that keeps the pubkeys of this trigger.
         __balance (int): When provided, the pubkeys will be filtered by the balance when detected.
         __status (str): When provided, the pubkeys will be filtered by the status when detected.
-        __pubkeys (str): Internal list of validator pubkeys to be finalized when ALL exited.
-        __keep_alive (str): TimeDaemon will not be shot down when pubkeys list is empty.
+        __keep_alive (str): TimeDaemon will not be shot down when there are no pubkeys left.
         Useful for event listeners.
+        __backoff (int): Delay (s) before the second check of a pubkey, doubles on every attempt.
+        __max_backoff (int): Maximum delay (s) between two checks of a pubkey.
+        __lock (Lock): Prevents daemon and event threads from checking the same pubkeys.
     """
 
     name: str = "EXPECT_PUBKEYS"
+    priority: PRIORITY = PRIORITY.BACKGROUND
 
     def __init__(
         self,
+        queue: str,
         balance: int = None,
         status: str = None,
-        pubkeys: list[str] = [],
         keep_alive: bool = False,
+        backoff: int = None,
+        max_backoff: int = None,
     ) -> None:
         Trigger.__init__(self, name=self.name, action=self.process_deposits)
+        self.__queue: str = queue
         self.__balance: int = balance
         self.__status: int = status
-        self.__pubkeys: str = pubkeys
         self.__keep_alive: bool = keep_alive
-        get_logger().debug(f"{self.name} is initated.")
+        self.__backoff: int = backoff or 15 * get_constants().one_minute
+        self.__max_backoff: int = max_backoff or 4 * get_constants().one_hour
+        self.__lock: Lock = Lock()
+        get_logger().debug(f"{self.name} is initated for queue: {queue}.")
 
-    def append(self, pubkeys: str, daemon: TimeDaemon = None):
-        """Extends the internal pubkeys list provided list with 1 pubkey
-            then immadiately processes the current list.
+    def __next_check(self, now: int, attempts: int) -> int:
+        """Returns the timestamp of the next check for a pubkey with given attempts.
 
         Args:
-            pubkey (str): pubkey to append into pubkeys list
-            daemon (TimeDaemon): daemon to be stopped if the pubkey is empty
+            now (int): current timestamp
+            attempts (int): number of failed checks so far, including the current one
+
+        Returns:
+            int: timestamp of the next check
         """
-        self.__pubkeys.append(pubkeys)
-        self.process_deposits(daemon)
+        return now + min(self.__backoff * 2 ** (attempts - 1), self.__max_backoff)
 
-    def extend(self, pubkeys: str, daemon: TimeDaemon = None):
-        """Extends the internal pubkeys list with provided list of more pubkeys
-        then immadiately processes the current list.
+    def append(self, pubkey: str, daemon: TimeDaemon = None):
+        """Adds 1 pubkey into the queue then immadiately processes the due pubkeys.
 
         Args:
-            pubkeys (list[str]): list of pubkeys to append into pubkeys list
-            daemon (TimeDaemon): daemon to be stopped if the pubkey is empty
+            pubkey (str): pubkey to append into the queue
+            daemon (TimeDaemon): daemon to be stopped if the queue is empty
         """
-        self.__pubkeys.extend(pubkeys)
-        self.process_deposits(daemon)
+        self.extend([pubkey], daemon=daemon)
 
-    # pylint: disable-next=unused-argument
-    def process_deposits(self, *args, daemon: TimeDaemon = None, **kwargs) -> None:
-        """Checks if any of the expected pubkeys are responding after the proposal deposit.
-        Processes the ones that respond and keeps the ones that don't for the next iteration.
+    def extend(self, pubkeys: list[str], daemon: TimeDaemon = None):
+        """Adds the provided list of pubkeys into the queue of the current operator
+        then immadiately processes the due pubkeys.
 
         Args:
-            daemon (TimeDaemon): daemon to be stopped if the pubkey is empty
+            pubkeys (list[str]): list of pubkeys to append into the queue
+            daemon (TimeDaemon): daemon to be stopped if the queue is empty
         """
-        if self.__pubkeys:
+        if pubkeys:
+            insert_expected_pubkeys(self.__queue, pubkeys, int(round(datetime.now().timestamp())))
+        self.process_deposits(daemon=daemon)
+
+    def __process_queue(self) -> None:
+        """Checks if any of the due pubkeys of the current operator are responding.
+        Processes the ones that respond and postpones the ones that don't.
+        """
+        now: int = int(round(datetime.now().timestamp()))
+        due: list[tuple[str, int]] = fetch_due_pubkeys(self.__queue, now)
+
+        if not due:
+            return
 
-            filtered = self.__pubkeys
-            if self.__balance:
-                filtered: bool = multithread(ping_pubkey_balance, filtered, repeat(self.__balance))
+        pubkeys: list[str] = [pk for pk, _ in due]
 
-            if self.__status:
-                filtered: bool = multithread(ping_pubkey_status, filtered, repeat(self.__status))
+        # visible validators, queried in batches
+        validators: dict[str, AttributeDict] = get_validators(pubkeys)
 
-            responded = []
-            remaining = []
-            for pk, res in zip(self.__pubkeys, filtered):
-                if res:
-                    responded.append(pk)
-                else:
-                    remaining.append(pk)
+        filtered: list[bool] = []
+        for pk in pubkeys:
+            val: AttributeDict = validators.get(pk.lower())
+            filtered.append(
+                val is not None
+                and (not self.__balance or val.balance == self.__balance)
+                and (not self.__status or self.__status in val.status)
+            )
 
-            if len(responded) > 0:
-                fill_validators_table(responded)
+        responded: list[str] = []
+        remaining: list[tuple[str, int, int]] = []
+        for (pk, attempts), res in zip(due, filtered):
+            if res:
+                responded.append(pk)
+            else:
+                remaining.append((pk, attempts + 1, self.__next_check(now, attempts + 1)))
 
-            if len(remaining) > 0:
-                self.__pubkeys = remaining
+        if responded:
+            fill_validators_table(responded)
+            remove_expected_pubkeys(self.__queue, responded)
 
-        if not self.__keep_alive and daemon:
-            daemon.stop()
+        if remaining:
+            postpone_expected_pubkeys(self.__queue, remaining)
+
+        get_logger().info(
+            f"{len(responded)} of {len(due)} expected pubkeys responded on: {self.__queue}"
+        )
+
+    # pylint: disable-next=unused-argument
+    def process_deposits(self, daemon: TimeDaemon = None, *args, **kwargs) -> None:
+        """Checks if any of the due pubkeys are responding after the proposal deposit.
+        Processes the ones that respond and postpones the ones that don't.
+        Queues of all operators are processed, within their own namespace.
+
+        Args:
+            daemon (TimeDaemon): daemon to be stopped if the queue is empty
+        """
+        with self.__lock:
+            expected: int = 0
+            for operator_id in get_operator_ids():
+                with operator_scope(operator_id):
+                    self.__process_queue()
+                    expected += count_expected_pubkeys(self.__queue)
+
+            if not self.__keep_alive and daemon and expected == 0:
+                daemon.stop()
@@ -1,65 +1,138 @@
 # -*- coding: utf-8 -*-
 
-from geodefi.classes import Validator
+from time import time
 from geodefi.globals import VALIDATOR_STATE
 
 from src.classes import Trigger
+from src.common import AttributeDict
 from src.daemons import TimeDaemon
-from src.database.validators import save_portal_state, save_local_state, fetch_pool_id
-from src.globals import get_logger, get_sdk
+from src.actions.portal import call_finalizeExit
+from src.database.validators import save_portal_state, save_local_state
+from src.database.exits import (
+    fetch_next_exit_epoch,
+    fetch_due_exits,
+    remove_exit_deadlines,
+    import_exit_requested_validators,
+)
+from src.database.transactions import fetch_pending_pubkeys
+from src.globals import get_logger, get_operator_ids, get_lease, get_clock
+from src.helpers.validator import get_current_epoch
+from src.helpers.beacon import get_validators
+from src.utils.operator import operator_scope
 
 
 # TODO: (later) Stop and throw error after x attempts: This should be fault tolerant.
 class FinalizeExitTrigger(Trigger):
-    """Trigger for the FINALIZE_EXIT. This time trigger is used to finalize the exit of a validator.
-    It is triggered after the initial delay is passed. Initial delay is set according to exit epoch.
-    It stops the daemon after the exit is finalized.
+    """Trigger for the FINALIZE_EXIT. This time trigger is used to finalize the exit of validators.
+    Exit deadlines are kept in the ExitDeadlines table, indexed by the exit epoch.
+    A single daemon sleeps until the start of the earliest epoch that an exit is due on,
+    and finalizes all of the validators that are due in one go.
+    Validators that are still exiting are checked again on every epoch.
 
     Attributes:
         name (str): The name of the trigger to be used when logging etc. (value: FINALIZE_EXIT)
-        pubkey (str): The public key of the validator to finalize the exit
     """
 
     name: str = "FINALIZE_EXIT"
 
-    def __init__(self, pubkey: str) -> None:
+    def __init__(self) -> None:
         """Initializes a FinalizeExitTrigger object.
         The trigger will process the changes of the daemon after a loop.
         It is a callable object. It is used to process the changes of the daemon.
         It can only have 1 action.
+        """
+
+        Trigger.__init__(self, name=self.name, action=self.finalize_exits)
+
+        # validators that requested an exit before the deadlines were recorded
+        for operator_id in get_operator_ids():
+            with operator_scope(operator_id):
+                import_exit_requested_validators()
+
+        get_logger().debug(f"{self.name} is initated.")
+
+    def __finalize_due_exits(self, current_epoch: int) -> None:
+        """Finalizes the exits of the current operator's validators that are due.
 
         Args:
-            pubkey (str): The public key of the validator to finalize the exit
+            current_epoch (int): current epoch of the beacon chain
         """
+        # exits that are being finalized are not sent again
+        pending: set[str] = fetch_pending_pubkeys("finalizeExit")
+        due: list[tuple[str, str]] = [
+            (pubkey, pool_id)
+            for pubkey, pool_id in fetch_due_exits(current_epoch)
+            if pubkey not in pending
+        ]
+        # beacon statuses of all due validators, queried in batches
+        validators: dict[str, AttributeDict] = get_validators([pubkey for pubkey, _ in due])
+
+        finalized: list[str] = []
+        try:
+            for pubkey, pool_id in due:
+                # Check if the validator is in the exit state on the beacon chain
+                val: AttributeDict = validators.get(pubkey.lower())
+                if val is None or val.status == "active_exiting":
+                    # TODO: (later) reminder: these statuses what to do when
+                    # TODO: (later)  if it is too late from, after the initial delay is passed
+                    #       check current epoch and compare with the exit epoch
+                    #       Too late => 1 week send mail to operator and us no raise here
+                    continue
 
-        Trigger.__init__(self, name=self.name, action=self.finalize_exit)
-        self.pubkey: str = pubkey
-        get_logger().debug(f"{self.name} is initated for pubkey: {pubkey}")
+                call_finalizeExit(int(pool_id), pubkey)
+
+                # set db portal and local status to EXITED for validator
+                save_portal_state(pubkey, VALIDATOR_STATE.EXITED)
+                save_local_state(pubkey, VALIDATOR_STATE.EXITED)
+                finalized.append(pubkey)
+        finally:
+            if finalized:
+                # no need to check them anymore, even if a later one fails
+                remove_exit_deadlines(finalized)
+                get_logger().info(f"Finalized the exit of {len(finalized)} validators.")
+
+    def __next_epochs(self) -> dict[int, int]:
+        """Returns the earliest epoch that an exit is due on, for every operator that has any.
+
+        Returns:
+            dict[int, int]: due epochs, by operator ID
+        """
+        next_epochs: dict[int, int] = {}
+        for operator_id in get_operator_ids():
+            with operator_scope(operator_id):
+                next_epoch: int = fetch_next_exit_epoch()
+                if next_epoch is not None:
+                    next_epochs[operator_id] = next_epoch
+        return next_epochs
 
     # pylint: disable-next=unused-argument
-    def finalize_exit(self, daemon: TimeDaemon, *args, **kwargs) -> None:
-        """Finalizes the exit of the validator. Stops the daemon after the exit is finalized.
-        Updates the database by setting the portal and local status to EXITED for the validator.
+    def finalize_exits(self, daemon: TimeDaemon = None, *args, **kwargs) -> None:
+        """Finalizes the exits of the validators that have reached their exit epoch.
+        Updates the database by setting the portal and local status to EXITED for the validators.
+        Validators that are still exiting on the beacon chain are kept for the next epoch.
+        Then, the daemon sleeps until the next deadline, if it is not due yet.
+        Deadlines of all operators are checked, within their own namespace.
 
         Args:
             daemon (TimeDaemon): The daemon that triggers the action
         """
-
-        # Check if the validator is in the exit state on the beacon chain
-        val: Validator = get_sdk().portal.validator(self.pubkey)
-        if val.beacon_status == "active_exiting":
-            # TODO: (later) reminder: these statuses what to do when
-            # TODO: (later)  if it is too late from, after the initial delay is passed
-            #       check current epoch and compare with the exit epoch
-            #       Too late => 1 week send mail to operator and us no raise here
+        if not get_lease().is_leader():
+            # deadlines are kept, until this instance takes over the lease
             return
 
-        pool_id: int = int(fetch_pool_id(self.pubkey))
-        get_sdk().portal.finalizeExit(pool_id, self.pubkey)
+        next_epochs: dict[int, int] = self.__next_epochs()
+        if not next_epochs:
+            return
 
-        # set db portal and local status to EXITED for validator
-        save_portal_state(self.pubkey, VALIDATOR_STATE.EXITED)
-        save_local_state(self.pubkey, VALIDATOR_STATE.EXITED)
+        current_epoch: int = get_current_epoch()
+        for operator_id, next_epoch in next_epochs.items():
+            if current_epoch >= next_epoch:
+                with operator_scope(operator_id):
+                    self.__finalize_due_exits(current_epoch)
 
-        # stop the daemon since the validator is exited now and there is no need to check it anymore
-        daemon.stop()
+        # exit queue only grows, so the later deadlines are never earlier than the known ones
+        next_epochs = self.__next_epochs()
+        if daemon is not None and next_epochs and min(next_epochs.values()) > current_epoch:
+            next_epoch: int = min(next_epochs.values())
+            get_logger().debug(f"Next exit deadline is epoch {next_epoch}, now: {current_epoch}")
+            daemon.schedule(get_clock().epoch_start(next_epoch) - time())
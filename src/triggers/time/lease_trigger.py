@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+
+import atexit
+from time import monotonic, time
+from threading import Thread
+
+from src.classes import PRIORITY, Trigger, Lease
+from src.daemons import TimeDaemon
+from src.exceptions import DatabaseError, EmailError
+from src.database.lease import claim_lease, release_lease
+from src.database.events import fetch_delegated_pools
+from src.database.validators import fetch_verified_pks
+from src.globals import get_logger, get_lease, get_operator_ids
+from src.helpers.validator import check_and_propose, check_and_stake
+from src.utils.notify import send_email
+from src.utils.operator import operator_scope
+
+
+class LeaseTrigger(Trigger):
+    """Trigger for the LEASE. A time trigger that claims the lease on every heartbeat,
+    for active/passive high availability. Standby instances keep ingesting the events,
+    but do not submit transactions until they take over the lease.
+
+    Heartbeats are 3 times more frequent than the lease duration. When the leader stops,
+    a standby takes over within a duration and a heartbeat, which is set to 1 slot by default.
+    After a takeover, the work that is skipped while on standby is caught up.
+
+    Attributes:
+        name (str): The name of the trigger to be used when logging etc. (value: LEASE)
+        priority (PRIORITY): CRITICAL, transactions depend on the lease.
+        __lease (Lease): leadership of this instance.
+    """
+
+    name: str = "LEASE"
+    priority: PRIORITY = PRIORITY.CRITICAL
+
+    def __init__(self) -> None:
+        """Initializes a LeaseTrigger object.
+        The trigger will process the changes of the daemon after a loop.
+        It is a callable object. It is used to process the changes of the daemon.
+        It can only have 1 action.
+        """
+
+        Trigger.__init__(self, name=self.name, action=self.heartbeat)
+        self.__lease: Lease = get_lease()
+        # let standby take over immediately, when exiting
+        atexit.register(release_lease, self.__lease.holder)
+        get_logger().debug(f"{self.name} is initated for: {self.__lease.holder}.")
+
+    @property
+    def heartbeat_interval(self) -> int:
+        """Returns the seconds between 2 heartbeats, as a property
+
+        Returns:
+            int: seconds between 2 heartbeats
+        """
+        return max(1, int(self.__lease.duration // 3))
+
+    # pylint: disable-next=unused-argument
+    def heartbeat(self, daemon: TimeDaemon = None, *args, **kwargs) -> None:
+        """Claims the lease, renewing it if already held. Switches between leader and standby.
+
+        Args:
+            daemon (TimeDaemon): The daemon that triggers the action
+        """
+        previous: int = self.__lease.token
+
+        claimed_at: float = monotonic()
+        try:
+            token: int = claim_lease(self.__lease.holder, time(), self.__lease.duration)
+        except DatabaseError:
+            # shared database might be busy, can not be sure about the leadership
+            get_logger().warning("Could not reach the lease, will try again on next heartbeat.")
+            token: int = None
+
+        if token is None:
+            self.__lease.revoke()
+            if previous is not None:
+                get_logger().critical("Lost the lease, switching to standby.")
+            return
+
+        self.__lease.update(token, claimed_at)
+        if token != previous:
+            get_logger().warning(f"Took over the lease with fencing token: {token}.")
+            Thread(name=f"{self.name}_CATCH_UP", target=self.__catch_up, daemon=True).start()
+
+    def __catch_up(self) -> None:
+        """Runs the work that might be skipped while on standby, for all operators:
+        stakes the verified validators, then proposes for the delegated pools.
+        """
+        try:
+            for operator_id in get_operator_ids():
+                with operator_scope(operator_id):
+                    check_and_stake(fetch_verified_pks())
+                    for pool_id in fetch_delegated_pools(operator_id):
+                        check_and_propose(pool_id)
+        except Exception as e:
+            get_logger().exception("Could not catch up after taking over the lease.")
+            try:
+                send_email(
+                    "Could not catch up after a takeover",
+                    f"Geonius took over the lease, but failed to catch up with: {e}."
+                    " Will continue operations as usual, but an investigation is suggested.",
+                    dont_notify_devs=True,
+                )
+            except EmailError:
+                get_logger().warning(
+                    "Not able to communicate with the owners. Continuing without an assistance."
+                )
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+
+from src.classes import Trigger
+from src.daemons import TimeDaemon
+from src.globals import get_logger, get_operator_ids, get_lease
+from src.helpers.validator import flush_proposals, flush_stakes
+from src.utils.operator import operator_scope
+
+
+class ProposalQueueTrigger(Trigger):
+    """Trigger for the PROPOSAL_QUEUE. A time trigger that sends the queued proposals and stakes,
+    when the oldest of them has waited for strategy.max_proposal_delay, even if there is not
+    enough of them to reach strategy.min_proposal_queue.
+    Queues are filled by the event triggers, and kept on the ProposalQueue table over restarts.
+
+    Attributes:
+        name (str): The name of the trigger to be used when logging etc. (value: PROPOSAL_QUEUE)
+    """
+
+    name: str = "PROPOSAL_QUEUE"
+
+    def __init__(self) -> None:
+        """Initializes a ProposalQueueTrigger object.
+        The trigger will process the changes of the daemon after a loop.
+        It is a callable object. It is used to process the changes of the daemon.
+        It can only have 1 action.
+        """
+
+        Trigger.__init__(self, name=self.name, action=self.flush_queues)
+        get_logger().debug(f"{self.name} is initated.")
+
+    # pylint: disable-next=unused-argument
+    def flush_queues(self, daemon: TimeDaemon = None, *args, **kwargs) -> None:
+        """Sends the queued proposals and stakes of all operators that are due.
+
+        Args:
+            daemon (TimeDaemon): The daemon that triggers the action
+        """
+        if not get_lease().is_leader():
+            # queues are kept, until this instance takes over the lease
+            return
+
+        for operator_id in get_operator_ids():
+            with operator_scope(operator_id):
+                flush_stakes()
+                flush_proposals()
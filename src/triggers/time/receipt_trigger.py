@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+
+from time import time
+from typing import Any
+from web3.exceptions import TransactionNotFound
+
+from src.classes import PRIORITY, Trigger, NonceManager
+from src.daemons import TimeDaemon
+from src.exceptions import HighGasError, StandbyError, CallFailedError
+from src.actions.portal import call_replacement
+from src.database.transactions import (
+    MINED,
+    REVERTED,
+    DROPPED,
+    fetch_pending_transactions,
+    save_transaction_status,
+)
+from src.globals import get_sdk, get_logger, get_operator_ids, get_lease, get_nonce_manager
+from src.utils.gas import bump_fees
+from src.utils.notify import send_email
+from src.utils.operator import operator_scope
+from src.utils.thread import multithread
+
+
+def get_receipt(tx_hash: str) -> Any:
+    """Returns the receipt of the given transaction.
+
+    Args:
+        tx_hash (str): hash of the transaction
+
+    Returns:
+        Any: receipt of the transaction, None if it is not mined yet.
+    """
+    try:
+        return get_sdk().w3.eth.get_transaction_receipt(tx_hash)
+    except TransactionNotFound:
+        return None
+
+
+class ReceiptTrigger(Trigger):
+    """Trigger for the RECEIPTS. A time trigger that watches the transactions that are submitted,
+    until they are mined, reverted or dropped. Pending transactions are kept on the
+    Transactions table, so the triggers do not send them again.
+
+    Receipts of all pending transactions are polled together on every block.
+    Transactions that are not mined for a while are sped up by a replacement with the
+    same nonce and higher fees. Transactions that lost their nonce to another one are dropped.
+    Stuck transactions that are not known by the node anymore are dropped too, so their
+    pubkeys can be sent again, and their nonce is given to the next transaction.
+
+    Attributes:
+        name (str): The name of the trigger to be used when logging etc. (value: RECEIPTS)
+        priority (PRIORITY): CRITICAL, other transactions wait for the pending ones.
+        __stuck_after (int): seconds to wait before speeding up a transaction.
+    """
+
+    name: str = "RECEIPTS"
+    priority: PRIORITY = PRIORITY.CRITICAL
+
+    def __init__(self, stuck_after: int) -> None:
+        """Initializes a ReceiptTrigger object.
+        The trigger will process the changes of the daemon after a loop.
+        It is a callable object. It is used to process the changes of the daemon.
+        It can only have 1 action.
+
+        Args:
+            stuck_after (int): seconds to wait before speeding up a transaction.
+        """
+
+        Trigger.__init__(self, name=self.name, action=self.watch_receipts)
+        self.__stuck_after: int = stuck_after
+        get_logger().debug(f"{self.name} is initated.")
+
+    def __speed_up(self, tx_hash: str, sender: str, nonce: int) -> bool:
+        """Replaces a stuck transaction with the same one, and higher fees.
+        Replacement is fenced and tracked like the other transactions, see call_replacement.
+
+        Args:
+            tx_hash (str): hash of the stuck transaction
+            sender (str): address that signed the transaction
+            nonce (int): nonce of the transaction
+
+        Returns:
+            bool: False if the transaction is not known by the node, True otherwise.
+        """
+        try:
+            tx: Any = get_sdk().w3.eth.get_transaction(tx_hash)
+        except TransactionNotFound:
+            get_logger().warning(f"Stuck transaction is not known by the node: {tx_hash}")
+            return False
+
+        try:
+            priority_fee, max_fee = bump_fees(
+                tx.get("maxPriorityFeePerGas", tx.get("gasPrice")),
+                tx.get("maxFeePerGas", tx.get("gasPrice")),
+            )
+        except HighGasError:
+            # limits are checked on bump_fees, will try again on the next block
+            return True
+
+        try:
+            new_hash: str = call_replacement(tx_hash, tx, sender, nonce, priority_fee, max_fee)
+        except StandbyError as e:
+            get_logger().warning(f"Not speeding up the stuck transaction {tx_hash}: {e}")
+            return True
+        except CallFailedError as e:
+            # will try again on the next block, or it is mined or dropped meanwhile
+            get_logger().error(f"Could not speed up the stuck transaction {tx_hash}: {e}")
+            return True
+
+        get_logger().warning(f"Sped up the stuck transaction {tx_hash} with {new_hash}")
+        return True
+
+    def __drop(self, pending: list[tuple[str, str, str, int, int, str]], sender: str, nonce: int):
+        """Drops the pending transactions with the given nonce, including the replaced ones,
+        since none of them are known by the node. The nonce is given to the next transaction.
+
+        Args:
+            pending (list[tuple[str, str, str, int, int, str]]): pending transactions
+            sender (str): address that signed the transactions
+            nonce (int): nonce of the transactions
+        """
+        for tx_hash, function, tx_sender, tx_nonce, _, _ in pending:
+            if tx_sender == sender and tx_nonce == nonce:
+                save_transaction_status(tx_hash, DROPPED)
+                get_logger().warning(f"{function} transaction is dropped by the node: {tx_hash}")
+
+        nonces: NonceManager = get_nonce_manager()
+        if nonces:
+            nonces.release(sender, nonce)
+
+    def __watch(self) -> None:
+        """Watches the pending transactions of the current operator."""
+        pending: list[tuple[str, str, str, int, int, str]] = fetch_pending_transactions()
+        if not pending:
+            return
+
+        receipts: list[Any] = multithread(get_receipt, [tx[0] for tx in pending])
+
+        # number of mined transactions of every sender
+        counts: dict[str, int] = {}
+        nonces: NonceManager = get_nonce_manager()
+        for (tx_hash, function, sender, nonce, submitted, replaced_by), receipt in zip(
+            pending, receipts
+        ):
+            if receipt is not None:
+                if receipt["status"] == 1:
+                    save_transaction_status(tx_hash, MINED, receipt["blockNumber"])
+                    get_logger().info(f"{function} transaction is mined: {tx_hash}")
+                else:
+                    save_transaction_status(tx_hash, REVERTED, receipt["blockNumber"])
+                    send_email(
+                        f"{function} transaction is reverted",
+                        f"Here is the transaction hash:\n{tx_hash}",
+                        dont_notify_devs=True,
+                    )
+                if nonces and nonce is not None:
+                    nonces.settle(sender, nonce)
+                continue
+
+            if nonce is None:
+                continue
+
+            if sender not in counts:
+                counts[sender] = get_sdk().w3.eth.get_transaction_count(sender, "latest")
+            if nonce < counts[sender]:
+                # another transaction with the same nonce is mined, such as its replacement
+                save_transaction_status(tx_hash, DROPPED)
+                get_logger().info(f"{function} transaction is dropped: {tx_hash}")
+                if nonces:
+                    nonces.settle(sender, nonce)
+                continue
+
+            # only the latest replacement is sped up, and only by the leader
+            if replaced_by is None and time() - submitted > self.__stuck_after:
+                if get_lease().is_leader() and not self.__speed_up(tx_hash, sender, nonce):
+                    self.__drop(pending, sender, nonce)
+
+    # pylint: disable-next=unused-argument
+    def watch_receipts(self, daemon: TimeDaemon = None, *args, **kwargs) -> None:
+        """Watches the pending transactions of all operators, within their own namespace.
+
+        Args:
+            daemon (TimeDaemon): The daemon that triggers the action
+        """
+        for operator_id in get_operator_ids():
+            with operator_scope(operator_id):
+                self.__watch()
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+
+from src.classes import Trigger
+from src.daemons import TimeDaemon
+from src.exceptions import EthdoError
+from src.globals import get_logger, get_operator_ids, get_lease
+from src.helpers.reservoir import fill_reservoir
+from src.utils.notify import send_email
+from src.utils.operator import operator_scope
+
+
+class ReservoirTrigger(Trigger):
+    """Trigger for the RESERVOIR. A time trigger that generates the deposit data for the upcoming
+    validators, up to strategy.reservoir_depth, before the pools can be proposed for.
+    So, proposals only read the deposit data from the Reservoir table, instead of waiting for ethdo.
+
+    Attributes:
+        name (str): The name of the trigger to be used when logging etc. (value: RESERVOIR)
+    """
+
+    name: str = "RESERVOIR"
+
+    def __init__(self) -> None:
+        """Initializes a ReservoirTrigger object.
+        The trigger will process the changes of the daemon after a loop.
+        It is a callable object. It is used to process the changes of the daemon.
+        It can only have 1 action.
+        """
+
+        Trigger.__init__(self, name=self.name, action=self.fill)
+        get_logger().debug(f"{self.name} is initated.")
+
+    # pylint: disable-next=unused-argument
+    def fill(self, daemon: TimeDaemon = None, *args, **kwargs) -> None:
+        """Fills the reservoir of all operators.
+
+        Args:
+            daemon (TimeDaemon): The daemon that triggers the action
+        """
+        if not get_lease().is_leader():
+            # accounts are only created by the leader, to avoid the name clashes
+            return
+
+        for operator_id in get_operator_ids():
+            with operator_scope(operator_id):
+                try:
+                    fill_reservoir()
+                except EthdoError as e:
+                    send_email("Ethdo failed", str(e), dont_notify_devs=True)
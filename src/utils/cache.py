@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+
+from typing import Any, Callable, Union
+from functools import wraps
+
+from src.classes.block_cache import BlockCache
+from src.exceptions import DatabaseError
+from src.database.metadata import fetch_metadata, save_metadata
+from src.globals import get_block_cache, get_operator_id, get_logger
+
+
+def cached_block() -> Union[int, str]:
+    """Returns the block that the calls of the block_cached functions should be made on.
+    So, the values are read on the head of the cache that they are kept for.
+
+    Returns:
+        Union[int, str]: head of the cache, latest if the call is not cached.
+    """
+    cache: BlockCache = get_block_cache()
+    return cache.block if cache else "latest"
+
+
+def block_cached(contract: str, scoped: bool = False) -> Callable:
+    """Caches the results of a read-only contract call on the current block.
+    Calls are keyed by the contract, the function name and the arguments.
+    Decorated functions should make their calls on the cached_block().
+
+    Args:
+        contract (str): name of the contract that is called.
+        scoped (bool, optional): the call depends on the current operator,\
+            which is added to the key. Defaults to False.
+
+    Returns:
+        Callable: decorator for the helper function
+    """
+
+    def decorator(func: Callable) -> Callable:
+
+        @wraps(func)
+        def wrapper(*args, **kwargs) -> Any:
+            cache: BlockCache = get_block_cache()
+            if cache is None:
+                return func(*args, **kwargs)
+
+            key: tuple = (
+                contract,
+                func.__name__,
+                args,
+                tuple(sorted(kwargs.items())),
+                get_operator_id() if scoped else None,
+            )
+            return cache.get(key, lambda: func(*args, **kwargs))
+
+        return wrapper
+
+    return decorator
+
+
+__IMMUTABLES: dict[tuple[str, str], Any] = {}
+
+
+def immutable(field: str) -> Callable:
+    """Memoizes the result of a contract call that never changes once it is set, such as a name.
+    Results are kept in memory and on the Metadata table, keyed by the first argument as ID.
+    Empty results are not kept, since they might be set later.
+
+    Args:
+        field (str): name of the field that is read.
+
+    Returns:
+        Callable: decorator for the helper function
+    """
+
+    def decorator(func: Callable) -> Callable:
+
+        @wraps(func)
+        def wrapper(_id: Any) -> Any:
+            key: tuple[str, str] = (str(_id), field)
+            if key in __IMMUTABLES:
+                return __IMMUTABLES[key]
+
+            try:
+                known: dict[str, Any] = fetch_metadata(_id)
+            except DatabaseError:
+                # table might not be created yet, such as when the commands are used.
+                known: dict[str, Any] = {}
+
+            if field in known:
+                value: Any = known[field]
+            else:
+                value: Any = func(_id)
+                if value in (None, "", b""):
+                    return value
+                try:
+                    save_metadata(_id, {field: value})
+                except DatabaseError:
+                    get_logger().debug(f"Could not save {field} of {_id} to the Metadata.")
+
+            __IMMUTABLES[key] = value
+            return value
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+
+from os import getenv
+from hashlib import scrypt
+from functools import lru_cache
+from Crypto.Cipher import AES
+from Crypto.Random import get_random_bytes
+
+from src.exceptions import EthdoError
+from src.globals import get_operator_id
+from src.database.metadata import fetch_metadata, save_metadata
+
+# field of the operator on Metadata, random salt of the key that seals its data
+SALT: str = "salt"
+
+# key is derived once per passphrase and salt, sealed data is nonce + tag + ciphertext
+__SALT_SIZE: int = 16
+__NONCE_SIZE: int = 12
+__TAG_SIZE: int = 16
+
+
+def __salt() -> bytes:
+    """Returns the salt of the current operator, generated randomly on the first use.
+    It is kept on the Metadata table, so every installation derives a different key.
+
+    Returns:
+        bytes: salt
+    """
+    operator_id: int = get_operator_id()
+    salt: bytes = fetch_metadata(operator_id).get(SALT)
+    if salt is None:
+        # ignored if another thread saved it first, so the salt is read back
+        save_metadata(operator_id, {SALT: get_random_bytes(__SALT_SIZE)})
+        salt = fetch_metadata(operator_id)[SALT]
+    return bytes(salt)
+
+
+@lru_cache(maxsize=4)
+def __derive_key(passphrase: str, salt: bytes) -> bytes:
+    """Derives a key from the given passphrase with scrypt, cached since it is slow on purpose."""
+    return scrypt(passphrase.encode(), salt=salt, n=2**14, r=8, p=1, dklen=32)
+
+
+def __key() -> bytes:
+    """Returns the key that is used to encrypt the data at rest.
+    It is derived from the passphrase of the ethdo accounts, so only the ones
+    that can sign with the accounts can read the data. Salt is kept with the data, see __salt.
+
+    Returns:
+        bytes: 256 bit key
+
+    Raises:
+        EthdoError: Raised if the ethdo account passphrase is not provided.
+    """
+    passphrase: str = getenv("ETHDO_ACCOUNT_PASSPHRASE")
+    if not passphrase:
+        raise EthdoError("ETHDO_ACCOUNT_PASSPHRASE is required to encrypt the deposit data")
+    return __derive_key(passphrase, __salt())
+
+
+def encrypt(data: bytes) -> bytes:
+    """Encrypts the given data with AES-GCM.
+
+    Args:
+        data (bytes): plain data
+
+    Returns:
+        bytes: sealed data, as nonce + tag + ciphertext
+    """
+    nonce: bytes = get_random_bytes(__NONCE_SIZE)
+    cipher = AES.new(__key(), AES.MODE_GCM, nonce=nonce, mac_len=__TAG_SIZE)
+    ciphertext, tag = cipher.encrypt_and_digest(data)
+    return nonce + tag + ciphertext
+
+
+def decrypt(sealed: bytes) -> bytes:
+    """Decrypts the data that is sealed by encrypt.
+
+    Args:
+        sealed (bytes): sealed data, as nonce + tag + ciphertext
+
+    Returns:
+        bytes: plain data
+
+    Raises:
+        ValueError: Raised if the data is modified, or sealed with another key.
+    """
+    nonce: bytes = sealed[:__NONCE_SIZE]
+    tag: bytes = sealed[__NONCE_SIZE : __NONCE_SIZE + __TAG_SIZE]
+    cipher = AES.new(__key(), AES.MODE_GCM, nonce=nonce, mac_len=__TAG_SIZE)
+    return cipher.decrypt_and_verify(sealed[__NONCE_SIZE + __TAG_SIZE :], tag)
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+
+from hashlib import sha256
+from py_ecc.bls import G2ProofOfPossession as bls
+
+# deposits are signed on the genesis fork of every network, with an empty validators root
+DOMAIN_DEPOSIT: bytes = bytes.fromhex("03000000")
+ZERO_HASH: bytes = b"\x00" * 32
+
+# written into the deposit data, same as ethdo does
+NETWORK_NAMES: dict[str, str] = {
+    "00000000": "mainnet",
+    "01017000": "holesky",
+    "00000064": "gnosis",
+}
+DEPOSIT_CLI_VERSION: str = "2.7.0"
+
+# This module is imported by the signing subprocesses, keep it free of the geonius globals.
+
+
+def __hash(a: bytes, b: bytes) -> bytes:
+    return sha256(a + b).digest()
+
+
+def __pack(data: bytes) -> bytes:
+    """Returns the hash tree root of a fixed size byte vector, such as a pubkey or a signature.
+
+    Args:
+        data (bytes): vector of 32, 48 or 96 bytes
+
+    Returns:
+        bytes: root of the vector
+    """
+    chunks: list[bytes] = [data[i : i + 32].ljust(32, b"\x00") for i in range(0, len(data), 32)]
+    while len(chunks) & (len(chunks) - 1):
+        chunks.append(ZERO_HASH)
+    while len(chunks) > 1:
+        chunks = [__hash(chunks[i], chunks[i + 1]) for i in range(0, len(chunks), 2)]
+    return chunks[0]
+
+
+def withdrawal_credentials(withdrawal_address: str) -> bytes:
+    """Returns the 0x01 withdrawal credentials of the given execution address.
+
+    Args:
+        withdrawal_address (str): withdrawal address of the pool
+
+    Returns:
+        bytes: withdrawal credentials
+    """
+    address: str = (
+        withdrawal_address[2:] if withdrawal_address.startswith("0x") else withdrawal_address
+    )
+    return b"\x01" + b"\x00" * 11 + bytes.fromhex(address)
+
+
+def deposit_message_root(pubkey: bytes, credentials: bytes, amount: int) -> bytes:
+    """Returns the hash tree root of the DepositMessage container.
+
+    Args:
+        pubkey (bytes): public key of the validator
+        credentials (bytes): withdrawal credentials
+        amount (int): deposit amount, as gwei
+
+    Returns:
+        bytes: root of the deposit message
+    """
+    return __hash(
+        __hash(__pack(pubkey), credentials),
+        __hash(amount.to_bytes(8, "little").ljust(32, b"\x00"), ZERO_HASH),
+    )
+
+
+def deposit_data_root(pubkey: bytes, credentials: bytes, amount: int, signature: bytes) -> bytes:
+    """Returns the hash tree root of the DepositData container.
+
+    Args:
+        pubkey (bytes): public key of the validator
+        credentials (bytes): withdrawal credentials
+        amount (int): deposit amount, as gwei
+        signature (bytes): signature of the deposit message
+
+    Returns:
+        bytes: root of the deposit data
+    """
+    return __hash(
+        __hash(__pack(pubkey), credentials),
+        __hash(amount.to_bytes(8, "little").ljust(32, b"\x00"), __pack(signature)),
+    )
+
+
+def deposit_domain(fork_version: bytes) -> bytes:
+    """Returns the signature domain of the deposits for the given fork version.
+
+    Args:
+        fork_version (bytes): genesis fork version of the network
+
+    Returns:
+        bytes: signature domain
+    """
+    fork_data_root: bytes = __hash(fork_version.ljust(32, b"\x00"), ZERO_HASH)
+    return DOMAIN_DEPOSIT + fork_data_root[:28]
+
+
+def sign(secret: int, message: bytes) -> bytes:
+    """Signs the given message with the BLS secret key.
+
+    Args:
+        secret (int): secret key of the validator
+        message (bytes): signing root
+
+    Returns:
+        bytes: signature
+    """
+    return bls.Sign(secret, message)
+
+
+def build_deposit_data(
+    pubkey: bytes, credentials: bytes, amount: int, fork_version: bytes, signature: bytes
+) -> dict:
+    """Returns the deposit data in the format of the launchpad, as ethdo does with --launchpad.
+
+    Args:
+        pubkey (bytes): public key of the validator
+        credentials (bytes): withdrawal credentials
+        amount (int): deposit amount, as gwei
+        fork_version (bytes): genesis fork version of the network
+        signature (bytes): signature of the deposit message
+
+    Returns:
+        dict: deposit data, hex values without the 0x prefix
+    """
+    return {
+        "pubkey": pubkey.hex(),
+        "withdrawal_credentials": credentials.hex(),
+        "amount": amount,
+        "signature": signature.hex(),
+        "deposit_message_root": deposit_message_root(pubkey, credentials, amount).hex(),
+        "deposit_data_root": deposit_data_root(pubkey, credentials, amount, signature).hex(),
+        "fork_version": fork_version.hex(),
+        "eth2_network_name": NETWORK_NAMES.get(fork_version.hex(), "unknown"),
+        "deposit_cli_version": DEPOSIT_CLI_VERSION,
+    }
+
+
+def signing_root(message_root: bytes, fork_version: bytes) -> bytes:
+    """Returns the root that is signed for the given deposit message.
+
+    Args:
+        message_root (bytes): root of the deposit message
+        fork_version (bytes): genesis fork version of the network
+
+    Returns:
+        bytes: signing root
+    """
+    return __hash(message_root, deposit_domain(fork_version))
@@ -1,15 +1,25 @@
 # -*- coding: utf-8 -*-
-import struct
+
+from typing import Any
 from geodefi.utils import wrappers
 from geodefi import Geode
 
 from src.common import AttributeDict
-from src.exceptions import HighGasError, GasApiError
-from src.globals import get_sdk, get_config, get_logger
+from src.exceptions import HighGasError
+from src.globals import get_sdk, get_config, get_logger, get_operator_id
+from src.utils.cache import block_cached, cached_block
+from src.utils.operator import is_multi_operator
+from src.helpers.portal import get_maintainer
+
+# number of the latest blocks that the priority fee is estimated from
+FEE_HISTORY_BLOCKS: int = 10
+
+# percentile of the priority fees paid in every block, 50 is the median
+FEE_PERCENTILE: int = 50
 
 
-def __float_to_hexstring(f):
-    return hex(struct.unpack("<I", struct.pack("<f", f))[0])
+def __to_hexstring(wei: int) -> str:
+    return hex(int(wei))
 
 
 @wrappers.http_request
@@ -33,26 +43,147 @@ def parse_gas(gas) -> tuple[float]:
     return sdk.w3.to_wei(gas_priority, "gwei"), sdk.w3.to_wei(gas_base_fee, "gwei")
 
 
+def estimate_fees() -> tuple[int]:
+    """Estimates the fees from the eth_feeHistory of the latest blocks, without an external api.
+    Priority fee is the median of the given percentile of the rewards in every block,
+    max fee allows the base fee to double, as it can increase 12.5% on every block.
+    History is read until the cached block, so the fees are cached for the block they belong to.
+
+    Returns:
+        tuple[int]: priority fee and max fee in wei
+    """
+    history: dict[str, Any] = get_sdk().w3.eth.fee_history(
+        FEE_HISTORY_BLOCKS, cached_block(), [FEE_PERCENTILE]
+    )
+
+    rewards: list[int] = sorted(reward[0] for reward in history["reward"] if reward)
+    if rewards:
+        priority_fee: int = rewards[len(rewards) // 2]
+    else:
+        priority_fee: int = get_sdk().w3.eth.max_priority_fee
+
+    # the last base fee is of the next block
+    base_fee: int = history["baseFeePerGas"][-1]
+    return priority_fee, 2 * base_fee + priority_fee
+
+
+@block_cached("gas")
+def get_fees() -> tuple[int]:
+    """Returns the priority fee and the max fee for the transactions, cached for the current block.
+    Fees are estimated from the fee history, unless the gas api is configured to override them.
+    Gas api is not required, so the fee history is used when it does not respond.
+
+    Returns:
+        tuple[int]: priority fee and max fee in wei, None if they could not be estimated.
+    """
+    gas: AttributeDict = get_config().get("gas")
+    if gas and gas.get("api") and gas.get("parser"):
+        try:
+            return parse_gas(fetch_gas())
+        except Exception as e:
+            get_logger().warning(f"Gas api did not respond, using the fee history: {e}")
+
+    try:
+        return estimate_fees()
+    except Exception as e:
+        # leave it to web3, if the node does not support eth_feeHistory
+        get_logger().warning(f"Could not estimate the fees: {e}")
+        return (None, None)
+
+
+def __check_limits(priority_fee: int, max_fee: int) -> None:
+    """Checks the fees with the maximum limits, if configured.
+
+    Args:
+        priority_fee (int): priority fee in wei
+        max_fee (int): max fee in wei
+
+    Raises:
+        HighGasError: Gas prices are too high
+    """
+    gas: AttributeDict = get_config().get("gas")
+    if gas and gas.get("max_priority") and gas.get("max_fee"):
+        sdk: Geode = get_sdk()
+        if (priority_fee > sdk.w3.to_wei(gas.max_priority, "gwei")) or (
+            max_fee > sdk.w3.to_wei(gas.max_fee, "gwei")
+        ):
+            get_logger().critical(
+                f"Undesired GAS price => priority:{priority_fee}, fee:{max_fee}."
+                "Tx will not be submitted."
+            )
+            raise HighGasError("Gas prices are too high!")
+
+
 def get_gas() -> tuple[str]:
-    gas: AttributeDict = get_config().gas
-    if gas:
-        if gas.api and gas.parser and gas.max_priority and gas.max_fee:
-            priority_fee, base_fee = 0, 0
-            try:
-                priority_fee, base_fee = parse_gas(fetch_gas())
-            except Exception as e:
-                raise GasApiError("Gas api did not respond") from e
-
-            sdk: Geode = get_sdk()
-
-            if (priority_fee > sdk.w3.to_wei(gas.max_priority, "gwei")) or (
-                base_fee > sdk.w3.to_wei(gas.max_fee, "gwei")
-            ):
-                get_logger().critical(
-                    f"Undesired GAS price => priority:{priority_fee}, fee:{base_fee}."
-                    "Tx will not be submitted."
-                )
-                raise HighGasError("Gas prices are too high!")
-
-            return __float_to_hexstring(priority_fee), __float_to_hexstring(base_fee)
-    return (None, None)
+    """Returns the priority fee and the max fee for the transactions, as hex strings.
+    Checks the maximum limits, if configured.
+
+    Raises:
+        HighGasError: Gas prices are too high
+
+    Returns:
+        tuple[str]: priority fee and max fee, None if they could not be estimated.
+    """
+    priority_fee, max_fee = get_fees()
+    if priority_fee is None or max_fee is None:
+        return (None, None)
+
+    __check_limits(priority_fee, max_fee)
+    return __to_hexstring(priority_fee), __to_hexstring(max_fee)
+
+
+def bump_fees(priority_fee: int, max_fee: int) -> tuple[str]:
+    """Returns the fees for a replacement of a stuck transaction with the given fees.
+    Nodes require at least 10% higher fees for a replacement, they are bumped by 12.5%,
+    or to the current fees if they are higher.
+
+    Args:
+        priority_fee (int): priority fee of the stuck transaction in wei
+        max_fee (int): max fee of the stuck transaction in wei
+
+    Raises:
+        HighGasError: Gas prices are too high
+
+    Returns:
+        tuple[str]: priority fee and max fee, as hex strings
+    """
+    priority_fee, max_fee = priority_fee * 9 // 8 + 1, max_fee * 9 // 8 + 1
+
+    current_priority, current_max = get_fees()
+    if current_priority is not None and current_max is not None:
+        priority_fee, max_fee = max(priority_fee, current_priority), max(max_fee, current_max)
+
+    __check_limits(priority_fee, max_fee)
+    return __to_hexstring(priority_fee), __to_hexstring(max_fee)
+
+
+def get_sender() -> str:
+    """Returns the address that signs the transactions for the current operator.
+    On multi-operator mode, transactions are signed by the maintainer of the current operator.
+
+    Returns:
+        str: address of the signer
+    """
+    if is_multi_operator():
+        return get_maintainer(get_operator_id())
+    return get_sdk().w3.eth.default_account
+
+
+def tx_params() -> dict:
+    """Returns the transaction parameters for the current operator.
+    On multi-operator mode, transactions are signed by the maintainer of the current operator.
+
+    Returns:
+        dict: transaction parameters
+    """
+    params: dict = {}
+
+    priority_fee, max_fee = get_gas()
+    if priority_fee and max_fee:
+        params["maxPriorityFeePerGas"] = priority_fee
+        params["maxFeePerGas"] = max_fee
+
+    if is_multi_operator():
+        params["from"] = get_sender()
+
+    return params
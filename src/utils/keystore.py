@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+import hashlib
+import unicodedata
+from typing import Any
+from Crypto.Cipher import AES
+
+
+def __normalize(passphrase: str) -> bytes:
+    """Normalizes the passphrase as EIP-2335 describes, NFKD without the control codes."""
+    passphrase = unicodedata.normalize("NFKD", passphrase)
+    return "".join(c for c in passphrase if not (ord(c) < 0x20 or 0x7F <= ord(c) <= 0x9F)).encode()
+
+
+def __derive(kdf: dict[str, Any], passphrase: bytes) -> bytes:
+    """Derives the decryption key of the keystore.
+
+    Args:
+        kdf (dict[str, Any]): kdf module of the keystore
+        passphrase (bytes): normalized passphrase
+
+    Returns:
+        bytes: decryption key
+
+    Raises:
+        ValueError: Raised if the kdf is not supported.
+    """
+    params: dict[str, Any] = kdf["params"]
+    salt: bytes = bytes.fromhex(params["salt"])
+    if kdf["function"] == "scrypt":
+        return hashlib.scrypt(
+            passphrase,
+            salt=salt,
+            n=params["n"],
+            r=params["r"],
+            p=params["p"],
+            dklen=params["dklen"],
+            maxmem=256 * params["n"] * params["r"],
+        )
+    if kdf["function"] == "pbkdf2" and params.get("prf", "hmac-sha256") == "hmac-sha256":
+        return hashlib.pbkdf2_hmac("sha256", passphrase, salt, params["c"], params["dklen"])
+    raise ValueError(f"Unsupported kdf: {kdf['function']}")
+
+
+def decrypt_keystore(crypto: dict[str, Any], passphrase: str) -> int:
+    """Decrypts the secret key of an EIP-2335 keystore, such as the accounts of ethdo.
+
+    Args:
+        crypto (dict[str, Any]): crypto field of the keystore
+        passphrase (str): passphrase of the keystore
+
+    Returns:
+        int: secret key
+
+    Raises:
+        ValueError: Raised if the passphrase is wrong, or the keystore is not supported.
+    """
+    key: bytes = __derive(crypto["kdf"], __normalize(passphrase))
+    message: bytes = bytes.fromhex(crypto["cipher"]["message"])
+
+    if hashlib.sha256(key[16:32] + message).hexdigest() != crypto["checksum"]["message"]:
+        raise ValueError("Invalid passphrase for the keystore")
+    if crypto["cipher"]["function"] != "aes-128-ctr":
+        raise ValueError(f"Unsupported cipher: {crypto['cipher']['function']}")
+
+    iv: bytes = bytes.fromhex(crypto["cipher"]["params"]["iv"])
+    cipher = AES.new(key[:16], AES.MODE_CTR, initial_value=iv, nonce=b"")
+    return int.from_bytes(cipher.decrypt(message), "big")
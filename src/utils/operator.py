@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+from typing import Callable
+from functools import wraps
+from contextlib import contextmanager
+
+from src.globals import get_config, get_operator_id, get_operator_ids, set_operator_id
+
+
+def is_multi_operator() -> bool:
+    """Returns True if geonius is serving more than one operator.
+
+    Returns:
+        bool: True on multi-operator mode
+    """
+    return len(get_operator_ids()) > 1
+
+
+def operator_namespace(operator_id: int = None) -> str:
+    """Returns the name of the database that keeps the data of the given operator.
+    All operators share the same database on single operator mode.
+
+    Args:
+        operator_id (int, optional): ID of the operator. Defaults to the current operator.
+
+    Returns:
+        str: name of the database
+    """
+    if not is_multi_operator():
+        return "operator"
+    return f"operator_{get_operator_id() if operator_id is None else operator_id}"
+
+
+@contextmanager
+def operator_scope(operator_id: int):
+    """Serves the given operator within the context, on the current thread.
+    Helpers, actions and databases use this operator's ID, signer and namespace.
+
+    Args:
+        operator_id (int): ID of the operator to be served.
+    """
+    previous: int = get_operator_id()
+    set_operator_id(operator_id)
+    try:
+        yield
+    finally:
+        set_operator_id(previous)
+
+
+def bind_operator(func: Callable) -> Callable:
+    """Returns a function that serves the current operator, on any thread it is called.
+
+    Args:
+        func (Callable): function to be bound
+
+    Returns:
+        Callable: wrapped function
+    """
+    if not get_config() or not "operator_ids" in get_config():
+        return func
+
+    operator_id: int = get_operator_id()
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with operator_scope(operator_id):
+            return func(*args, **kwargs)
+
+    return wrapper
@@ -5,7 +5,9 @@ from multiprocessing.pool import ThreadPool
 from threading import current_thread
 from functools import wraps
 
-from src.globals import get_logger
+from src.classes.gate import PriorityGate, current_priority
+from src.globals import get_logger, get_gate
+from src.utils.operator import bind_operator
 
 
 def rename_worker(fn):
@@ -22,19 +24,32 @@ def rename_worker(fn):
 ThreadPool.Process = staticmethod(rename_worker(ThreadPool.Process))
 
 
-def multithread(func: Callable, *args, num_threads: int = None, chunk_size: int = 1) -> list[Any]:
+def multithread(
+    func: Callable, *args, num_threads: int = None, chunk_size: int = 1, gated: bool = True
+) -> list[Any]:
     """Turn function calls into multithread with help of iterables arguments and return the results.
+    If gated, every call waits for a slot on the shared gate, with the priority of the caller.
+    Calls made while already holding a slot are not gated again, to prevent deadlocks.
+    Calls serve the same operator with the caller.
 
     Args:
         func (Callable): function to be called
         *args: arguments to be passed to the function
         num_threads (int, optional): number of threads to be used. Defaults to None.
         chunk_size (int, optional): size of the chunk. Defaults to 1.
+        gated (bool, optional): use the shared budget of concurrent calls. Defaults to True.
 
     Returns:
         list[Any]: list of results from the function calls
     """
     get_logger().debug(f"Calling {func.__name__:^21} multithreaded.")
+
+    func = bind_operator(func)
+
+    gate: PriorityGate = get_gate()
+    if gated and gate and not gate.holding():
+        func = gate.wrap(func, current_priority())
+
     with ThreadPool(processes=num_threads) as pool:
         res: Any = pool.starmap(func, zip(*args), chunksize=chunk_size)
 
@@ -0,0 +1,127 @@
+import os
+import sys
+import stat
+import subprocess
+
+import pytest
+from geodefi.globals import Network, DEPOSIT_SIZE
+
+from src.classes import ProcessPool
+from src.common import AttributeDict
+from src.exceptions import EthdoError
+from src.globals import set_sdk, set_ethdo_pool
+from src.actions.ethdo import generate_deposit_data, load_accounts
+from src.database.accounts import create_accounts_table, fetch_accounts
+from src.database.reservoir import create_reservoir_table
+from src.helpers.reservoir import get_deposit_data_many
+
+# fake ethdo, that keeps the accounts as files and records how many of it run at the same time
+FAKE_ETHDO = """#!{python}
+import os, sys, json, time
+
+state = {state!r}
+args = dict(a.lstrip("-").split("=", 1) for a in sys.argv[3:] if "=" in a)
+marker = os.path.join(state, "running", str(os.getpid()))
+open(marker, "w").close()
+with open(os.path.join(state, "peaks"), "a") as f:
+    f.write(str(len(os.listdir(os.path.join(state, "running")))) + "\\n")
+try:
+    command = sys.argv[1:3]
+    with open(os.path.join(state, "calls"), "a") as f:
+        f.write(" ".join(sys.argv[1:3] + [a for a in sys.argv[3:] if "account" in a]) + "\\n")
+    if command == ["wallet", "accounts"]:
+        wallet = os.path.join(state, args["wallet"])
+        print("\\n".join(sorted(os.listdir(wallet)) if os.path.isdir(wallet) else []))
+    if command == ["account", "info"]:
+        sys.exit(0 if os.path.exists(os.path.join(state, args["validatoraccount"])) else 1)
+    if command == ["account", "create"]:
+        os.makedirs(os.path.join(state, os.path.dirname(args["account"])), exist_ok=True)
+        open(os.path.join(state, args["account"]), "w").close()
+    if command == ["validator", "depositdata"]:
+        time.sleep(float(os.environ.get("FAKE_ETHDO_DELAY", "0.1")))
+        account = args["validatoraccount"]
+        print(json.dumps([{{"pubkey": account, "signature": args["depositvalue"]}}]))
+finally:
+    os.remove(marker)
+"""
+
+
+@pytest.fixture
+def ethdo(config, tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    (tmp_path / "running").mkdir()
+    path = bin_dir / "ethdo"
+    path.write_text(FAKE_ETHDO.format(python=sys.executable, state=str(tmp_path)))
+    path.chmod(path.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+
+    config.ethdo = AttributeDict({"wallet": "geonius", "account_prefix": "Validator"})
+    set_sdk(AttributeDict({"network": Network.holesky}))
+    create_reservoir_table()
+    create_accounts_table()
+    load_accounts()
+    yield tmp_path
+    set_sdk(None)
+    set_ethdo_pool(None)
+
+
+def test_deposit_data_is_generated_concurrently_in_order(ethdo):
+    """
+    test if ethdo is called concurrently, but never more than the pool size, in order.
+    """
+    set_ethdo_pool(ProcessPool(size=3, timeout=10))
+
+    data = get_deposit_data_many("0x01", list(range(6)))
+
+    assert [proposal[0]["pubkey"] for proposal, _ in data] == [
+        f"geonius/Validator{i}" for i in range(6)
+    ]
+    assert [stake[0]["signature"] for _, stake in data] == [
+        str(DEPOSIT_SIZE.STAKE * 1_000_000_000)
+    ] * 6
+    assert sorted(os.listdir(ethdo / "geonius")) == sorted(f"Validator{i}" for i in range(6))
+
+    peaks = [int(line) for line in (ethdo / "peaks").read_text().split()]
+    assert 1 < max(peaks) <= 3
+
+
+def test_ethdo_is_killed_after_timeout(ethdo, monkeypatch):
+    """
+    test if the calls that take longer than the timeout are killed, and reported as ethdo errors.
+    """
+    set_ethdo_pool(ProcessPool(size=1, timeout=0.5))
+    monkeypatch.setenv("FAKE_ETHDO_DELAY", "5")
+
+    with pytest.raises(EthdoError) as e:
+        generate_deposit_data("0x01", 1_000_000_000, 0)
+    assert isinstance(e.value.__cause__, subprocess.TimeoutExpired)
+
+    with pytest.raises(EthdoError):
+        generate_deposit_data("0x01", 1_000_000_000, -1)
+
+
+def test_known_accounts_are_not_pinged(ethdo):
+    """
+    test if the accounts are listed once, and only the new accounts are pinged and created.
+    """
+    set_ethdo_pool(ProcessPool(size=2, timeout=10))
+    (ethdo / "geonius").mkdir()
+    for i in range(2):
+        (ethdo / "geonius" / f"Validator{i}").touch()
+    (ethdo / "calls").unlink()
+
+    assert load_accounts() == 2
+    assert fetch_accounts("geonius") == {"Validator0", "Validator1"}
+
+    for i in range(3):
+        generate_deposit_data("0x01", 1_000_000_000, i)
+    generate_deposit_data("0x01", 1_000_000_000, 2)
+
+    calls = (ethdo / "calls").read_text().splitlines()
+    assert [c for c in calls if not c.startswith("validator depositdata")] == [
+        "wallet accounts",
+        "account info --validatoraccount=geonius/Validator2",
+        "account create --account=geonius/Validator2",
+    ]
+    assert fetch_accounts("geonius") == {"Validator0", "Validator1", "Validator2"}
@@ -0,0 +1,19 @@
+from src.classes import BeaconClock
+
+
+def test_slots_and_epochs_are_local():
+    """
+    test if the slots and the epochs are calculated from the genesis and the spec.
+    """
+    clock = BeaconClock(genesis_time=1000, seconds_per_slot=12, slots_per_epoch=32)
+
+    assert clock.slot(now=900) == 0
+    assert clock.slot(now=1000 + 12 * 100 + 11) == 100
+    assert clock.epoch(now=1000 + 12 * 100) == 3
+    assert clock.epoch_start(3) == 1000 + 3 * 384
+    assert clock.seconds_per_epoch == 384
+
+    assert clock.head_lag(now=1000 + 12 * 100) is None
+    clock.observe_head(98)
+    clock.observe_head(97)
+    assert clock.head_lag(now=1000 + 12 * 100) == 2
@@ -0,0 +1,35 @@
+from src.classes import BlockCache
+
+
+def test_reads_are_cached_within_a_block(config):
+    """
+    test if a call is made once per block, on the head it is cached for,
+    and bypassed while the head is unknown.
+    """
+    cache = BlockCache()
+    calls = []
+
+    def read():
+        calls.append(cache.block)
+        return len(calls)
+
+    key = ("portal", "get_surplus", (1,))
+    assert cache.get(key, read) == 1
+    assert cache.get(key, read) == 2
+
+    cache.advance(100)
+    assert cache.get(key, read) == 3
+    assert cache.get(key, read) == 3
+
+    # older heads are ignored
+    cache.advance(99)
+    assert cache.get(key, read) == 3
+
+    cache.advance(101)
+    assert cache.get(key, read) == 4
+    assert cache.stats == {"head": 101, "size": 1, "hits": 2, "misses": 2, "evictions": 1}
+
+    cache.clear()
+    assert cache.get(key, read) == 5
+    assert calls == ["latest", "latest", 100, 101, 101]
+    assert cache.block == "latest"
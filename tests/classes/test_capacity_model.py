@@ -0,0 +1,87 @@
+from src.classes import CapacityModel
+from src.classes.capacity_model import SURPLUS_PER_VALIDATOR, WALLET_PER_VALIDATOR
+
+ETHER = 10**18
+
+
+def reconciled(block=100, allowance=10, surplus=100 * ETHER, wallet=10 * ETHER, pending=None):
+    model = CapacityModel()
+    model.reconcile(block, {(1, 7): allowance}, {7: surplus}, {1: wallet}, pending or set())
+    return model
+
+
+def capacity(model):
+    return model.allowance(1, 7), model.surplus(7), model.wallet(1)
+
+
+def test_events_update_the_capacity():
+    """
+    test if the events after the reconciled block are applied, and the earlier ones are ignored.
+    """
+    model = reconciled()
+    model.deposit(100, 7, 50 * ETHER)
+    model.deposit(101, 7, 50 * ETHER)
+    model.propose(102, 1, 7, ["0xa", "0xb"])
+    model.propose(102, 2, 7, ["0xc"])
+    model.stake(103, 1, 1)
+
+    assert capacity(model) == (
+        8,
+        150 * ETHER - 3 * SURPLUS_PER_VALIDATOR,
+        10 * ETHER - 2 * WALLET_PER_VALIDATOR + WALLET_PER_VALIDATOR,
+    )
+    assert model.allowance(2, 7) is None
+
+
+def test_submitted_proposals_are_applied_once():
+    """
+    test if the submitted proposals are not applied again with their event.
+    """
+    model = reconciled()
+    model.propose(None, 1, 7, ["0xa", "0xb"])
+    model.propose(None, 1, 7, ["0xa"])
+    assert model.allowance(1, 7) == 8
+
+    model.propose(101, 1, 7, ["0xa", "0xb", "0xc"])
+    assert model.allowance(1, 7) == 7
+
+
+def test_reconcile_keeps_the_later_events_and_pending_proposals():
+    """
+    test if a reconciliation applies the events after its block, and the pending proposals.
+    Proposals that are mined before its block are not applied twice.
+    """
+    model = reconciled()
+    model.deposit(105, 7, 10 * ETHER)
+    model.deposit(110, 7, 20 * ETHER)
+    model.propose(None, 1, 7, ["0xa", "0xb"])
+
+    model.reconcile(105, {(1, 7): 5}, {7: 100 * ETHER}, {1: 10 * ETHER}, {"0xa", "0xb"})
+    assert capacity(model) == (
+        3,
+        120 * ETHER - 2 * SURPLUS_PER_VALIDATOR,
+        10 * ETHER - 2 * WALLET_PER_VALIDATOR,
+    )
+
+    # mined before the reconciled block, already included
+    model.propose(104, 1, 7, ["0xa", "0xb"])
+    assert capacity(model) == (5, 120 * ETHER, 10 * ETHER)
+
+    # dropped proposals are not applied after the next reconciliation
+    model.propose(None, 1, 7, ["0xd"])
+    model.reconcile(111, {(1, 7): 5}, {7: 100 * ETHER}, {1: 10 * ETHER}, set())
+    assert capacity(model) == (5, 100 * ETHER, 10 * ETHER)
+
+
+def test_unknown_values_are_remembered_and_forgotten():
+    """
+    test if unknown values are kept once, and the forgotten values are unknown.
+    """
+    model = reconciled()
+    model.remember("allowance", (1, 7), 99)
+    model.remember("allowance", (1, 8), 3)
+    assert model.allowance(1, 7) == 10
+    assert model.allowance(1, 8) == 3
+
+    model.forget("allowance", (1, 7))
+    assert model.allowance(1, 7) is None
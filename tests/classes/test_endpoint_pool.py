@@ -0,0 +1,24 @@
+from src.classes import EndpointPool
+
+
+def test_healthiest_endpoint_is_preferred():
+    """
+    test if the faster endpoint is ranked first, and a failing one is ejected.
+    """
+    pool = EndpointPool(["a", "b", "c"], max_failures=2)
+    a, b, c = pool.endpoints
+
+    pool.record(a, 0.5, ok=True)
+    pool.record(b, 0.1, ok=True)
+    # unmeasured endpoints are tried first
+    assert pool.ranked() == [c, b, a]
+
+    # failures are penalized, but not ejected yet
+    pool.record(c, 0.05, ok=False)
+    assert pool.ranked() == [b, c, a]
+    pool.record(c, 0.05, ok=False)
+    assert pool.ranked() == [b, a, c]
+
+    # a successful response brings it back
+    pool.record(c, 0.05, ok=True)
+    assert pool.ranked() == [b, c, a]
@@ -0,0 +1,108 @@
+import json
+import time
+from threading import Thread, Event
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.classes import BeaconClock, BeaconEventStream, HeadTracker
+
+
+class EventsHandler(BaseHTTPRequestHandler):
+    """
+    minimal beacon node that streams head and finalized_checkpoint events.
+    the first connection is closed after 2 events, the next ones are kept open.
+    """
+
+    connections = []
+    done = Event()
+
+    def event(self, topic, data):
+        self.wfile.write(f"event: {topic}\ndata: {json.dumps(data)}\n\n".encode())
+        self.wfile.flush()
+
+    def do_GET(self):
+        type(self).connections.append(self.path)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        if len(self.connections) == 1:
+            self.wfile.write(b": keep-alive\n\n")
+            self.event("head", {"slot": "100", "block": "0x01"})
+            self.event("finalized_checkpoint", {"epoch": "3", "block": "0x02"})
+        else:
+            self.event("head", {"slot": "101", "block": "0x03"})
+            self.event("head", {"slot": "99", "block": "0x04"})
+            self.done.wait(5)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def beacon(config):
+    handler = type("Handler", (EventsHandler,), {"connections": [], "done": Event()})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    yield server, handler
+    handler.done.set()
+    server.shutdown()
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_stream_feeds_tracker_and_reconnects(beacon):
+    server, handler = beacon
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    tracker = HeadTracker()
+    clock = BeaconClock(genesis_time=0, seconds_per_slot=12, slots_per_epoch=32)
+    woken = []
+    tracker.subscribe(lambda: woken.append(tracker.slot))
+
+    stream = BeaconEventStream(lambda: [url], tracker, clock=clock, read_timeout=5)
+    stream.start()
+    try:
+        assert wait_until(lambda: tracker.slot == 101)
+        assert tracker.live
+        assert tracker.finalized_epoch == 3
+        assert clock.head_slot == 101
+        assert len(handler.connections) == 2
+        assert handler.connections[0] == "/eth/v1/events?topics=head%2Cfinalized_checkpoint"
+        # older heads do not wake the subscribers
+        assert 100 in woken and 101 in woken
+        assert woken.count(101) == 1
+    finally:
+        stream.stop()
+
+
+def test_tracker_is_not_live_without_stream(config):
+    tracker = HeadTracker()
+    woken = []
+    tracker.subscribe(lambda: woken.append(True))
+
+    stream = BeaconEventStream(lambda: ["http://127.0.0.1:9"], tracker, max_backoff=1)
+    stream.start()
+    try:
+        # the subscribers are woken when the stream is lost, to poll on their interval again
+        assert wait_until(lambda: len(woken) > 0)
+        assert not tracker.live
+        assert tracker.slot is None
+    finally:
+        stream.stop()
+
+
+def test_tracker_ignores_old_heads():
+    tracker = HeadTracker()
+    assert tracker.on_head(5)
+    assert not tracker.on_head(5)
+    assert not tracker.on_head(4)
+    assert tracker.on_finalized(1)
+    assert not tracker.on_finalized(0)
+    assert tracker.slot == 5 and tracker.finalized_epoch == 1
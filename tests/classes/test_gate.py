@@ -0,0 +1,42 @@
+from time import sleep
+from threading import Thread
+
+from src.classes import PRIORITY, PriorityGate
+
+
+def test_critical_work_is_served_first():
+    """
+    test if a critical work waiting for a slot is admitted before the background work queued earlier.
+    """
+    gate = PriorityGate(capacity=1)
+    order = []
+
+    def work(name, priority):
+        with gate.slot(priority):
+            order.append(name)
+
+    gate.acquire(PRIORITY.NORMAL)
+    background = Thread(target=work, args=("background", PRIORITY.BACKGROUND))
+    background.start()
+    while gate.waiting < 1:
+        sleep(0.01)
+    critical = Thread(target=work, args=("critical", PRIORITY.CRITICAL))
+    critical.start()
+    while gate.waiting < 2:
+        sleep(0.01)
+    gate.release()
+
+    background.join()
+    critical.join()
+    assert order == ["critical", "background"]
+
+
+def test_nested_calls_are_not_gated_again():
+    """
+    test if a thread holding a slot is reported, so nested work does not wait for itself.
+    """
+    gate = PriorityGate(capacity=1)
+    assert not gate.holding()
+    with gate.slot(PRIORITY.CRITICAL):
+        assert gate.holding()
+    assert not gate.holding()
@@ -0,0 +1,86 @@
+from time import sleep, monotonic
+
+from src.classes import EndpointPool, HedgePolicy, PooledHTTPProvider, PriorityGate, PRIORITY
+from src.classes.gate import current_priority, prioritized
+from src.globals import set_gate
+import src.classes.providers
+
+
+def test_hedges_are_budgeted():
+    """
+    test if the hedge delay is the p95 latency, and hedges are limited by the ratio.
+    """
+    policy = HedgePolicy(ratio=0.5, burst=1, min_samples=20)
+    assert policy.delay("eth_call") is None
+    for i in range(1, 21):
+        policy.observe("eth_call", i / 100)
+
+    assert policy.delay("eth_call") == 0.2
+    assert policy.allow("eth_call")
+    assert not policy.allow("eth_call")
+    # budgets are seperated by the method
+    assert not policy.allow("eth_getBlockByNumber")
+
+
+def test_slow_read_is_hedged(config, monkeypatch):
+    """
+    test if a read that is slower than its p95 is answered by the second endpoint,
+    even though the first endpoint succeeds later.
+    """
+    delays = {"a": 0.0, "b": 0.0}
+    answered = []
+
+    class FakeProvider:
+        def __init__(self, url):
+            self.url = url
+
+        def make_request(self, method, params):
+            sleep(delays[self.url])
+            answered.append(self.url)
+            return {"result": self.url}
+
+    monkeypatch.setattr(src.classes.providers, "HTTPProvider", FakeProvider)
+    provider = PooledHTTPProvider(EndpointPool(["a", "b"]), HedgePolicy(ratio=1, min_samples=1))
+    a, b = provider.pool.endpoints
+    provider.pool.record(a, 0.01, ok=True)
+    provider.pool.record(b, 0.02, ok=True)
+    assert provider.make_request("eth_call", []) == {"result": "a"}
+
+    delays["a"] = 1.0
+    start = monotonic()
+    assert provider.make_request("eth_call", []) == {"result": "b"}
+    assert monotonic() - start < 0.5
+
+    # slow success is ignored, but still recorded
+    sleep(1.0)
+    assert answered == ["a", "b", "a"]
+
+
+def test_requests_are_gated(config, monkeypatch):
+    """
+    test if the requests hold a slot of the gate with the priority of the caller,
+    and the requests made while holding a slot are not gated again.
+    """
+    gate = PriorityGate(capacity=1)
+    set_gate(gate)
+    slots = []
+
+    class FakeProvider:
+        def __init__(self, url):
+            self.url = url
+
+        def make_request(self, method, params):
+            slots.append((gate.holding(), current_priority()))
+            return {"result": self.url}
+
+    monkeypatch.setattr(src.classes.providers, "HTTPProvider", FakeProvider)
+    provider = PooledHTTPProvider(EndpointPool(["a", "b"]))
+
+    with prioritized(PRIORITY.CRITICAL):
+        provider.make_request("eth_sendRawTransaction", [])
+    with gate.slot(PRIORITY.BACKGROUND):
+        provider.make_request("eth_sendRawTransaction", [])
+    set_gate(None)
+
+    assert slots == [(True, PRIORITY.CRITICAL), (True, PRIORITY.BACKGROUND)]
+    assert gate.waiting == 0 and not gate.holding()
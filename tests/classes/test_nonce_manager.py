@@ -0,0 +1,72 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.classes import NonceManager
+
+ADDRESS = "0x0000000000000000000000000000000000000001"
+
+
+def test_nonces_are_allocated_once():
+    """
+    test if the nonce is fetched once, and the threads never get the same nonce.
+    """
+    fetched = []
+    nonces = NonceManager(lambda address: fetched.append(address) or 7)
+
+    with ThreadPoolExecutor(8) as pool:
+        allocated = list(pool.map(lambda _: nonces.allocate(ADDRESS), range(200)))
+
+    assert sorted(allocated) == list(range(7, 207))
+    assert fetched == [ADDRESS]
+
+
+def test_nonces_are_resynced_on_error():
+    """
+    test if a failed transaction does not leave a gap, and pending nonces are not reused.
+    """
+    node = {"nonce": 3}
+    nonces = NonceManager(lambda address: node["nonce"])
+
+    with nonces.reserve(ADDRESS) as nonce:
+        assert nonce == 3
+    nonces.track(ADDRESS, 3, "0x03")
+
+    with pytest.raises(ValueError):
+        with nonces.reserve(ADDRESS) as nonce:
+            assert nonce == 4
+            raise ValueError("execution reverted")
+
+    # node does not reflect the pending transaction yet
+    assert nonces.allocate(ADDRESS) == 4
+    assert nonces.pending(ADDRESS) == {3: "0x03"}
+
+    nonces.settle(ADDRESS, 3)
+    nonces.resync(ADDRESS)
+    node["nonce"] = 5
+    assert nonces.allocate(ADDRESS) == 5
+    assert nonces.pending(ADDRESS) == {}
+
+
+def test_failed_nonce_is_given_again_first():
+    """
+    test if the nonce of a failed transaction is given again, while a later one is pending.
+    """
+    nonces = NonceManager(lambda address: 3)
+
+    first = nonces.allocate(ADDRESS)
+    with nonces.reserve(ADDRESS) as second:
+        assert (first, second) == (3, 4)
+    nonces.track(ADDRESS, second, "0x04")
+
+    with pytest.raises(ValueError):
+        with nonces.reserve(ADDRESS) as third:
+            assert third == 5
+            raise ValueError("execution reverted")
+
+    # node does not know the first one, which is still being sent
+    assert nonces.allocate(ADDRESS) == 5
+    nonces.release(ADDRESS, first)
+    assert nonces.allocate(ADDRESS) == 3
+    assert nonces.allocate(ADDRESS) == 6
+    assert nonces.pending(ADDRESS) == {4: "0x04"}
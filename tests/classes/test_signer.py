@@ -0,0 +1,117 @@
+import os
+import json
+import hashlib
+
+import pytest
+from Crypto.Cipher import AES
+from py_ecc.bls import G2ProofOfPossession as bls
+
+from src.classes import KeystoreSigner
+from src.utils.deposit import (
+    deposit_domain,
+    deposit_data_root,
+    deposit_message_root,
+    signing_root,
+    withdrawal_credentials,
+)
+
+SECRET = 0x19D6689C085AE165831E934FF763AE46A2A6C172B3F1B60A8CE26F
+ADDRESS = "0x1111111111111111111111111111111111111111"
+HOLESKY = bytes.fromhex("01017000")
+
+
+def keystore(secret, passphrase):
+    """
+    EIP-2335 keystore with a cheap kdf.
+    """
+    salt, iv = os.urandom(32), os.urandom(16)
+    key = hashlib.pbkdf2_hmac("sha256", passphrase.encode(), salt, 2, 32)
+    message = AES.new(key[:16], AES.MODE_CTR, initial_value=iv, nonce=b"").encrypt(
+        secret.to_bytes(32, "big")
+    )
+    return {
+        "kdf": {
+            "function": "pbkdf2",
+            "params": {"dklen": 32, "c": 2, "prf": "hmac-sha256", "salt": salt.hex()},
+            "message": "",
+        },
+        "checksum": {
+            "function": "sha256",
+            "params": {},
+            "message": hashlib.sha256(key[16:32] + message).hexdigest(),
+        },
+        "cipher": {"function": "aes-128-ctr", "params": {"iv": iv.hex()}, "message": message.hex()},
+    }
+
+
+@pytest.fixture
+def wallets(tmp_path):
+    """
+    filesystem store of ethdo, with a non-deterministic wallet and an account.
+    """
+    wallet_dir = tmp_path / "wallet-uuid"
+    wallet_dir.mkdir()
+    (wallet_dir / "wallet-uuid").write_text(
+        json.dumps({"name": "geonius", "type": "non-deterministic", "uuid": "wallet-uuid"})
+    )
+    (wallet_dir / "index").write_bytes(b"\x00")
+    (wallet_dir / "account-uuid").write_text(
+        json.dumps(
+            {
+                "name": "Validator0",
+                "crypto": keystore(SECRET, "secret"),
+                "pubkey": bls.SkToPk(SECRET).hex(),
+                "uuid": "account-uuid",
+                "version": 4,
+            }
+        )
+    )
+    return tmp_path
+
+
+@pytest.mark.parametrize("processes", [0, 2])
+def test_deposit_data_is_signed_in_process(wallets, processes):
+    """
+    test if the deposit data is signed with the keystore of ethdo, in the format of the launchpad.
+    """
+    signer = KeystoreSigner(passphrase="secret", base_dir=str(wallets), processes=processes)
+    [data] = signer.deposit_data("geonius", "Validator0", ADDRESS, 31 * 10**18, HOLESKY)
+
+    pubkey = bls.SkToPk(SECRET)
+    credentials = withdrawal_credentials(ADDRESS)
+    signature = bytes.fromhex(data["signature"])
+
+    assert data["pubkey"] == pubkey.hex()
+    assert data["withdrawal_credentials"] == "01" + "00" * 11 + "11" * 20
+    assert data["amount"] == 31_000_000_000
+    assert data["fork_version"] == "01017000"
+    assert data["eth2_network_name"] == "holesky"
+    assert data["deposit_data_root"] == (
+        deposit_data_root(pubkey, credentials, 31_000_000_000, signature).hex()
+    )
+    root = deposit_message_root(pubkey, credentials, 31_000_000_000)
+    assert data["deposit_message_root"] == root.hex()
+    assert bls.Verify(pubkey, signing_root(root, HOLESKY), signature)
+
+
+def test_deposit_domain_of_mainnet():
+    """
+    test if the deposit domain matches the one of mainnet deposits.
+    """
+    assert deposit_domain(bytes(4)).hex() == (
+        "03000000f5a5fd42d16a20302798ef6ed309979b43003d2320d9f0e8ea9831a9"
+    )
+
+
+def test_unknown_accounts_and_passphrases_fail(wallets):
+    """
+    test if the accounts that do not exist, or can not be decrypted are not signed for.
+    """
+    with pytest.raises(ValueError):
+        KeystoreSigner(passphrase="secret", base_dir=str(wallets)).deposit_data(
+            "geonius", "Validator1", ADDRESS, 10**18, HOLESKY
+        )
+    with pytest.raises(ValueError):
+        KeystoreSigner(passphrase="wrong", base_dir=str(wallets)).deposit_data(
+            "geonius", "Validator0", ADDRESS, 10**18, HOLESKY
+        )
@@ -0,0 +1,32 @@
+import logging
+import pytest
+
+from src.common import AttributeDict
+from src.globals import set_config, set_logger, set_constants
+
+
+@pytest.fixture
+def config(tmp_path):
+    """
+    minimal global configuration that keeps the database within a temporary directory.
+    """
+    config = AttributeDict.convert_recursive(
+        {
+            "dir": str(tmp_path),
+            "operator_id": 1,
+            "operator_ids": [1],
+            "database": {"dir": "db"},
+            "network": {"refresh_rate": 60, "max_attempt": 1, "attempt_rate": 0.1},
+        }
+    )
+    set_config(config)
+    set_constants(
+        AttributeDict.convert_recursive(
+            {"chain": {"interval": "12"}, "one_minute": 60, "one_hour": 3600}
+        )
+    )
+    set_logger(logging.getLogger("geonius-tests"))
+    yield config
+    set_config(None)
+    set_constants(None)
+    set_logger(None)
@@ -0,0 +1,66 @@
+from geodefi.globals import VALIDATOR_STATE
+
+from src.database.exits import (
+    create_exit_deadlines_table,
+    save_exit_deadlines,
+    import_exit_requested_validators,
+    fetch_next_exit_epoch,
+    fetch_due_exits,
+    remove_exit_deadlines,
+)
+from src.database.validators import create_validators_table, insert_many_validators
+
+
+def test_deadlines_are_fetched_by_epoch(config):
+    """
+    test if the deadlines are fetched in the order of their exit epoch, until they are removed.
+    """
+    create_exit_deadlines_table()
+    assert fetch_next_exit_epoch() is None
+
+    save_exit_deadlines([("0xb", 2, 120, None), ("0xa", 1, 110, None), ("0xc", 1, 130, None)])
+    save_exit_deadlines([("0xc", 1, 140, None), ("0xd", 1, 100, 135)])
+
+    assert fetch_next_exit_epoch() == 110
+    assert fetch_due_exits(100) == []
+    assert fetch_due_exits(120) == [("0xa", "1"), ("0xb", "2")]
+
+    # due on the withdrawable epoch, if it is known
+    remove_exit_deadlines(["0xa", "0xb"])
+    assert fetch_next_exit_epoch() == 135
+    assert fetch_due_exits(135) == [("0xd", "1")]
+    assert fetch_due_exits(140) == [("0xd", "1"), ("0xc", "1")]
+
+
+def test_exit_requested_validators_are_imported(config):
+    """
+    test if the validators that requested an exit with a known exit epoch are scheduled once.
+    """
+    create_validators_table()
+    create_exit_deadlines_table()
+    insert_many_validators(
+        [
+            {
+                "portal_index": i,
+                "beacon_index": i,
+                "pubkey": f"0x{i}",
+                "pool_id": "1",
+                "local_state": VALIDATOR_STATE.ACTIVE,
+                "portal_state": state,
+                "signature31": i,
+                "withdrawal_credentials": "0x01",
+                "exit_epoch": epoch,
+            }
+            for i, (state, epoch) in enumerate(
+                [
+                    (VALIDATOR_STATE.EXIT_REQUESTED, 150),
+                    (VALIDATOR_STATE.EXIT_REQUESTED, None),
+                    (VALIDATOR_STATE.ACTIVE, 150),
+                ]
+            )
+        ]
+    )
+    save_exit_deadlines([("0x0", 1, 100, 120)])
+
+    import_exit_requested_validators()
+    assert fetch_due_exits(1000) == [("0x0", "1")]
@@ -0,0 +1,50 @@
+import pytest
+
+from src.database.expected_pubkeys import (
+    create_expected_pubkeys_table,
+    insert_expected_pubkeys,
+    fetch_due_pubkeys,
+    postpone_expected_pubkeys,
+    remove_expected_pubkeys,
+    count_expected_pubkeys,
+)
+
+
+@pytest.fixture
+def table(config):
+    create_expected_pubkeys_table()
+
+
+def test_only_due_pubkeys_are_fetched(table):
+    """
+    test if postponed pubkeys are skipped until their next check.
+    """
+    insert_expected_pubkeys("Q", ["0x01", "0x02"], 100)
+    postpone_expected_pubkeys("Q", [("0x01", 1, 200)])
+
+    assert fetch_due_pubkeys("Q", 150) == [("0x02", 0)]
+    assert sorted(fetch_due_pubkeys("Q", 200)) == [("0x01", 1), ("0x02", 0)]
+
+
+def test_queues_are_seperated(table):
+    """
+    test if the same pubkey can be expected by different queues.
+    """
+    insert_expected_pubkeys("A", ["0x01"], 100)
+    insert_expected_pubkeys("B", ["0x01"], 100)
+    remove_expected_pubkeys("A", ["0x01"])
+
+    assert count_expected_pubkeys("A") == 0
+    assert count_expected_pubkeys("B") == 1
+
+
+def test_reinsert_keeps_attempts(table):
+    """
+    test if inserting a known pubkey again does not reset its backoff.
+    """
+    insert_expected_pubkeys("Q", ["0x01"], 100)
+    postpone_expected_pubkeys("Q", [("0x01", 3, 500)])
+    insert_expected_pubkeys("Q", ["0x01"], 300)
+
+    assert fetch_due_pubkeys("Q", 300) == []
+    assert fetch_due_pubkeys("Q", 500) == [("0x01", 3)]
@@ -0,0 +1,53 @@
+import pytest
+
+from src.common import AttributeDict
+from src.database.lease import create_lease_table, claim_lease, release_lease, is_lease_held
+
+
+@pytest.fixture
+def table(config, tmp_path):
+    config.ha = AttributeDict({"dir": str(tmp_path / "shared")})
+    create_lease_table()
+
+
+def test_only_one_holder(table):
+    """
+    test if the lease can not be claimed by another instance until it expires.
+    """
+    assert claim_lease("A", 100, 12) == 1
+    assert claim_lease("B", 105, 12) is None
+    # renewal keeps the fencing token
+    assert claim_lease("A", 108, 12) == 1
+    assert claim_lease("B", 119, 12) is None
+
+
+def test_takeover_increases_token(table):
+    """
+    test if a takeover after the expiry fences the previous holder out.
+    """
+    assert claim_lease("A", 100, 12) == 1
+    assert claim_lease("B", 113, 12) == 2
+    assert claim_lease("A", 114, 12) is None
+
+
+def test_release(table):
+    """
+    test if a released lease can be taken over immediately.
+    """
+    assert claim_lease("A", 100, 12) == 1
+    release_lease("A")
+    assert claim_lease("B", 101, 12) == 2
+
+
+def test_fencing_token_is_checked(table):
+    """
+    test if a fencing token is only valid for its holder, until it expires or is taken over.
+    """
+    assert claim_lease("A", 100, 12) == 1
+    assert is_lease_held("A", 1, 105)
+    assert not is_lease_held("B", 1, 105)
+    assert not is_lease_held("A", 1, 113)
+
+    assert claim_lease("B", 113, 12) == 2
+    assert not is_lease_held("A", 1, 114)
+    assert is_lease_held("B", 2, 114)
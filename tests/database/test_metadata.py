@@ -0,0 +1,39 @@
+from src.database.metadata import create_metadata_table, fetch_metadata, save_metadata
+from src.utils.cache import immutable
+
+
+def test_known_fields_are_kept(config):
+    """
+    test if the fields keep their types and are never changed once saved.
+    """
+    create_metadata_table()
+    save_metadata("0xabc", {"portal_index": 3, "signature31": b"\x01", "pool_id": str(2**255)})
+    save_metadata("0xabc", {"portal_index": 4, "beacon_index": 7})
+
+    assert fetch_metadata("0xabc") == {
+        "portal_index": 3,
+        "signature31": b"\x01",
+        "pool_id": str(2**255),
+        "beacon_index": 7,
+    }
+    assert fetch_metadata("0xdef") == {}
+
+
+def test_immutable_is_fetched_once(config):
+    """
+    test if an immutable value is read from the chain once, and an empty value is not kept.
+    """
+    create_metadata_table()
+    calls = []
+
+    @immutable("NAME")
+    def get_name(pool_id):
+        calls.append(pool_id)
+        return "" if pool_id == 0 else f"pool {pool_id}"
+
+    assert get_name(123) == "pool 123"
+    assert get_name(123) == "pool 123"
+    assert fetch_metadata(123) == {"NAME": "pool 123"}
+    assert get_name(0) == ""
+    assert get_name(0) == ""
+    assert calls == [123, 0, 0]
@@ -0,0 +1,42 @@
+from src.classes import Database
+from src.database.exits import create_exit_deadlines_table, fetch_due_exits
+from src.database.migration import migrate_operator_tables
+from src.utils.operator import operator_scope
+
+
+def test_tables_are_migrated_into_the_namespace(config):
+    """
+    test if the tables of a single operator deployment are moved into the namespace of the
+    operator on multi-operator mode, once and with the common columns.
+    """
+    # created by a single operator deployment, with a column that is not kept anymore
+    with Database() as db:
+        db.execute(
+            """
+            CREATE TABLE ExitDeadlines (
+                pubkey TEXT NOT NULL PRIMARY KEY,
+                pool_id TEXT NOT NULL,
+                exit_epoch INTEGER NOT NULL,
+                withdrawable_epoch INTEGER,
+                reason TEXT
+            )
+            """
+        )
+        db.execute("INSERT INTO ExitDeadlines VALUES ('0xa', '3', 110, NULL, 'requested')")
+
+    config.operator_ids = [1, 2]
+    for operator_id in config.operator_ids:
+        with operator_scope(operator_id):
+            create_exit_deadlines_table()
+
+    with operator_scope(1):
+        migrate_operator_tables()
+        migrate_operator_tables()
+        assert fetch_due_exits(110) == [("0xa", "3")]
+
+    with operator_scope(2):
+        assert fetch_due_exits(110) == []
+
+    with Database(Database.shared) as db:
+        db.execute("SELECT name FROM sqlite_master WHERE name = 'ExitDeadlines'")
+        assert db.fetchone() is None
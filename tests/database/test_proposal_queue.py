@@ -0,0 +1,32 @@
+import pytest
+
+from src.database.proposal_queue import (
+    PROPOSE,
+    STAKE,
+    create_proposal_queue_table,
+    enqueue,
+    fetch_queue,
+    dequeue,
+)
+
+
+@pytest.fixture
+def table(config):
+    create_proposal_queue_table()
+
+
+def test_queued_work_keeps_its_timestamp(table):
+    """
+    test if the work that is queued again keeps waiting since the first time, oldest first.
+    """
+    enqueue(STAKE, ["0x02"], 200)
+    enqueue(STAKE, ["0x01", "0x02"], 100)
+    enqueue(PROPOSE, [5], 300)
+
+    assert fetch_queue(STAKE) == [("0x01", 100), ("0x02", 200)]
+    assert fetch_queue(PROPOSE) == [("5", 300)]
+
+    dequeue(STAKE, ["0x02"])
+    dequeue(PROPOSE, [5])
+    assert fetch_queue(STAKE) == [("0x01", 100)]
+    assert fetch_queue(PROPOSE) == []
@@ -0,0 +1,51 @@
+import pytest
+
+from src.classes import Database
+from src.database.metadata import create_metadata_table
+from src.database.reservoir import (
+    create_reservoir_table,
+    save_deposit_data,
+    fetch_deposit_data,
+    fetch_reserved_indexes,
+    prune_reservoir,
+)
+
+ADDRESS = "0xAbC0000000000000000000000000000000000001"
+
+
+@pytest.fixture
+def table(config, monkeypatch):
+    monkeypatch.setenv("ETHDO_ACCOUNT_PASSPHRASE", "secret")
+    create_metadata_table()
+    create_reservoir_table()
+
+
+def test_deposit_data_is_encrypted(table):
+    """
+    test if the deposit data is read back as it is saved, but not stored as plain text.
+    """
+    proposal = [{"pubkey": "aa", "signature": "01"}]
+    stake = [{"pubkey": "aa", "signature": "31"}]
+    save_deposit_data(ADDRESS, 3, proposal, stake, 100)
+
+    assert fetch_deposit_data(ADDRESS.lower(), 3) == (proposal, stake)
+    assert fetch_deposit_data(ADDRESS, 4) is None
+
+    with Database() as db:
+        db.execute("SELECT data FROM Reservoir")
+        assert b"signature" not in db.fetchone()[0]
+
+
+def test_used_and_unreadable_indexes_are_removed(table, monkeypatch):
+    """
+    test if the indexes that are already used, or sealed with another passphrase are removed.
+    """
+    for i in range(3):
+        save_deposit_data(ADDRESS, i, [{"i": i}], [{"i": i}], 100)
+
+    prune_reservoir(1)
+    assert fetch_reserved_indexes(ADDRESS) == {1, 2}
+
+    monkeypatch.setenv("ETHDO_ACCOUNT_PASSPHRASE", "changed")
+    assert fetch_deposit_data(ADDRESS, 1) is None
+    assert fetch_reserved_indexes(ADDRESS) == {2}
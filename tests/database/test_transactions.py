@@ -0,0 +1,53 @@
+import pytest
+
+from src.database.transactions import (
+    MINED,
+    DROPPED,
+    create_transactions_table,
+    save_transaction,
+    save_replacement,
+    save_transaction_status,
+    fetch_pending_transactions,
+    fetch_pending_pubkeys,
+    count_pending_transactions,
+)
+
+SENDER = "0x0000000000000000000000000000000000000001"
+
+
+@pytest.fixture
+def table(config):
+    create_transactions_table()
+
+
+def test_pending_pubkeys_are_not_sent_again(table):
+    """
+    test if the pubkeys of the pending transactions are known, until they are mined.
+    """
+    save_transaction("0xa", "stake", SENDER, 1, "0xpayload", ["0x01", "0x02"])
+    save_transaction("0xb", "proposeStake", SENDER, 2, "0xpayload", ["0x03"])
+
+    assert fetch_pending_pubkeys("stake") == {"0x01", "0x02"}
+    assert count_pending_transactions("proposeStake") == 1
+
+    save_transaction_status("0xa", MINED, 100)
+    assert fetch_pending_pubkeys("stake") == set()
+    assert [tx[0] for tx in fetch_pending_transactions()] == ["0xb"]
+
+
+def test_replacements_are_watched(table):
+    """
+    test if both the replaced and the new transaction are pending, until one of them is mined.
+    """
+    save_transaction("0xa", "stake", SENDER, 1, "0xpayload", ["0x01"])
+    save_replacement("0xa", "0xc")
+
+    pending = {tx[0]: tx for tx in fetch_pending_transactions()}
+    assert pending["0xa"][5] == "0xc"
+    assert pending["0xc"][1:4] == ("stake", SENDER, 1)
+    assert pending["0xc"][5] is None
+    assert fetch_pending_pubkeys("stake") == {"0x01"}
+
+    save_transaction_status("0xc", MINED, 101)
+    save_transaction_status("0xa", DROPPED)
+    assert fetch_pending_transactions() == []
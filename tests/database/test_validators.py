@@ -0,0 +1,55 @@
+from geodefi.globals import VALIDATOR_STATE
+
+from src.classes import Database
+from src.database.validators import (
+    create_validators_table,
+    insert_many_validators,
+    save_local_state,
+    save_local_states,
+    save_portal_states,
+    save_exit_epochs,
+)
+
+
+def validator(index):
+    return {
+        "portal_index": index,
+        "beacon_index": index,
+        "pubkey": f"0x{index}",
+        "pool_id": "1",
+        "local_state": VALIDATOR_STATE.ACTIVE,
+        "portal_state": VALIDATOR_STATE.ACTIVE,
+        "signature31": index,
+        "withdrawal_credentials": "0x01",
+        "exit_epoch": None,
+    }
+
+
+def states():
+    with Database() as db:
+        db.execute("SELECT pubkey, local_state, portal_state, exit_epoch FROM Validators")
+        return {row[0]: row[1:] for row in db.fetchall()}
+
+
+def test_states_are_saved_at_once(config):
+    """
+    test if the states and the exit epochs of many validators are saved together.
+    """
+    create_validators_table()
+    insert_many_validators([validator(i) for i in range(3)])
+
+    save_portal_states(["0x0", "0x1"], VALIDATOR_STATE.EXIT_REQUESTED)
+    save_local_states(["0x0"], VALIDATOR_STATE.EXIT_REQUESTED)
+    save_local_state("0x2", VALIDATOR_STATE.EXITED)
+    save_exit_epochs([("0x0", 100), ("0x1", 101)])
+
+    exit_requested, active, exited = (
+        int(VALIDATOR_STATE.EXIT_REQUESTED),
+        int(VALIDATOR_STATE.ACTIVE),
+        int(VALIDATOR_STATE.EXITED),
+    )
+    assert states() == {
+        "0x0": (exit_requested, exit_requested, 100),
+        "0x1": (active, exit_requested, 101),
+        "0x2": (exited, active, None),
+    }
@@ -0,0 +1,60 @@
+import pytest
+
+from src.common import AttributeDict
+from src.globals import set_sdk
+from src.helpers.batch import get_batch_size, MAX_DEPOSITS_PER_CALL
+
+
+class FakeCall:
+    """
+    minimal contract call that costs a fixed gas, and gas per pubkey.
+    """
+
+    estimations = []
+
+    def __init__(self, count, base, per_key):
+        self.gas = base + count * per_key
+
+    def estimate_gas(self, params):
+        type(self).estimations.append(params["from"])
+        return self.gas
+
+
+@pytest.fixture
+def sdk(config):
+    config.strategy = AttributeDict({"gas_ceiling": 10_000_000})
+    FakeCall.estimations = []
+    set_sdk(
+        AttributeDict({"w3": AttributeDict({"eth": AttributeDict({"default_account": "0x1"})})})
+    )
+    yield config
+    set_sdk(None)
+
+
+def test_batches_fit_the_gas_ceiling(sdk):
+    """
+    test if the batches are as large as the gas ceiling allows, estimating the costs once.
+    """
+    build = lambda k: FakeCall(k, base=100_000, per_key=400_000)
+
+    assert get_batch_size("expensive", build, 200) == 24
+    assert get_batch_size("expensive", build, 200) == 24
+    assert FakeCall.estimations == ["0x1", "0x1"]
+
+    sdk.strategy.gas_ceiling = 2_000_000
+    assert get_batch_size("expensive", build, 200) == 4
+
+
+def test_batches_are_limited(sdk):
+    """
+    test if the batches are limited by the portal, the number of pubkeys, and failed estimations.
+    """
+    build = lambda k: FakeCall(k, base=50_000, per_key=30_000)
+    assert get_batch_size("cheap", build, 200) == MAX_DEPOSITS_PER_CALL
+    assert get_batch_size("cheap", build, 7) == 7
+    assert get_batch_size("cheap", build, 0) == 1
+
+    def revert(k):
+        raise ValueError("execution reverted")
+
+    assert get_batch_size("reverted", revert, 200) == MAX_DEPOSITS_PER_CALL
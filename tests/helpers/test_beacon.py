@@ -0,0 +1,95 @@
+import json
+from threading import Thread
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import pytest
+
+from src.common import AttributeDict
+from src.globals import set_sdk
+from src.helpers.beacon import get_validators
+
+KNOWN = {f"0x{i:02x}": i for i in range(120)}
+FAR_FUTURE = 2**64 - 1
+
+
+class BeaconHandler(BaseHTTPRequestHandler):
+    """
+    minimal beacon node that responds to the validators endpoint.
+    """
+
+    supports_post = True
+    requests = []
+
+    def respond(self, ids):
+        data = [
+            {
+                "index": str(KNOWN[pk]),
+                "balance": "32000000000",
+                "status": "active_ongoing",
+                "validator": {
+                    "pubkey": pk,
+                    "exit_epoch": str(FAR_FUTURE),
+                    "withdrawable_epoch": str(FAR_FUTURE),
+                },
+            }
+            for pk in ids
+            if pk in KNOWN
+        ]
+        body = json.dumps({"data": data}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        type(self).requests.append("POST")
+        if not self.supports_post:
+            self.send_response(405)
+            self.end_headers()
+            return
+        length = int(self.headers["Content-Length"])
+        self.respond(json.loads(self.rfile.read(length))["ids"])
+
+    def do_GET(self):
+        type(self).requests.append("GET")
+        self.respond(parse_qs(urlparse(self.path).query)["id"][0].split(","))
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(params=[True, False], ids=["post", "get"])
+def beacon(config, request):
+    handler = type("Handler", (BeaconHandler,), {"supports_post": request.param, "requests": []})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    set_sdk(
+        AttributeDict(
+            {"beacon": AttributeDict({"api_base": f"http://127.0.0.1:{server.server_port}"})}
+        )
+    )
+    yield handler
+    server.shutdown()
+    set_sdk(None)
+
+
+def test_validators_are_batched(beacon):
+    """
+    test if the validators are queried in batches, and the unknown ones are left out.
+    """
+    pubkeys = list(KNOWN) + ["0xunknown"]
+    validators = get_validators(pubkeys)
+
+    assert len(validators) == len(KNOWN)
+    assert validators["0x05"] == {
+        "status": "active_ongoing",
+        "balance": 32000000000,
+        "index": 5,
+        "exit_epoch": FAR_FUTURE,
+        "withdrawable_epoch": FAR_FUTURE,
+    }
+    if beacon.supports_post:
+        assert beacon.requests == ["POST"]
+    else:
+        assert beacon.requests == ["POST", "GET", "GET", "GET"]
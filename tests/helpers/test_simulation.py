@@ -0,0 +1,95 @@
+import hashlib
+
+import pytest
+from web3 import Web3
+from web3.exceptions import ContractLogicError, ContractCustomError
+
+from src.classes import BlockCache
+from src.common import AttributeDict
+from src.globals import set_sdk, set_block_cache
+from src.helpers.simulation import bisect_batch, decode_revert, simulate
+
+BAD = {"0x03", "0x06"}
+
+
+class FakeStake:
+    """
+    minimal stake call that reverts if any of the pubkeys is bad.
+    """
+
+    calls = []
+
+    def __init__(self, pubkeys):
+        self.fn_name = "stake"
+        self.args = (1, pubkeys)
+
+    def call(self, params, block_identifier):
+        type(self).calls.append(list(self.args[1]))
+        if BAD & set(self.args[1]):
+            raise ContractLogicError("execution reverted: SML:pubkey is not approved")
+
+
+def encode(fn_name, args):
+    return "0x" + hashlib.sha256(repr((fn_name, args)).encode()).hexdigest()
+
+
+@pytest.fixture
+def portal(config):
+    FakeStake.calls = []
+    abi = [{"type": "error", "name": "EnforcedPause", "inputs": []}]
+    set_sdk(
+        AttributeDict(
+            {
+                "w3": AttributeDict({"eth": AttributeDict({"default_account": "0x1"})}),
+                "portal": AttributeDict(
+                    {"contract": AttributeDict({"abi": abi, "encodeABI": encode})}
+                ),
+            }
+        )
+    )
+    cache = BlockCache()
+    cache.advance(100)
+    set_block_cache(cache)
+    yield
+    set_sdk(None)
+    set_block_cache(None)
+
+
+def test_bad_pubkeys_are_bisected_out(portal):
+    """
+    test if the pubkeys that would revert are removed, and a good batch is simulated once.
+    """
+    pubkeys = [f"0x{i:02x}" for i in range(8)]
+    good, bad = bisect_batch(pubkeys, FakeStake)
+
+    assert good == [pk for pk in pubkeys if pk not in BAD]
+    assert [pk for pk, _ in bad] == ["0x03", "0x06"]
+    assert bad[0][1] == "execution reverted: SML:pubkey is not approved"
+
+    FakeStake.calls = []
+    assert bisect_batch(good, FakeStake) == (good, [])
+    assert FakeStake.calls == []
+
+
+def test_simulations_are_cached_per_block(portal, config):
+    """
+    test if the same batch is simulated once per block.
+    """
+    assert simulate(FakeStake(["0x01"])) is None
+    assert simulate(FakeStake(["0x01"])) is None
+    assert len(FakeStake.calls) == 1
+
+    set_block_cache(None)
+    assert simulate(FakeStake(["0x01"])) is None
+    assert len(FakeStake.calls) == 2
+
+
+def test_custom_errors_are_decoded(portal):
+    """
+    test if the custom errors of the portal are decoded by their selectors.
+    """
+    selector = Web3.to_hex(Web3.keccak(text="EnforcedPause()")[:4])
+    assert decode_revert(ContractCustomError(selector, data=selector)) == "EnforcedPause()"
+    assert decode_revert(ContractCustomError("0x12345678", data="0x12345678")).startswith(
+        "unknown custom error"
+    )
@@ -0,0 +1,37 @@
+from src.common import AttributeDict
+from src.helpers import validator
+from src.helpers.validator import is_due
+from src.database.metadata import create_metadata_table, update_metadata
+
+
+def test_queued_work_is_due(config):
+    """
+    test if the queue is sent when it is large enough, or when the oldest work waited enough.
+    """
+    config.strategy = AttributeDict({"min_proposal_queue": 10, "max_proposal_delay": 600})
+
+    assert is_due(10, oldest=1000, now=1000)
+    assert not is_due(9, oldest=1000, now=1599)
+    assert is_due(9, oldest=1000, now=1600)
+    assert not is_due(0, oldest=0, now=1600)
+
+    # nothing waits without a strategy
+    config.strategy = AttributeDict({"min_proposal_queue": 0, "max_proposal_delay": 0})
+    assert is_due(1, oldest=1000, now=1000)
+
+
+def test_next_index_skips_the_submitted_proposals(config, monkeypatch):
+    """
+    test if the next validator index follows the pending proposals, and the submitted ones.
+    """
+    create_metadata_table()
+    pending = {"0x01", "0x02"}
+    monkeypatch.setattr(validator, "get_owned_pubkeys_count", lambda: 10)
+    monkeypatch.setattr(validator, "fetch_pending_pubkeys", lambda function: pending)
+    assert validator.get_next_index() == 12
+
+    # a dropped proposal does not give its indexes again, a later one might be mined
+    update_metadata(1, {validator.NEXT_INDEX: 13})
+    update_metadata(1, {validator.NEXT_INDEX: 14})
+    pending.clear()
+    assert validator.get_next_index() == 14
@@ -0,0 +1,67 @@
+import pytest
+
+from src.classes import Lease
+from src.common import AttributeDict
+from src.exceptions import BeaconStateMismatchError, EthdoError
+from src.globals import set_lease, get_operator_id
+from src.database.events import create_exit_request_table
+from src.triggers.event import exit_request_trigger
+from src.triggers.event import ExitRequestTrigger
+
+
+def test_mismatch_is_raised_after_every_operator(config, monkeypatch):
+    """
+    test if the exits of every operator are handled when ethdo fails on a validator and another
+    validator is not exiting on beacon, and the mismatch is raised once after all of them.
+    """
+    config.operator_ids = [1, 2]
+    create_exit_request_table()
+    set_lease(Lease())
+
+    operators = {"0xa": 1, "0xb": 1, "0xc": 2}
+    statuses = {"0xa": "active_exiting", "0xb": "active_ongoing", "0xc": "active_exiting"}
+    deadlines = {}
+
+    def exit_validator(pubkey):
+        if pubkey == "0xa":
+            raise EthdoError("Failed to exit from the validator")
+
+    monkeypatch.setattr(exit_request_trigger, "exit_validator", exit_validator)
+    monkeypatch.setattr(exit_request_trigger, "send_email", lambda *args, **kwargs: None)
+    monkeypatch.setattr(exit_request_trigger, "find_operator_of", operators.get)
+    monkeypatch.setattr(exit_request_trigger, "save_portal_states", lambda *args: None)
+    monkeypatch.setattr(exit_request_trigger, "save_local_states", lambda *args: None)
+    monkeypatch.setattr(exit_request_trigger, "save_exit_epochs", lambda *args: None)
+    monkeypatch.setattr(
+        exit_request_trigger,
+        "save_exit_deadlines",
+        lambda rows: deadlines.setdefault(get_operator_id(), []).extend(rows),
+    )
+    monkeypatch.setattr(
+        exit_request_trigger, "get_validator_constants", lambda pubkey: {"pool_id": 7}
+    )
+    monkeypatch.setattr(
+        exit_request_trigger,
+        "get_validators",
+        lambda pubkeys: {
+            pk: AttributeDict(
+                {"status": statuses[pk], "exit_epoch": 300, "withdrawable_epoch": 556}
+            )
+            for pk in pubkeys
+        },
+    )
+
+    events = [
+        AttributeDict.convert_recursive(
+            {"args": {"pubkey": pk}, "blockNumber": 10, "transactionIndex": i, "logIndex": 0}
+        )
+        for i, pk in enumerate(operators)
+    ]
+
+    trigger = ExitRequestTrigger()
+    with pytest.raises(BeaconStateMismatchError) as e:
+        trigger.update_validators_status(events)
+    set_lease(None)
+
+    assert "0xb" in str(e.value) and "0xa" not in str(e.value)
+    assert deadlines == {2: [("0xc", 7, 300, 556)]}
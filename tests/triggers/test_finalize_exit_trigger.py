@@ -0,0 +1,90 @@
+from time import time
+
+import pytest
+
+from src.classes import Lease, BeaconClock
+from src.common import AttributeDict
+from src.exceptions import CallFailedError
+from src.globals import set_lease, set_clock
+from src.database.exits import create_exit_deadlines_table, save_exit_deadlines, fetch_due_exits
+from src.database.transactions import create_transactions_table
+from src.database.validators import create_validators_table
+from src.triggers.time import finalize_exit_trigger
+from src.triggers.time import FinalizeExitTrigger
+
+
+@pytest.fixture
+def finalized(config, monkeypatch):
+    """
+    finalizes every exit that is due on epoch 200, but fails on 0xc.
+    """
+    create_validators_table()
+    create_exit_deadlines_table()
+    create_transactions_table()
+    set_lease(Lease())
+
+    calls = []
+
+    def call_finalizeExit(pool_id, pubkey):
+        calls.append(pubkey)
+        if pubkey == "0xc":
+            raise CallFailedError("Failed to call finalizeExit on portal contract")
+
+    statuses = {"0xa": "exited_unslashed", "0xb": "active_exiting"}
+    monkeypatch.setattr(finalize_exit_trigger, "call_finalizeExit", call_finalizeExit)
+    monkeypatch.setattr(finalize_exit_trigger, "get_current_epoch", lambda: 200)
+    monkeypatch.setattr(
+        finalize_exit_trigger,
+        "get_validators",
+        lambda pubkeys: {
+            pk: AttributeDict({"status": statuses.get(pk, "withdrawal_possible")}) for pk in pubkeys
+        },
+    )
+    yield calls
+    set_lease(None)
+
+
+def test_finalized_exits_are_removed_on_failure(finalized):
+    """
+    test if the exits that are finalized before a failure are not sent again,
+    and the ones that are still exiting or failed are kept.
+    """
+    save_exit_deadlines(
+        [("0xa", 1, 100, None), ("0xb", 1, 110, None), ("0xc", 1, 120, None), ("0xd", 1, 130, None)]
+    )
+    save_exit_deadlines([("0xe", 1, 300, None)])
+
+    trigger = FinalizeExitTrigger()
+    with pytest.raises(CallFailedError):
+        trigger.finalize_exits()
+
+    assert finalized == ["0xa", "0xc"]
+    assert fetch_due_exits(1000) == [("0xb", "1"), ("0xc", "1"), ("0xd", "1"), ("0xe", "1")]
+
+
+def test_daemon_sleeps_until_the_next_deadline(finalized):
+    """
+    test if the daemon sleeps until the start of the next due epoch, after the due exits are
+    finalized, and polls on the interval while an exit is still waiting on the beacon chain.
+    """
+
+    class FakeDaemon:
+        scheduled = []
+
+        def schedule(self, seconds):
+            self.scheduled.append(seconds)
+
+    # epoch 200 starts now
+    set_clock(BeaconClock(int(time()) - 200 * 384, 12, 32))
+    save_exit_deadlines([("0xa", 1, 100, None), ("0xe", 1, 250, 260)])
+
+    daemon = FakeDaemon()
+    FinalizeExitTrigger().finalize_exits(daemon)
+    assert finalized == ["0xa"]
+    assert len(daemon.scheduled) == 1
+    assert abs(daemon.scheduled[0] - 60 * 384) < 5
+
+    save_exit_deadlines([("0xb", 1, 190, None)])
+    FinalizeExitTrigger().finalize_exits(daemon)
+    assert len(daemon.scheduled) == 1
+    set_clock(None)
@@ -0,0 +1,161 @@
+from time import time, monotonic
+
+import pytest
+from web3.exceptions import TransactionNotFound
+
+from src.classes import Lease, NonceManager
+from src.common import AttributeDict
+from src.globals import get_logger, set_sdk, set_lease, set_nonce_manager, get_nonce_manager
+from src.database.transactions import (
+    create_transactions_table,
+    save_transaction,
+    save_replacement,
+    fetch_pending_transactions,
+    fetch_pending_pubkeys,
+)
+from src.database.lease import create_lease_table, claim_lease, release_lease
+from src.triggers.time import ReceiptTrigger
+
+SENDER = "0x0000000000000000000000000000000000000001"
+
+
+def unknown(tx_hash, *args):
+    raise TransactionNotFound(f"{tx_hash} is not found")
+
+
+@pytest.fixture
+def node(config):
+    """
+    node that does not know any of the transactions, and has not mined the nonce 5 yet.
+    """
+    create_transactions_table()
+    set_sdk(
+        AttributeDict(
+            {
+                "w3": AttributeDict(
+                    {
+                        "eth": AttributeDict(
+                            {
+                                "get_transaction_receipt": unknown,
+                                "get_transaction": unknown,
+                                "get_transaction_count": lambda address, block: 5,
+                            }
+                        )
+                    }
+                )
+            }
+        )
+    )
+    set_lease(Lease())
+    set_nonce_manager(NonceManager(lambda address: 5))
+    yield
+    set_sdk(None)
+    set_lease(None)
+    set_nonce_manager(None)
+
+
+def test_unknown_stuck_transactions_are_dropped(node):
+    """
+    test if a stuck transaction that is not known by the node is dropped with its replacements,
+    so its pubkeys can be sent again and its nonce is given again.
+    """
+    nonces = get_nonce_manager()
+    assert nonces.allocate(SENDER) == 5
+    nonces.track(SENDER, 5, "0xb")
+    assert nonces.allocate(SENDER) == 6
+    nonces.release(SENDER, 6)
+
+    save_transaction("0xa", "proposeStake", SENDER, 5, "0xpayload", ["0x01"])
+    save_replacement("0xa", "0xb")
+
+    ReceiptTrigger(stuck_after=3600).watch_receipts()
+    assert fetch_pending_pubkeys("proposeStake") == {"0x01"}
+
+    ReceiptTrigger(stuck_after=-1).watch_receipts()
+    assert fetch_pending_transactions() == []
+    assert fetch_pending_pubkeys("proposeStake") == set()
+    assert nonces.pending(SENDER) == {}
+    assert nonces.allocate(SENDER) == 5
+
+
+class FakeProposal:
+    """
+    minimal proposeStake call that records the replacements that are sent.
+    """
+
+    sent = []
+
+    def __init__(self, **args):
+        self.fn_name = "proposeStake"
+        self.args = tuple(args.values())
+
+    def call(self, params, block_identifier):
+        assert block_identifier == "latest"
+
+    def transact(self, params):
+        type(self).sent.append(params)
+        return bytes.fromhex("0c")
+
+
+def test_replacements_are_fenced(node, config, tmp_path, monkeypatch):
+    """
+    test if a stuck transaction is not replaced after the lease is taken over,
+    and the replacement of the leader is tracked instead of the replaced one.
+    """
+    FakeProposal.sent = []
+    monkeypatch.setattr(get_logger(), "etherscan", lambda *args: None, raising=False)
+    tx = {"input": "0x", "value": 0, "gas": 21000, "maxPriorityFeePerGas": 8, "maxFeePerGas": 16}
+    set_sdk(
+        AttributeDict(
+            {
+                "w3": AttributeDict(
+                    {
+                        "eth": AttributeDict(
+                            {
+                                "default_account": SENDER,
+                                "get_transaction_receipt": unknown,
+                                "get_transaction": lambda tx_hash: tx,
+                                "get_transaction_count": lambda address, block: 5,
+                            }
+                        )
+                    }
+                ),
+                "portal": AttributeDict(
+                    {
+                        "contract": AttributeDict(
+                            {
+                                "decode_function_input": lambda data: (
+                                    FakeProposal,
+                                    {"pubkeys": ["0x01"]},
+                                ),
+                                "encodeABI": lambda fn_name, args: "0x01",
+                            }
+                        )
+                    }
+                ),
+            }
+        )
+    )
+    config.ha = AttributeDict({"dir": str(tmp_path / "shared")})
+    create_lease_table()
+    lease = Lease(duration=12)
+    set_lease(lease)
+
+    nonces = get_nonce_manager()
+    assert nonces.allocate(SENDER) == 5
+    nonces.track(SENDER, 5, "0xa")
+    save_transaction("0xa", "proposeStake", SENDER, 5, "0xpayload", ["0x01"])
+
+    # taken over by another instance, while this one still believes it is the leader
+    assert claim_lease("another", time(), 12) == 1
+    lease.update(1, monotonic())
+    ReceiptTrigger(stuck_after=-1).watch_receipts()
+    assert FakeProposal.sent == []
+    assert not lease.is_leader()
+
+    release_lease("another")
+    lease.update(claim_lease(lease.holder, time(), 12), monotonic())
+    ReceiptTrigger(stuck_after=-1).watch_receipts()
+    assert [(p["nonce"], p["maxFeePerGas"]) for p in FakeProposal.sent] == [(5, hex(19))]
+    assert nonces.pending(SENDER) == {5: "0x0c"}
+    assert [tx[0] for tx in fetch_pending_transactions()] == ["0xa", "0x0c"]
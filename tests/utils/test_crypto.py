@@ -0,0 +1,19 @@
+import pytest
+
+from src.database.metadata import create_metadata_table
+from src.utils.crypto import encrypt, decrypt
+
+
+def test_every_database_has_its_own_salt(config, monkeypatch, tmp_path):
+    """
+    test if the sealed data is read back on the same database, but not with the salt of another.
+    """
+    monkeypatch.setenv("ETHDO_ACCOUNT_PASSPHRASE", "secret")
+    create_metadata_table()
+    sealed = encrypt(b"deposit data")
+    assert decrypt(sealed) == b"deposit data"
+
+    config.dir = str(tmp_path / "other")
+    create_metadata_table()
+    with pytest.raises(ValueError):
+        decrypt(sealed)
@@ -0,0 +1,98 @@
+import pytest
+from web3 import Web3
+
+from src.classes import BlockCache
+from src.common import AttributeDict
+from src.exceptions import HighGasError
+from src.globals import set_sdk, set_block_cache
+from src.utils import gas
+from src.utils.gas import get_gas, tx_params
+
+GWEI = 10**9
+
+
+class FakeEth:
+    """
+    minimal eth module that responds to eth_feeHistory.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.newest = None
+
+    def fee_history(self, blocks, newest, percentiles):
+        self.calls += 1
+        self.newest = newest
+        return {
+            "baseFeePerGas": [10 * GWEI] * blocks + [12 * GWEI],
+            "reward": [[1 * GWEI], [3 * GWEI], [2 * GWEI], []] + [[2 * GWEI]] * (blocks - 4),
+        }
+
+
+@pytest.fixture
+def eth(config):
+    eth = FakeEth()
+    set_sdk(AttributeDict({"w3": AttributeDict({"eth": eth, "to_wei": Web3.to_wei})}))
+    cache = BlockCache()
+    cache.advance(100)
+    set_block_cache(cache)
+    yield eth
+    set_sdk(None)
+    set_block_cache(None)
+
+
+def test_fees_are_estimated_from_fee_history(eth):
+    """
+    test if the median priority fee is used, and the max fee allows the next base fee to double.
+    """
+    priority_fee, max_fee = get_gas()
+    assert int(priority_fee, 16) == 2 * GWEI
+    assert int(max_fee, 16) == 26 * GWEI
+    assert eth.newest == 100
+    assert tx_params() == {"maxPriorityFeePerGas": priority_fee, "maxFeePerGas": max_fee}
+
+
+def test_fees_are_cached_per_block(eth):
+    """
+    test if the fee history is requested once per block.
+    """
+    get_gas()
+    get_gas()
+    assert eth.calls == 1
+
+    set_block_cache(None)
+    get_gas()
+    assert eth.calls == 2
+
+
+def test_fees_are_limited(eth, config):
+    """
+    test if the transactions are not submitted when the fees are above the configured limits.
+    """
+    config.gas = AttributeDict({"max_priority": 5, "max_fee": 20})
+    with pytest.raises(HighGasError):
+        get_gas()
+
+    config.gas.max_fee = 30
+    assert int(get_gas()[1], 16) == 26 * GWEI
+
+
+def test_fee_history_is_used_when_gas_api_fails(eth, config, monkeypatch):
+    """
+    test if the fees are estimated from the fee history, when the gas api does not respond.
+    """
+
+    def fetch_gas():
+        raise ConnectionError("gas api is down")
+
+    monkeypatch.setattr(gas, "fetch_gas", fetch_gas)
+    config.gas = AttributeDict(
+        {
+            "max_priority": 5,
+            "max_fee": 30,
+            "api": "https://gas",
+            "parser": {"priority": "a", "base": "b"},
+        }
+    )
+    assert int(get_gas()[1], 16) == 26 * GWEI
+    assert eth.calls == 1
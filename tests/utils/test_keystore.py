@@ -0,0 +1,40 @@
+import pytest
+
+from src.utils.keystore import decrypt_keystore
+
+# test vector of EIP-2335
+PASSPHRASE = "𝔱𝔢𝔰𝔱𝔭𝔞𝔰𝔰𝔴𝔬𝔯𝔡🔑"
+SECRET = 0x000000000019D6689C085AE165831E934FF763AE46A2A6C172B3F1B60A8CE26F
+CRYPTO = {
+    "kdf": {
+        "function": "pbkdf2",
+        "params": {
+            "dklen": 32,
+            "c": 262144,
+            "prf": "hmac-sha256",
+            "salt": "d4e56740f876aef8c010b86a40d5f56745a118d0906a34e69aec8c0db1cb8fa3",
+        },
+        "message": "",
+    },
+    "checksum": {
+        "function": "sha256",
+        "params": {},
+        "message": "8a9f5d9912ed7e75ea794bc5a89bca5f193721d30868ade6f73043c6ea6febf1",
+    },
+    "cipher": {
+        "function": "aes-128-ctr",
+        "params": {"iv": "264daa3f303d7259501c93d997d84fe6"},
+        "message": "cee03fde2af33149775b7223e7845e4fb2c8ae1792e5f99fe9ecf474cc8c16ad",
+    },
+}
+
+
+def test_keystore_is_decrypted():
+    """
+    test if the EIP-2335 test vector is decrypted, with the normalized passphrase.
+    """
+    assert decrypt_keystore(CRYPTO, PASSPHRASE) == SECRET
+    assert decrypt_keystore(CRYPTO, "testpassword\x7f🔑") == SECRET
+
+    with pytest.raises(ValueError):
+        decrypt_keystore(CRYPTO, "wrong")
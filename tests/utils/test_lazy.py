@@ -0,0 +1,31 @@
+import logging
+
+from src.common import Lazy
+
+
+def test_lazy_is_evaluated_only_when_emitted():
+    """
+    test if a deferred argument is not called on a disabled level, and called once otherwise.
+    """
+    logger = logging.getLogger("geonius-tests-lazy")
+    logger.propagate = False
+    records = []
+    for _ in range(2):
+        handler = logging.Handler()
+        handler.emit = lambda record: records.append(record.getMessage())
+        logger.addHandler(handler)
+
+    calls = []
+
+    def get_name(pool_id):
+        calls.append(pool_id)
+        return f"pool {pool_id}"
+
+    logger.setLevel(logging.INFO)
+    logger.debug("Surplus for pool %s: %s", Lazy(get_name, 1), 32)
+    assert not calls and not records
+
+    logger.setLevel(logging.DEBUG)
+    logger.debug("Surplus for pool %s: %s", Lazy(get_name, 1), 32)
+    assert calls == [1]
+    assert records == ["Surplus for pool pool 1: 32"] * 2
@@ -0,0 +1,51 @@
+import pytest
+
+from src.classes import Database
+from src.globals import get_operator_id
+from src.utils.operator import operator_namespace, operator_scope
+from src.utils.thread import multithread
+from src.database.expected_pubkeys import (
+    create_expected_pubkeys_table,
+    insert_expected_pubkeys,
+    count_expected_pubkeys,
+)
+
+
+@pytest.fixture
+def operators(config):
+    config.operator_ids = [1, 2]
+    for operator_id in config.operator_ids:
+        with operator_scope(operator_id):
+            create_expected_pubkeys_table()
+
+
+def test_single_operator_uses_shared_database(config):
+    """
+    test if the database name does not change when there is only one operator.
+    """
+    assert operator_namespace() == Database.shared
+    with operator_scope(1):
+        assert Database().db_name == Database.shared
+
+
+def test_operators_are_seperated(operators):
+    """
+    test if every operator keeps its data within its own database.
+    """
+    with operator_scope(1):
+        insert_expected_pubkeys("Q", ["0x01"], 100)
+        assert Database().db_name == "operator_1"
+
+    with operator_scope(2):
+        assert count_expected_pubkeys("Q") == 0
+    with operator_scope(1):
+        assert count_expected_pubkeys("Q") == 1
+
+
+def test_workers_serve_the_same_operator(operators):
+    """
+    test if the multithreaded calls serve the operator of the caller.
+    """
+    with operator_scope(2):
+        assert multithread(lambda _: get_operator_id(), range(3)) == [2, 2, 2]
+    assert get_operator_id() == 1